@@ -1,4 +1,5 @@
 import os
+import base64
 import logging
 from flask import Flask, jsonify
 from flask_jwt_extended import JWTManager
@@ -11,13 +12,32 @@ from flask_swagger import swagger
 from controllers.auth_controller import auth_bp
 from controllers.user_controller import user_bp
 from controllers.application_controller import application_bp
+from controllers.profile_controller import profile_bp
+from services.user_upload_service import handle_s3_upload_event
+from utils.json_provider import MsgspecJSONProvider
+from utils.tracing import init_app as init_tracing
+from utils.profiling import init_app as init_profiling
+from utils.structured_logging import configure_logging, flush_logs, truncate
 
 # Load Environment Variables
 load_dotenv()
 
+# Configure logging: JSON lines written to stdout by a background thread
+configure_logging()
+logger = logging.getLogger(__name__)
+
 # Initialize Flask app
 app = Flask(__name__)
 
+# Serialise and parse JSON with msgspec instead of the stdlib json module
+app.json = MsgspecJSONProvider(app)
+
+# Per-request stage timings (Server-Timing header and timing records)
+init_tracing(app)
+
+# Opt-in sampling profiler (PROFILING_ENABLED)
+init_profiling(app)
+
 # Enable CORS
 CORS(app)
 
@@ -39,7 +59,8 @@ try:
     ).key
     app.config['JWT_PUBLIC_KEY'] = signing_key  # Set public key for verification
 except Exception as e:
-    print(f"Failed to configure JWT: {e}")
+    logger.error("Failed to configure JWT: %s", e)
+    flush_logs()
     exit(1)
 
 # Initialize JWT Manager
@@ -74,32 +95,59 @@ def spec():
     }
     return jsonify(spec)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 # Register Blueprints
 app.register_blueprint(auth_bp, url_prefix="/auth")
 app.register_blueprint(application_bp, url_prefix="/application")
 app.register_blueprint(user_bp, url_prefix="/user")
+app.register_blueprint(profile_bp, url_prefix="/debug/profiles")
 
 @app.route("/")
 def home():
     return jsonify({"message": "Welcome to ResumeReady API"}), 200
 
+# Text bodies go back to API Gateway as strings; compressed or binary bodies (gzip JSON, PDFs)
+# must be base64-encoded, which aws_lambda_wsgi.response only does for a few image types
+def wsgi_lambda_response(event, context):
+    from aws_lambda_wsgi import StartResponse, environ
+    start_response = StartResponse()
+    output = app(environ(event, context), start_response)
+    try:
+        body = b"".join(output)
+    finally:
+        if hasattr(output, "close"):
+            output.close()
+
+    headers = dict(start_response.headers)
+    content_type = headers.get("Content-Type", "")
+    is_text = "Content-Encoding" not in headers and (content_type.startswith("text/") or "json" in content_type)
+    return {
+        "statusCode": int(start_response.status),
+        "headers": headers,
+        "body": body.decode("utf-8") if is_text else base64.b64encode(body).decode("ascii"),
+        "isBase64Encoded": not is_text,
+    }
+
 # Lambda handler
 def lambda_handler(event, context):
-    from aws_lambda_wsgi import response
-    logger.info(f"Lambda triggered with event: {event}")
+    # Bodies can hold whole resumes or base64 PDFs; only a truncated copy is logged
+    logger.info("Lambda triggered", extra={"event": truncate(event)})
 
     try:
-        return response(app, event, context)
+        # S3 ObjectCreated notifications complete direct-to-S3 uploads
+        records = event.get("Records") or []
+        if records and records[0].get("eventSource") == "aws:s3":
+            return handle_s3_upload_event(event)
+
+        return wsgi_lambda_response(event, context)
     except Exception as e:
-        logger.error(f"Unhandled Lambda Error: {str(e)}", exc_info=True)
+        logger.error("Unhandled Lambda Error: %s", e, exc_info=True)
         return {
             "statusCode": 500,
             "body": f"Lambda Internal Server Error: {str(e)}"
         }
+    finally:
+        # Lambda may freeze the process as soon as the handler returns
+        flush_logs()
 
 if __name__ == "__main__":
     app.run(debug=True)
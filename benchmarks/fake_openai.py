@@ -0,0 +1,175 @@
+"""
+Fake OpenAI-compatible chat completions server for load tests.
+
+Answers POST /v1/chat/completions with JSON shaped like the resume feedback, cover
+letter and interview questions services expect, after a simulated model latency:
+
+    latency = base latency + prompt tokens / prompt rate + completion tokens / output rate
+
+Errors can be injected at a fixed rate (HTTP errors or malformed JSON content).
+
+Usage (from the repository root):
+    python -m benchmarks.fake_openai --port 8081 --latency-ms 300 --output-tokens-per-second 80
+    OPENAI_BASE_URL=http://127.0.0.1:8081/v1 ...
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Rough token estimate (~4 characters per token), good enough for latency modelling
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# Words of filler text adding up to roughly the given number of tokens
+def filler(tokens: int) -> str:
+    words = ["Highlight", "measurable", "impact", "in", "the", "Flask", "and", "MongoDB", "projects."]
+    return " ".join(words[i % len(words)] for i in range(max(1, int(tokens * 0.75))))
+
+
+class FakeOpenAISettings:
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 50, prompt_tokens_per_second: float = 5000,
+                 output_tokens_per_second: float = 80, completion_tokens: int = 0, error_rate: float = 0.0,
+                 error_status: int = 500, malformed_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.output_tokens_per_second = output_tokens_per_second
+        # 0 means "half of the request's max_tokens"
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+
+
+# Builds the JSON content the calling service expects, padded to about the target size
+def build_content(system_prompt: str, user_prompt: str, completion_tokens: int) -> dict:
+    system_prompt = system_prompt.lower()
+    if "interview" in system_prompt:
+        match = re.search(r"generate (\d+)", user_prompt)
+        count = int(match.group(1)) if match else 3
+        answer = filler(completion_tokens // max(1, count))
+        return {"interviewQuestions": [
+            {"type": "Technical", "question": f"How would you approach problem {i + 1} in this role?", "answer": answer}
+            for i in range(count)
+        ]}
+    if "cover letter" in system_prompt:
+        return {"companyName": "Acme Corp", "position": "Backend Engineer",
+                "coverLetterBody": "Dear Hiring Manager, " + filler(completion_tokens)}
+    return {"companyName": "Acme Corp", "position": "Backend Engineer", "location": "Remote",
+            "jobDescription": filler(60), "resumeFeedback": filler(completion_tokens), "resumeScore": 75}
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    settings = FakeOpenAISettings()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        settings = self.settings
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        messages = body.get("messages", [])
+        system_prompt = messages[0].get("content", "") if messages else ""
+        user_prompt = messages[-1].get("content", "") if messages else ""
+
+        prompt_tokens = sum(estimate_tokens(message.get("content", "")) for message in messages)
+        completion_tokens = settings.completion_tokens or max(1, int(body.get("max_tokens", 500)) // 2)
+        latency = (
+            settings.latency_ms / 1000
+            + random.uniform(-settings.jitter_ms, settings.jitter_ms) / 1000
+            + prompt_tokens / settings.prompt_tokens_per_second
+            + completion_tokens / settings.output_tokens_per_second
+        )
+
+        if random.random() < settings.error_rate:
+            # Errors come back quickly, as they do from the real API
+            time.sleep(min(latency, settings.latency_ms / 1000))
+            headers = {"Retry-After": "1"} if settings.error_status == 429 else None
+            self._send_json(settings.error_status, {"error": {"message": "Injected error", "type": "server_error"}}, headers)
+            return
+
+        time.sleep(max(0.0, latency))
+        if random.random() < settings.malformed_rate:
+            content = '{"truncated": "response'
+        else:
+            content = json.dumps(build_content(system_prompt, user_prompt, completion_tokens))
+
+        self._send_json(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+
+# Starts the server on a background thread; returns (server, base URL for OPENAI_BASE_URL)
+def start_fake_openai(settings: FakeOpenAISettings, host: str = "127.0.0.1", port: int = 0):
+    handler = type("ConfiguredFakeOpenAIHandler", (FakeOpenAIHandler,), {"settings": settings})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=300, help="Base latency of every completion")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="Uniform +/- jitter on the base latency")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=5000)
+    parser.add_argument("--output-tokens-per-second", type=float, default=80)
+    parser.add_argument("--completion-tokens", type=int, default=0, help="Tokens per completion (default: max_tokens / 2)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of completions with invalid JSON content")
+
+
+def settings_from_args(args) -> FakeOpenAISettings:
+    return FakeOpenAISettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        prompt_tokens_per_second=args.prompt_tokens_per_second,
+        output_tokens_per_second=args.output_tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_rate=args.malformed_rate,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_openai(settings_from_args(args), args.host, args.port)
+    print(f"Fake OpenAI listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
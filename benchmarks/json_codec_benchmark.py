@@ -0,0 +1,117 @@
+"""
+Benchmarks JSON encode/decode throughput: the stdlib path (json.loads for LLM output,
+Flask's default provider for responses) against the msgspec models and provider.
+
+Usage (from the repository root):
+    python -m benchmarks.json_codec_benchmark
+    python -m benchmarks.json_codec_benchmark --applications 200 --iterations 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import msgspec
+from models.application_model import CoverLetter, InterviewQuestionsResponse, ResumeFeedback
+from utils.json_provider import MsgspecJSONProvider
+
+FEEDBACK_RESPONSE = json.dumps({
+    "companyName": "Acme Corp",
+    "position": "Backend Engineer",
+    "location": "Toronto, ON",
+    "jobDescription": "Build and operate Python APIs on AWS. " * 8,
+    "resumeFeedback": "Highlight the Flask and MongoDB projects and quantify their impact. " * 12,
+    "resumeScore": 78,
+})
+COVER_LETTER_RESPONSE = json.dumps({
+    "companyName": "Acme Corp",
+    "position": "Backend Engineer",
+    "coverLetterBody": "Dear Hiring Manager, I am excited to apply for this role. " * 30,
+})
+INTERVIEW_RESPONSE = json.dumps({
+    "interviewQuestions": [
+        {"type": "Technical", "question": f"How would you scale service {i}?", "answer": "Start by measuring the bottleneck. " * 10}
+        for i in range(5)
+    ]
+})
+
+
+# A user document as returned to the client, with many saved applications
+def make_user_document(applications: int) -> dict:
+    return {
+        "userId": "auth0|bench",
+        "email": "bench@example.com",
+        "resume": "Experienced software engineer skilled in Python, Flask, and MongoDB. " * 40,
+        "applications": [
+            {
+                "id": f"app-{i}",
+                "companyName": "Acme Corp",
+                "position": "Backend Engineer",
+                "location": "Remote",
+                "jobDescription": "Build and operate Python APIs on AWS. " * 8,
+                "resumeFeedback": json.loads(FEEDBACK_RESPONSE),
+                "coverLetter": json.loads(COVER_LETTER_RESPONSE),
+                "interviewQuestions": json.loads(INTERVIEW_RESPONSE)["interviewQuestions"],
+                "status": "Application Submitted",
+                "errors": None,
+                "dateCreated": datetime(2025, 1, 1).isoformat(),
+            }
+            for i in range(applications)
+        ],
+    }
+
+
+def timed(label: str, func, iterations: int, payload_bytes: int, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<40} {iterations / best:>12.0f} ops/s {payload_bytes * iterations / best / 1e6:>10.1f} MB/s")
+    return best
+
+
+def compare(title: str, baseline, candidate, iterations: int, payload_bytes: int, repeat: int):
+    print(title)
+    baseline_time = timed("  stdlib", baseline, iterations, payload_bytes, repeat)
+    candidate_time = timed("  msgspec", candidate, iterations, payload_bytes, repeat)
+    print(f"  speed-up: {baseline_time / candidate_time:.2f}x\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=100, help="Applications in the encoded user document")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # LLM response decoding: json.loads (no validation) against typed, validated decoding
+    for title, content, model in [
+        ("Decode resume feedback", FEEDBACK_RESPONSE, ResumeFeedback),
+        ("Decode cover letter", COVER_LETTER_RESPONSE, CoverLetter),
+        ("Decode interview questions", INTERVIEW_RESPONSE, InterviewQuestionsResponse),
+    ]:
+        decoder = msgspec.json.Decoder(model)
+        compare(title, lambda: json.loads(content), lambda: msgspec.to_builtins(decoder.decode(content)),
+                args.iterations, len(content), args.repeat)
+
+    # Response encoding through the Flask JSON providers
+    app = Flask(__name__)
+    stdlib_provider = DefaultJSONProvider(app)
+    msgspec_provider = MsgspecJSONProvider(app)
+    document = make_user_document(args.applications)
+    body = msgspec_provider.dumps(document)
+    iterations = max(1, args.iterations // args.applications)
+    with app.app_context():
+        compare(f"Encode user document ({args.applications} applications, {len(body) // 1024} KiB)",
+                lambda: stdlib_provider.response(document), lambda: msgspec_provider.response(document),
+                iterations, len(body), args.repeat)
+        compare("Decode request body", lambda: stdlib_provider.loads(body), lambda: msgspec_provider.loads(body),
+                iterations, len(body), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
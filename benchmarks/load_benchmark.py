@@ -0,0 +1,235 @@
+"""
+End-to-end throughput benchmark for the API against local stand-ins (see
+benchmarks/local_services.py and benchmarks/fake_openai.py): no OpenAI credits are
+spent and production Mongo and S3 are never touched.
+
+Each route is driven by a fixed number of concurrent clients for a fixed duration, at
+every concurrency level, and requests per second plus p50/p95/p99 latency are reported.
+
+Usage (from the repository root, with benchmarks/requirements.txt installed):
+    python -m benchmarks.load_benchmark
+    python -m benchmarks.load_benchmark --routes process-application --concurrency 1,8,32 --duration 20
+    python -m benchmarks.load_benchmark --mongodb-uri mongodb://127.0.0.1:27017 --s3-endpoint http://127.0.0.1:9000
+    python -m benchmarks.load_benchmark --error-rate 0.05 --error-status 429 --json results.json
+
+The server runs in-process on a threaded WSGI server, so absolute numbers are lower than
+on Lambda; compare runs made with the same settings on the same machine.
+"""
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from benchmarks.fake_openai import add_arguments, settings_from_args, start_fake_openai
+from benchmarks.local_services import build_app, use_local_mongo, use_local_s3
+
+ROUTES = ["process-application", "upload-pdf", "list-applications", "get-application", "fetch-pdf"]
+
+JOB_DESCRIPTION = (
+    "Acme Corp is hiring a Backend Engineer (Remote) to build Python APIs with Flask, "
+    "MongoDB and AWS Lambda. 3+ years of experience with REST services and CI/CD required."
+)
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+# Per-virtual-user state shared by the route drivers
+class BenchmarkUser:
+    def __init__(self, user_id: str, headers: dict):
+        self.user_id = user_id
+        self.headers = headers
+        self.application_ids = []
+
+
+class RouteDrivers:
+    def __init__(self, pdfs: list):
+        self.pdfs = pdfs
+        self.sequence = itertools.count()
+
+    def process_application(self, client: httpx.Client, user: BenchmarkUser):
+        # A unique job description per request so identical calls are not coalesced
+        body = {"jobDescription": f"{JOB_DESCRIPTION} Requisition #{next(self.sequence)}."}
+        return client.post("/application/process-application", json=body, headers=user.headers)
+
+    def upload_pdf(self, client: httpx.Client, user: BenchmarkUser):
+        pdf = self.pdfs[next(self.sequence) % len(self.pdfs)]
+        files = {"file": ("resume.pdf", pdf, "application/pdf")}
+        return client.post("/user/upload-pdf", files=files, headers=user.headers)
+
+    def list_applications(self, client: httpx.Client, user: BenchmarkUser):
+        return client.get(f"/application/{user.user_id}/applications", headers=user.headers)
+
+    def get_application(self, client: httpx.Client, user: BenchmarkUser):
+        app_id = user.application_ids[next(self.sequence) % len(user.application_ids)]
+        return client.get(f"/application/{user.user_id}/application/{app_id}", headers=user.headers)
+
+    def fetch_pdf(self, client: httpx.Client, user: BenchmarkUser):
+        return client.get(f"/user/fetch-pdf/{user.user_id}", headers=user.headers)
+
+    def get(self, route: str):
+        return getattr(self, route.replace("-", "_"))
+
+
+# Runs `concurrency` clients in a closed loop for `duration` seconds
+def run_level(base_url: str, driver, users: list, concurrency: int, duration: float) -> dict:
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int):
+        user = users[index % len(users)]
+        local_latencies = []
+        local_statuses = {}
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    status = driver(client, user).status_code
+                except httpx.HTTPError:
+                    status = "transport-error"
+                local_latencies.append(time.perf_counter() - started)
+                local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not isinstance(status, int) or status >= 400)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50Ms": percentile(latencies, 0.50) * 1000,
+        "p95Ms": percentile(latencies, 0.95) * 1000,
+        "p99Ms": percentile(latencies, 0.99) * 1000,
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+    }
+
+
+# Creates the benchmark users with a resume and some saved applications
+def seed_users(base_url: str, issue_token, drivers: RouteDrivers, count: int, applications: int) -> list:
+    from repositories.application_repository import save_applications
+    from repositories.user_repository import create_user
+    from models.application_model import Application
+    from models.user_model import User
+
+    users = []
+    with httpx.Client(base_url=base_url, timeout=120) as client:
+        for index in range(count):
+            user = BenchmarkUser(f"benchmark|user-{index}", issue_token(f"benchmark|user-{index}"))
+            create_user(User(userId=user.user_id, email=f"user-{index}@example.com", firstName="Bench", lastName=str(index)))
+
+            response = drivers.upload_pdf(client, user)
+            if response.status_code != 200:
+                raise RuntimeError(f"Seeding upload failed: {response.status_code} {response.text}")
+
+            seeded = [
+                Application(
+                    companyName="Acme Corp",
+                    position="Backend Engineer",
+                    location="Remote",
+                    jobDescription=JOB_DESCRIPTION,
+                    resumeFeedback={"resumeFeedback": "Quantify the impact of each project. " * 20, "resumeScore": 70},
+                    coverLetter={"coverLetterBody": "Dear Hiring Manager, " + "I build reliable APIs. " * 60},
+                    interviewQuestions=[{"type": "Technical", "question": f"Question {i}?", "answer": "Answer. " * 40} for i in range(5)],
+                    status="Application Submitted",
+                ).to_dict()
+                for _ in range(applications)
+            ]
+            save_applications(user.user_id, seeded)
+            user.application_ids = [application["id"] for application in seeded]
+            users.append(user)
+    return users
+
+
+def print_report(route: str, results: list):
+    print(f"\n{route}")
+    print(f"  {'clients':>7} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  statuses")
+    for result in results:
+        print(
+            f"  {result['concurrency']:>7} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.1f} "
+            f"{result['p50Ms']:>9.1f} {result['p95Ms']:>9.1f} {result['p99Ms']:>9.1f}  {result['statuses']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", default=",".join(ROUTES), help=f"Comma-separated subset of {', '.join(ROUTES)}")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per route and concurrency level")
+    parser.add_argument("--users", type=int, default=0, help="Virtual users (default: the highest concurrency level)")
+    parser.add_argument("--seed-applications", type=int, default=20, help="Saved applications per user")
+    parser.add_argument("--pdf-pool", type=int, default=50, help="Distinct resume PDFs cycled through by upload-pdf")
+    parser.add_argument("--mongodb-uri", help="Local mongod to use instead of in-process mongomock")
+    parser.add_argument("--s3-endpoint", help="S3-compatible endpoint (e.g. MinIO) to use instead of a moto server")
+    parser.add_argument("--openai-base-url", help="Already running OpenAI-compatible server to use instead of the built-in fake")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    routes = [route.strip() for route in args.routes.split(",") if route.strip()]
+    unknown = [route for route in routes if route not in ROUTES]
+    if unknown:
+        parser.error(f"Unknown routes: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    # Stand-ins first: the application modules create their clients at import time
+    use_local_mongo(args.mongodb_uri)
+    moto_process = use_local_s3(args.s3_endpoint)
+    if args.openai_base_url:
+        os.environ["OPENAI_BASE_URL"] = args.openai_base_url
+    else:
+        _, os.environ["OPENAI_BASE_URL"] = start_fake_openai(settings_from_args(args))
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    # Measure the service, not the per-user quota, unless the caller sets these explicitly
+    os.environ.setdefault("LLM_USER_CALLS_PER_MINUTE", "100000")
+    os.environ.setdefault("LLM_USER_BURST", "100000")
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from benchmarks.pdf_extraction_benchmark import make_sample_pdf
+
+    app, issue_token = build_app()
+    # No per-request access log: it would dominate the output and the timings
+    quiet_handler = type("QuietRequestHandler", (WSGIRequestHandler,), {"log_request": lambda *args, **kwargs: None})
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=quiet_handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        drivers = RouteDrivers([make_sample_pdf(pages=2, seed=seed) for seed in range(args.pdf_pool)])
+        users = seed_users(base_url, issue_token, drivers, args.users or max(levels), args.seed_applications)
+        print(f"Seeded {len(users)} users with {args.seed_applications} applications each; "
+              f"{args.duration:.0f}s per level, OpenAI at {os.environ['OPENAI_BASE_URL']}")
+
+        report = {}
+        for route in routes:
+            report[route] = [run_level(base_url, drivers.get(route), users, level, args.duration) for level in levels]
+            print_report(route, report[route])
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+    finally:
+        server.shutdown()
+        if moto_process:
+            moto_process.terminate()
+
+
+if __name__ == "__main__":
+    main()
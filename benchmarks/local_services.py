@@ -0,0 +1,147 @@
+"""
+Local stand-ins for the services the API depends on, so load tests never touch
+production Mongo, S3 or OpenAI:
+
+- Mongo: a real local mongod (--mongodb-uri) or an in-process mongomock database
+- S3: any S3-compatible endpoint such as MinIO (--s3-endpoint) or a moto server subprocess
+- Auth0: a locally generated RS256 key pair that signs benchmark tokens
+
+These must be set up before the application modules are imported, because the Mongo
+client, S3 client and OpenAI clients are created at import time.
+"""
+import functools
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import boto3
+
+# Collection methods serialised under one lock: mongomock is not thread-safe
+MONGOMOCK_LOCKED_METHODS = [
+    "insert_one", "insert_many", "update_one", "update_many", "replace_one", "find_one",
+    "find_one_and_update", "delete_one", "delete_many", "count_documents", "create_index",
+    "aggregate", "bulk_write",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+
+# Points config.database at a local mongod, or at an in-process mongomock client
+def use_local_mongo(uri: str = None):
+    if uri:
+        os.environ["MONGODB_URI"] = uri
+        return
+
+    import mongomock
+    import pymongo.mongo_client
+
+    lock = threading.RLock()
+
+    def locked(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with lock:
+                result = method(self, *args, **kwargs)
+                # Materialise aggregation cursors while the lock is held
+                return iter(list(result)) if method.__name__ == "aggregate" else result
+        return wrapper
+
+    for name in MONGOMOCK_LOCKED_METHODS:
+        setattr(mongomock.collection.Collection, name, locked(getattr(mongomock.collection.Collection, name)))
+
+    def mongomock_client(uri=None, server_api=None, **kwargs):
+        return mongomock.MongoClient()
+
+    pymongo.mongo_client.MongoClient = mongomock_client
+    os.environ["MONGODB_URI"] = "mongodb://mongomock"
+
+
+# Points storage_repository at an S3-compatible endpoint, starting moto if none is given.
+# Returns the moto process (or None) so the caller can stop it.
+def use_local_s3(endpoint: str = None, bucket: str = "resume-ready-benchmark"):
+    process = None
+    if not endpoint:
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "moto.server", "-p", str(port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        wait_for_port(port)
+        endpoint = f"http://127.0.0.1:{port}"
+
+    os.environ["AWS_S3_ENDPOINT_URL"] = endpoint
+    os.environ.setdefault("AWS_S3_BUCKET", bucket)
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    s3 = boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        region_name=os.environ["AWS_REGION"],
+        aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
+        aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
+    )
+    existing = [b["Name"] for b in s3.list_buckets().get("Buckets", [])]
+    if os.environ["AWS_S3_BUCKET"] not in existing:
+        s3.create_bucket(Bucket=os.environ["AWS_S3_BUCKET"])
+    return process
+
+
+# Builds the API the way app.py does, but trusting a local RS256 key instead of Auth0.
+# Returns (app, issue_token) where issue_token(user_id) returns an Authorization header.
+def build_app():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from flask import Flask
+    from flask_jwt_extended import JWTManager, create_access_token
+    from controllers.application_controller import application_bp
+    from controllers.auth_controller import auth_bp
+    from controllers.user_controller import user_bp
+    from utils.json_provider import MsgspecJSONProvider
+    from utils.tracing import init_app as init_tracing
+    from utils.profiling import init_app as init_profiling
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    app = Flask("resume-ready-benchmark")
+    app.json = MsgspecJSONProvider(app)
+    init_tracing(app)
+    init_profiling(app)
+    app.config["JWT_TOKEN_LOCATION"] = ["headers"]
+    app.config["JWT_IDENTITY_CLAIM"] = "sub"
+    app.config["JWT_ALGORITHM"] = "RS256"
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = False
+    app.config["JWT_PRIVATE_KEY"] = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    app.config["JWT_PUBLIC_KEY"] = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    JWTManager(app)
+
+    app.register_blueprint(auth_bp, url_prefix="/auth")
+    app.register_blueprint(application_bp, url_prefix="/application")
+    app.register_blueprint(user_bp, url_prefix="/user")
+
+    def issue_token(user_id: str) -> dict:
+        with app.app_context():
+            return {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+
+    return app, issue_token
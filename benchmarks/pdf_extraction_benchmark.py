@@ -0,0 +1,98 @@
+"""
+Benchmarks PDF text extraction over a corpus of sample PDFs.
+
+Usage (from the repository root):
+    python -m benchmarks.pdf_extraction_benchmark --corpus path/to/pdfs
+    python -m benchmarks.pdf_extraction_benchmark --synthetic 200 --pages 2
+
+Without --corpus a synthetic corpus of resume-like PDFs is generated in memory.
+"""
+import argparse
+import glob
+import os
+import time
+import fitz
+from utils.pdf_extraction import extract_many_pdf_pages, extract_pdf_pages
+
+SAMPLE_LINES = [
+    "Experienced software engineer skilled in Python, Flask, and MongoDB.",
+    "Built REST APIs serving 10k requests per minute on AWS Lambda.",
+    "B.Sc. Computer Science, graduated with distinction.",
+    "Led a team of four to migrate a monolith to event-driven services.",
+]
+
+
+# Builds a resume-like PDF with the given number of pages
+def make_sample_pdf(pages: int, seed: int) -> bytes:
+    with fitz.open() as pdf:
+        for page_number in range(pages):
+            page = pdf.new_page()
+            y = 72
+            for line_number in range(40):
+                line = SAMPLE_LINES[(seed + page_number + line_number) % len(SAMPLE_LINES)]
+                page.insert_text((72, y), line, fontsize=9)
+                y += 16
+        return pdf.tobytes()
+
+
+def load_corpus(args) -> list:
+    if args.corpus:
+        paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+        corpus = []
+        for path in paths:
+            with open(path, "rb") as f:
+                corpus.append(f.read())
+        return corpus
+    return [make_sample_pdf(args.pages, seed) for seed in range(args.synthetic)]
+
+
+# The original implementation: repeated string concatenation, one document at a time
+def legacy_extract(pdf_bytes: bytes) -> str:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        text = ""
+        for page in pdf:
+            text += page.get_text()
+        return text.strip()
+
+
+def timed(label: str, func, page_total: int, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<34} {best * 1000:>10.1f} ms {page_total / best:>12.1f} pages/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of sample PDFs (searched recursively)")
+    parser.add_argument("--synthetic", type=int, default=100, help="Number of synthetic PDFs when no corpus is given")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic PDF")
+    parser.add_argument("--large-pages", type=int, default=256, help="Pages in the synthetic large document")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    if not corpus:
+        parser.error("No PDFs found in the corpus")
+    page_total = sum(fitz.open(stream=document, filetype="pdf").page_count for document in corpus)
+    print(f"Corpus: {len(corpus)} documents, {page_total} pages, {args.workers} workers\n")
+
+    baseline = timed("legacy (sequential, +=)", lambda: [legacy_extract(d) for d in corpus], page_total, args.repeat)
+    timed("engine (sequential, join)", lambda: extract_many_pdf_pages(corpus, max_workers=1), page_total, args.repeat)
+    pooled = timed("engine (process pool per document)", lambda: extract_many_pdf_pages(corpus, max_workers=args.workers), page_total, args.repeat)
+    print(f"\nSpeed-up over legacy for the corpus: {baseline / pooled:.2f}x\n")
+
+    large = make_sample_pdf(args.large_pages, seed=0)
+    large_baseline = timed(f"legacy ({args.large_pages}-page document)", lambda: legacy_extract(large), args.large_pages, args.repeat)
+    large_pooled = timed(f"engine ({args.large_pages}-page, page split)", lambda: extract_pdf_pages(large, max_workers=args.workers), args.large_pages, args.repeat)
+    print(f"\nSpeed-up over legacy for one large document: {large_baseline / large_pooled:.2f}x")
+    print(f"Stats from the last run: {extract_pdf_pages(large, max_workers=args.workers)['stats']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,9 @@ import os
 uri = os.getenv("MONGODB_URI")
 client = MongoClient(uri, server_api=ServerApi('1'))
 db = client['resume-ready']
-user_collections = db['new-users']
\ No newline at end of file
+user_collections = db['new-users']
+resume_parse_collections = db['resume-parses']
+idempotency_collections = db['idempotency-keys']
+generation_lease_collections = db['generation-leases']
+rate_limit_collections = db['rate-limits']
+job_analysis_collections = db['job-description-analyses']
@@ -1,22 +1,120 @@
+from functools import wraps
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
 from services.application_service import (
     process_application,
+    process_applications_batch,
+    BATCH_MAX_JOB_DESCRIPTIONS,
+    BATCH_LLM_CONCURRENCY,
+    MAX_INTERVIEW_QUESTIONS,
     get_user_applications,
     get_application_details,
     get_application_cover_letter,
     get_application_interview_questions,
     delete_application_by_app_id,
     update_application_status,
+    regenerate_application_artifact,
+    complete_application,
+    APPLICATION_PARTIAL,
+    generate_more_interview_questions,
+    parse_application_fields,
+    score_resume_match,
 )
 from services.resume_feedback_service import generate_resume_feedback
 from services.cover_letter_service import generate_cover_letter
 from services.interview_questions_service import generate_interview_questions
+from services.application_ranking_service import rank_applications
+from services.user_service import CURRENT_RESUME_REF, get_user_resume
+from utils.resume_sections import SECTIONS
+from utils.compression import compress_response
+from utils.http_cache import json_response_with_etag
+from utils.tracing import traced_jwt_required
+from services.idempotency_service import run_idempotent
+from services.admission_service import (
+    AdmissionRejected,
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_STANDARD,
+    admit,
+)
 
 application_bp = Blueprint('application', __name__)
+application_bp.after_request(compress_response)
+
+# URL names of the artifacts that can be regenerated individually
+REGENERABLE_ARTIFACTS = {
+    "resume-feedback": "resumeFeedback",
+    "cover-letter": "coverLetter",
+    "interview-questions": "interviewQuestions",
+}
+
+# Applies per-user rate/concurrency limits and fair-share scheduling to an LLM-backed route.
+# cost (LLM calls) and weight (concurrent LLM calls) may be callables of the request body.
+def _admission_controlled(priority, cost=1, weight=1):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True) or {}
+            try:
+                with admit(
+                    get_jwt_identity(),
+                    priority,
+                    cost(data) if callable(cost) else cost,
+                    weight(data) if callable(weight) else weight,
+                ):
+                    return fn(*args, **kwargs)
+            except AdmissionRejected as e:
+                return _admission_rejected_response(e)
+        return wrapper
+    return decorator
+
+def _admission_rejected_response(e):
+    response = jsonify({"error": str(e)})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 429
+
+# Batch requests cost three LLM calls per job description; a malformed list is charged the
+# minimum and rejected by the handler
+def _batch_cost(data):
+    job_descriptions = data.get('jobDescriptions')
+    return 3 * max(1, len(job_descriptions) if isinstance(job_descriptions, list) else 0)
+
+def _batch_weight(data):
+    return min(BATCH_LLM_CONCURRENCY, _batch_cost(data))
+
+# numQuestions as an int (default 3) and an error message when it is not a whole number in range
+def _num_questions(data):
+    value = data.get('numQuestions', 3)
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_INTERVIEW_QUESTIONS:
+        return None, f"numQuestions must be an integer from 1 to {MAX_INTERVIEW_QUESTIONS}"
+    return value, None
+
+# Rejects a request whose resumeSections is not a list of known section names with a 400,
+# before any resume lookup or admission charge
+def _valid_resume_sections(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        sections = (request.get_json(silent=True) or {}).get('resumeSections')
+        if sections is not None and (
+            not isinstance(sections, list) or not all(isinstance(section, str) and section in SECTIONS for section in sections)
+        ):
+            return jsonify({"error": f"resumeSections must be a list of section names ({', '.join(SECTIONS)})"}), 400
+        return fn(*args, **kwargs)
+    return wrapper
+
+# Resolves the resume for a generation request: inline userResume text, or a reference
+# ("current" or a resume version id) to a resume already stored for the user
+def _resolve_user_resume(user_id, data):
+    if data.get('userResume'):
+        return data['userResume']
+    return get_user_resume(user_id, data.get('resumeRef') or CURRENT_RESUME_REF, data.get('resumeSections'))
 
 @application_bp.route('/resume-feedback', methods=['POST'])
-@jwt_required()
+@traced_jwt_required()
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_INTERACTIVE)
 def resume_feedback():
     """
     Generates resume feedback based on the user's resume and the job description.
@@ -35,6 +133,15 @@ def resume_feedback():
           properties:
             userResume:
               type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            resumeSections:
+              type: array
+              items:
+                type: string
+              description: Only send these sections of the stored resume (education, experience, skills, projects).
             jobDescription:
               type: string
     responses:
@@ -42,18 +149,105 @@ def resume_feedback():
         description: Resume feedback generated successfully.
       400:
         description: Invalid input data.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
     """
     user_id = get_jwt_identity()
 
     data = request.json
-    user_resume = data.get('userResume')
+    user_resume = _resolve_user_resume(user_id, data)
     job_description = data.get('jobDescription')
 
+    if not user_resume or not job_description:
+        return jsonify({"error": "Missing required fields"}), 400
+
     feedback = generate_resume_feedback(user_resume, job_description)
     return jsonify({"feedback": feedback}), 200
 
+@application_bp.route('/match-preview', methods=['POST'])
+@traced_jwt_required()
+@_valid_resume_sections
+def match_preview():
+    """
+    Scores how well a resume matches a job description locally, without the LLM.
+    ---
+    tags:
+      - Application
+    summary: Preview the resume match score
+    security:
+      - BearerAuth: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            userResume:
+              type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            resumeSections:
+              type: array
+              items:
+                type: string
+              description: Only score these sections of the stored resume (education, experience, skills, projects).
+            jobDescription:
+              type: string
+    responses:
+      200:
+        description: Local match score.
+        schema:
+          type: object
+          properties:
+            match:
+              type: object
+              properties:
+                score:
+                  type: integer
+                  example: 72
+                skillScore:
+                  type: integer
+                keywordScore:
+                  type: integer
+                matchedSkills:
+                  type: array
+                  items:
+                    type: string
+                missingSkills:
+                  type: array
+                  items:
+                    type: string
+                matchedKeywords:
+                  type: array
+                  items:
+                    type: string
+                missingKeywords:
+                  type: array
+                  items:
+                    type: string
+                scorerVersion:
+                  type: integer
+      400:
+        description: Invalid input data.
+    """
+    user_id = get_jwt_identity()
+
+    data = request.get_json(silent=True) or {}
+    user_resume = _resolve_user_resume(user_id, data)
+    job_description = data.get('jobDescription')
+
+    if not user_resume or not job_description:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    return jsonify({"match": score_resume_match(user_resume, job_description)}), 200
+
 @application_bp.route('/generate-cover-letter', methods=['POST'])
-@jwt_required()
+@traced_jwt_required()
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_INTERACTIVE)
 def cover_letter():
     """
     Generates a cover letter based on the user's resume and job description.
@@ -72,6 +266,15 @@ def cover_letter():
           properties:
             userResume:
               type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            resumeSections:
+              type: array
+              items:
+                type: string
+              description: Only send these sections of the stored resume (education, experience, skills, projects).
             jobDescription:
               type: string
     responses:
@@ -79,18 +282,25 @@ def cover_letter():
         description: Cover letter generated successfully.
       400:
         description: Invalid input data.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
     """
     user_id = get_jwt_identity()
 
     data = request.json
-    user_resume = data.get('userResume')
+    user_resume = _resolve_user_resume(user_id, data)
     job_description = data.get('jobDescription')
 
+    if not user_resume or not job_description:
+        return jsonify({"error": "Missing required fields"}), 400
+
     cover_letter = generate_cover_letter(user_resume, job_description)
     return jsonify({"cover_letter": cover_letter}), 200
 
 @application_bp.route('/generate-interview-questions', methods=['POST'])
-@jwt_required()
+@traced_jwt_required()
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_INTERACTIVE)
 def interview_questions():
     """
     Generates interview questions based on the user's resume and job description.
@@ -109,6 +319,15 @@ def interview_questions():
           properties:
             userResume:
               type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            resumeSections:
+              type: array
+              items:
+                type: string
+              description: Only send these sections of the stored resume (education, experience, skills, projects).
             jobDescription:
               type: string
     responses:
@@ -116,18 +335,24 @@ def interview_questions():
         description: Interview questions generated successfully.
       400:
         description: Invalid input data.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
     """
     user_id = get_jwt_identity()
 
     data = request.json
-    user_resume = data.get('userResume')
+    user_resume = _resolve_user_resume(user_id, data)
     job_description = data.get('jobDescription')
 
+    if not user_resume or not job_description:
+        return jsonify({"error": "Missing required fields"}), 400
+
     questions = generate_interview_questions(user_resume, job_description)
     return jsonify({"questions": questions}), 200
 
 @application_bp.route('/process-application', methods=['POST'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
+@_valid_resume_sections
 def process_application_endpoint():
     """
     Processes the application and generates feedback, a cover letter, and interview questions.
@@ -137,9 +362,19 @@ def process_application_endpoint():
     summary: Process job application
     description: This endpoint processes a user's job application by analyzing the resume and job description. 
                  It generates resume feedback, a tailored cover letter, and interview questions.
+                 The application is saved with status "Processing" before generation starts and each
+                 artifact is saved as soon as it is ready, so GET /{user_id}/application/{application_id}
+                 shows results progressively. Artifacts not ready by the deadline are listed in
+                 missingArtifacts of a "Partial" application (202); they are saved if they finish in the
+                 background, or can be generated with POST /{user_id}/application/{application_id}/complete.
     security:
       - BearerAuth: []
     parameters:
+      - in: header
+        name: Idempotency-Key
+        required: false
+        type: string
+        description: Unique key per logical request; retries with the same key return the stored result.
       - in: body
         name: body
         required: true
@@ -148,8 +383,17 @@ def process_application_endpoint():
           properties:
             userResume:
               type: string
-              description: The user's resume text.
+              description: The user's resume text. Optional when resumeRef is used.
               example: "Experienced software engineer skilled in Python, Flask, and MongoDB."
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+              example: "current"
+            resumeSections:
+              type: array
+              items:
+                type: string
+              description: Only send these sections of the stored resume (education, experience, skills, projects).
             jobDescription:
               type: string
               description: The job description text.
@@ -192,6 +436,8 @@ def process_application_endpoint():
                   items:
                     type: string
                   example: ["Tell me about yourself", "Why do you want to work for Google?"]
+      202:
+        description: Deadline reached; the application was saved with status "Partial" and missingArtifacts.
       400:
         description: Missing required fields.
         schema:
@@ -200,6 +446,8 @@ def process_application_endpoint():
             error:
               type: string
               example: "Missing required fields"
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
       401:
         description: Unauthorized access.
         schema:
@@ -208,6 +456,10 @@ def process_application_endpoint():
             error:
               type: string
               example: "Unauthorized access"
+      409:
+        description: A request with the same Idempotency-Key is still in progress.
+      422:
+        description: The Idempotency-Key was already used for a different request.
       500:
         description: Internal server error.
         schema:
@@ -221,24 +473,157 @@ def process_application_endpoint():
 
     try:
         data = request.get_json()
-        user_resume = data.get('userResume')
-        job_description = data.get('jobDescription')
 
-        if not user_resume or not job_description:
+        # Admission (rate, concurrency and scheduling) applies to the run that generates, not to
+        # replays or duplicates waiting on it; a rejected run releases its Idempotency-Key
+        def admitted_request():
+            with admit(user_id, PRIORITY_STANDARD, 3, 3):
+                return _process_application_request(user_id, data)
+
+        # Retries carrying the same Idempotency-Key replay the first result instead of regenerating
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if idempotency_key:
+            body, status_code, replayed = run_idempotent(user_id, idempotency_key, data, admitted_request)
+            response = jsonify(body)
+            if replayed:
+                response.headers['Idempotent-Replayed'] = 'true'
+            return response, status_code
+
+        body, status_code = admitted_request()
+        return jsonify(body), status_code
+
+    except AdmissionRejected as e:
+        return _admission_rejected_response(e)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Runs /process-application for a request body, returning (response body, status code)
+def _process_application_request(user_id, data):
+    user_resume = _resolve_user_resume(user_id, data)
+    job_description = data.get('jobDescription')
+
+    if not user_resume or not job_description:
+        return {"error": "Missing required fields"}, 400
+
+    application_result = process_application(user_id, user_resume, job_description)
+
+    if 'error' in application_result:
+        return {"error": "Failed to process application"}, 500
+
+    if application_result.get("status") == APPLICATION_PARTIAL:
+        return {"message": "Application partially processed", "application": application_result}, 202
+
+    return {"message": "Application processed", "application": application_result}, 200
+
+@application_bp.route('/process-applications', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_BULK, cost=_batch_cost, weight=_batch_weight)
+def process_applications_batch_endpoint():
+    """
+    Processes one resume against many job descriptions in a single request.
+    ---
+    tags:
+      - Application
+    summary: Process a batch of job applications
+    description: Generates feedback, a cover letter, and interview questions for each job description.
+                 The resume is prepared once, generation runs under a bounded concurrency limit,
+                 and all resulting applications are saved together.
+    security:
+      - BearerAuth: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            userResume:
+              type: string
+              description: The user's resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            jobDescriptions:
+              type: array
+              items:
+                type: string
+              description: The job descriptions to apply to.
+            questionType:
+              type: string
+              example: "Technical"
+            numQuestions:
+              type: integer
+              description: Interview questions to generate (1 to MAX_INTERVIEW_QUESTIONS, default 3).
+              example: 3
+    responses:
+      200:
+        description: Batch processed; see the per-item status.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Applications processed"
+            items:
+              type: array
+              items:
+                type: object
+                properties:
+                  index:
+                    type: integer
+                  status:
+                    type: string
+                  applicationId:
+                    type: string
+                  errors:
+                    type: object
+            applications:
+              type: array
+              items:
+                type: object
+      400:
+        description: Missing or invalid fields.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
+      500:
+        description: Internal server error.
+    """
+    user_id = get_jwt_identity()
+
+    try:
+        data = request.get_json()
+        user_resume = _resolve_user_resume(user_id, data)
+        job_descriptions = data.get('jobDescriptions')
+
+        if not user_resume or not job_descriptions or not isinstance(job_descriptions, list):
             return jsonify({"error": "Missing required fields"}), 400
+        if not all(isinstance(job_description, str) and job_description for job_description in job_descriptions):
+            return jsonify({"error": "Every job description must be a non-empty string"}), 400
+        if len(job_descriptions) > BATCH_MAX_JOB_DESCRIPTIONS:
+            return jsonify({"error": f"At most {BATCH_MAX_JOB_DESCRIPTIONS} job descriptions per batch"}), 400
+        num_questions, num_questions_error = _num_questions(data)
+        if num_questions_error:
+            return jsonify({"error": num_questions_error}), 400
 
-        application_result = process_application(user_id, user_resume, job_description)
+        batch_result = process_applications_batch(
+            user_id,
+            user_resume,
+            job_descriptions,
+            data.get('questionType', "Technical"),
+            num_questions,
+        )
 
-        if 'error' in application_result:
-            return jsonify({"error": "Failed to process application"}), 500
+        if 'error' in batch_result:
+            return jsonify({"error": "Failed to process applications", "items": batch_result.get("items")}), 500
 
-        return jsonify({"message": "Application processed", "application": application_result}), 200
+        return jsonify({"message": "Applications processed", **batch_result}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @application_bp.route('/<user_id>/applications', methods=['GET'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def get_applications(user_id):
     """
     Retrieves all applications for a user.
@@ -256,6 +641,8 @@ def get_applications(user_id):
     responses:
       200:
         description: A list of applications.
+      304:
+        description: Not modified since the ETag in If-None-Match.
       404:
         description: No applications found.
     """
@@ -267,11 +654,95 @@ def get_applications(user_id):
     applications = get_user_applications(user_id)
 
     if applications:
-        return jsonify({"applications": applications}), 200
+        return json_response_with_etag({"applications": applications})
     return jsonify({"error": "No applications found"}), 404
 
+@application_bp.route('/<user_id>/applications/rank', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+@_valid_resume_sections
+def rank_user_applications(user_id):
+    """
+    Ranks all of a user's saved applications by how well they match a resume, without LLM calls.
+    ---
+    tags:
+      - Application
+    summary: Rank saved applications against a resume
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: user_id
+        in: path
+        required: true
+        type: string
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            userResume:
+              type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default, e.g. the one just uploaded) or a resume version id.
+            resumeSections:
+              type: array
+              items:
+                type: string
+              description: Only score these sections of the stored resume (education, experience, skills, projects).
+            limit:
+              type: integer
+              description: Return only the best matches.
+    responses:
+      200:
+        description: Applications, best match first.
+        schema:
+          type: object
+          properties:
+            applications:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: string
+                  companyName:
+                    type: string
+                  position:
+                    type: string
+                  location:
+                    type: string
+                  status:
+                    type: string
+                  dateCreated:
+                    type: string
+                  matchScore:
+                    type: integer
+                    example: 72
+      400:
+        description: No resume to rank against.
+      403:
+        description: Unauthorized access.
+    """
+    current_user_id = get_jwt_identity()
+
+    if current_user_id != user_id:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    data = request.get_json(silent=True) or {}
+    user_resume = _resolve_user_resume(user_id, data)
+    if not user_resume:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    limit = data.get('limit')
+    if limit is not None and (not isinstance(limit, int) or limit < 1):
+        return jsonify({"error": "limit must be a positive integer"}), 400
+
+    return jsonify({"applications": rank_applications(user_id, user_resume, limit)}), 200
+
 @application_bp.route('/<user_id>/application/<application_id>', methods=['GET'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def get_application(user_id, application_id):
     """
     Retrieves details of a specific application.
@@ -290,9 +761,18 @@ def get_application(user_id, application_id):
         in: path
         required: true
         type: string
+      - name: fields
+        in: query
+        required: false
+        type: string
+        description: Comma-separated fields to return, e.g. "status,companyName,resumeFeedback.resumeScore".
     responses:
       200:
         description: Application details retrieved successfully.
+      304:
+        description: Not modified since the ETag in If-None-Match.
+      400:
+        description: Unknown field requested.
       404:
         description: Application not found.
     """
@@ -301,14 +781,21 @@ def get_application(user_id, application_id):
     if current_user_id != user_id:
         return jsonify({"error": "Unauthorized access"}), 403
 
-    application = get_application_details(user_id, application_id)
+    fields = None
+    if request.args.get('fields'):
+        try:
+            fields = parse_application_fields(request.args['fields'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    application = get_application_details(user_id, application_id, fields)
 
     if application:
-        return jsonify(application), 200
+        return json_response_with_etag(application)
     return jsonify({"error": "Application not found"}), 404
 
 @application_bp.route('/<user_id>/application/<application_id>/cover-letter', methods=['GET'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def get_cover_letter(user_id, application_id):
     """
     Retrieves the cover letter for a given application.
@@ -330,6 +817,8 @@ def get_cover_letter(user_id, application_id):
     responses:
       200:
         description: Cover letter retrieved successfully.
+      304:
+        description: Not modified since the ETag in If-None-Match.
       404:
         description: Cover letter not found.
     """
@@ -341,11 +830,11 @@ def get_cover_letter(user_id, application_id):
     cover_letter = get_application_cover_letter(user_id, application_id)
 
     if cover_letter:
-        return jsonify(cover_letter), 200
+        return json_response_with_etag(cover_letter)
     return jsonify({"error": "Cover letter not found"}), 404
 
 @application_bp.route('/<user_id>/application/<application_id>/interview-questions', methods=['GET'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def get_interview_questions(user_id, application_id):
     """
     Retrieves interview questions for a given application.
@@ -367,6 +856,8 @@ def get_interview_questions(user_id, application_id):
     responses:
       200:
         description: Interview questions retrieved successfully.
+      304:
+        description: Not modified since the ETag in If-None-Match.
       404:
         description: No interview questions found.
     """
@@ -378,12 +869,12 @@ def get_interview_questions(user_id, application_id):
     questions = get_application_interview_questions(user_id, application_id)
 
     if questions:
-        return jsonify(questions), 200
+        return json_response_with_etag(questions)
     return jsonify({"error": "No interview questions found"}), 404
 
 # Delete an application
 @application_bp.route('/<user_id>/application/<application_id>', methods=['DELETE'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def delete_application(user_id, application_id):
     """
     Deletes a specific application.
@@ -422,7 +913,7 @@ def delete_application(user_id, application_id):
 
 # Update the status of an application
 @application_bp.route('/<user_id>/application/<application_id>/status', methods=['PATCH'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def update_application_status_endpoint(user_id, application_id):
     """
     Updates the status of a specific application.
@@ -474,4 +965,282 @@ def update_application_status_endpoint(user_id, application_id):
     success = update_application_status(user_id, application_id, new_status)
     if success:
         return jsonify({"message": "Application status updated successfully"}), 200
-    return jsonify({"error": "Application not found or could not be updated"}), 404
\ No newline at end of file
+    return jsonify({"error": "Application not found or could not be updated"}), 404
+
+# Regenerate one artifact of an application
+@application_bp.route('/<user_id>/application/<application_id>/regenerate/<artifact>', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_INTERACTIVE)
+def regenerate_artifact(user_id, application_id, artifact):
+    """
+    Regenerates a single artifact of an existing application and updates it in place.
+    ---
+    tags:
+      - Application
+    summary: Regenerate resume feedback, cover letter or interview questions
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: user_id
+        in: path
+        required: true
+        type: string
+      - name: application_id
+        in: path
+        required: true
+        type: string
+      - name: artifact
+        in: path
+        required: true
+        type: string
+        enum: [resume-feedback, cover-letter, interview-questions]
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            userResume:
+              type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            jobDescription:
+              type: string
+              description: Defaults to the job posting stored on the application.
+            questionType:
+              type: string
+            numQuestions:
+              type: integer
+              description: Interview questions to generate (1 to MAX_INTERVIEW_QUESTIONS, default 3).
+    responses:
+      200:
+        description: Artifact regenerated.
+      400:
+        description: Unknown artifact or missing resume.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
+      404:
+        description: Application not found.
+      500:
+        description: Internal server error.
+    """
+    current_user_id = get_jwt_identity()
+
+    if current_user_id != user_id:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    field = REGENERABLE_ARTIFACTS.get(artifact)
+    if not field:
+        return jsonify({"error": f"Unknown artifact '{artifact}'"}), 400
+
+    data = request.get_json(silent=True) or {}
+    user_resume = _resolve_user_resume(user_id, data)
+    if not user_resume:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    num_questions, num_questions_error = _num_questions(data)
+    if num_questions_error:
+        return jsonify({"error": num_questions_error}), 400
+
+    result = regenerate_application_artifact(
+        user_id,
+        application_id,
+        field,
+        user_resume,
+        data.get("jobDescription"),
+        data.get("questionType", "Technical"),
+        num_questions,
+    )
+    if result.get("notFound"):
+        return jsonify({"error": "Application not found"}), 404
+    if result.get("badRequest"):
+        return jsonify({"error": result["error"]}), 400
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 500
+    return jsonify({"message": "Application updated", "application": result}), 200
+
+# Generate the artifacts a partial application is missing
+@application_bp.route('/<user_id>/application/<application_id>/complete', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_INTERACTIVE, cost=3, weight=3)
+def complete_application_endpoint(user_id, application_id):
+    """
+    Generates the artifacts listed in missingArtifacts of a partial application.
+    ---
+    tags:
+      - Application
+    summary: Complete a partial application
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: user_id
+        in: path
+        required: true
+        type: string
+      - name: application_id
+        in: path
+        required: true
+        type: string
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            userResume:
+              type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            jobDescription:
+              type: string
+              description: Defaults to the job posting stored on the application.
+            questionType:
+              type: string
+            numQuestions:
+              type: integer
+              description: Interview questions to generate (1 to MAX_INTERVIEW_QUESTIONS, default 3).
+    responses:
+      200:
+        description: The generated artifacts, with the application's status and what is still missing.
+      400:
+        description: Missing resume or job description.
+      404:
+        description: Application not found.
+      409:
+        description: The application is still being processed by the request that created it.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
+      500:
+        description: Internal server error.
+    """
+    current_user_id = get_jwt_identity()
+
+    if current_user_id != user_id:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    data = request.get_json(silent=True) or {}
+    user_resume = _resolve_user_resume(user_id, data)
+    if not user_resume:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    num_questions, num_questions_error = _num_questions(data)
+    if num_questions_error:
+        return jsonify({"error": num_questions_error}), 400
+
+    result = complete_application(
+        user_id,
+        application_id,
+        user_resume,
+        data.get("jobDescription"),
+        data.get("questionType", "Technical"),
+        num_questions,
+    )
+    if result.get("notFound"):
+        return jsonify({"error": "Application not found"}), 404
+    if result.get("badRequest"):
+        return jsonify({"error": result["error"]}), 400
+    if result.get("conflict"):
+        return jsonify({"error": result["error"]}), 409
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 500
+    return jsonify({"message": "Application updated", "application": result}), 200
+
+# Generate more interview questions for an application
+@application_bp.route('/<user_id>/application/<application_id>/interview-questions/more', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+@_valid_resume_sections
+@_admission_controlled(PRIORITY_INTERACTIVE)
+def more_interview_questions(user_id, application_id):
+    """
+    Generates another page of interview questions without repeating the existing ones.
+    ---
+    tags:
+      - Application
+    summary: Get more interview questions
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: user_id
+        in: path
+        required: true
+        type: string
+      - name: application_id
+        in: path
+        required: true
+        type: string
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            userResume:
+              type: string
+              description: Resume text. Optional when resumeRef is used.
+            resumeRef:
+              type: string
+              description: A stored resume, "current" (default) or a resume version id.
+            questionType:
+              type: string
+            numQuestions:
+              type: integer
+              description: Interview questions to generate (1 to MAX_INTERVIEW_QUESTIONS, default 3).
+    responses:
+      200:
+        description: New questions, appended to the application.
+        schema:
+          type: object
+          properties:
+            interviewQuestions:
+              type: array
+              items:
+                type: object
+            offset:
+              type: integer
+              description: Number of questions the application had before this page.
+            total:
+              type: integer
+      400:
+        description: Missing resume.
+      429:
+        description: Over the caller's rate or concurrency budget; retry after the Retry-After header.
+      404:
+        description: Application not found.
+      500:
+        description: Internal server error.
+    """
+    current_user_id = get_jwt_identity()
+
+    if current_user_id != user_id:
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    data = request.get_json(silent=True) or {}
+    user_resume = _resolve_user_resume(user_id, data)
+    if not user_resume:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    num_questions, num_questions_error = _num_questions(data)
+    if num_questions_error:
+        return jsonify({"error": num_questions_error}), 400
+
+    result = generate_more_interview_questions(
+        user_id,
+        application_id,
+        user_resume,
+        data.get("jobDescription"),
+        data.get("questionType", "Technical"),
+        num_questions,
+    )
+    if result.get("notFound"):
+        return jsonify({"error": "Application not found"}), 404
+    if result.get("badRequest"):
+        return jsonify({"error": result["error"]}), 400
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 500
+    return jsonify(result), 200
\ No newline at end of file
@@ -1,6 +1,9 @@
+import logging
 from flask import Blueprint, request, jsonify
 from services.auth_service import validate_and_create_user
 
+logger = logging.getLogger(__name__)
+
 auth_bp = Blueprint("auth", __name__)
 
 @auth_bp.route("/validate-user", methods=["POST"])
@@ -83,5 +86,5 @@ def validate_user():
         return jsonify({"message": "User validated successfully", "user": user_data}), 200
 
     except Exception as e:
-        print(f"Error in /validate-user: {e}")
+        logger.error("Error in /validate-user: %s", e)
         return jsonify({"error": str(e)}), 500
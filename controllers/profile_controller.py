@@ -0,0 +1,95 @@
+import os
+from flask import Blueprint, Response, request, jsonify
+from flask_jwt_extended import get_jwt_identity
+from utils.tracing import traced_jwt_required
+from repositories.profile_repository import list_profiles, read_profile
+
+profile_bp = Blueprint('profile', __name__)
+
+# Users allowed to read request profiles (comma-separated Auth0 user IDs)
+PROFILE_ADMIN_USER_IDS = {user_id.strip() for user_id in os.getenv("PROFILE_ADMIN_USER_IDS", "").split(",") if user_id.strip()}
+
+def _is_profile_admin():
+    return get_jwt_identity() in PROFILE_ADMIN_USER_IDS
+
+@profile_bp.route('', methods=['GET'])
+@traced_jwt_required()  # Secures this endpoint
+def get_profiles():
+    """
+    Lists the most recent request profiles.
+    ---
+    tags:
+      - Debug
+    summary: List request profiles
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: limit
+        in: query
+        required: false
+        type: integer
+        default: 50
+    responses:
+      200:
+        description: Profiles, most recent first.
+        schema:
+          type: object
+          properties:
+            profiles:
+              type: array
+              items:
+                type: object
+                properties:
+                  fileName:
+                    type: string
+                    example: "20250101T120000Z-POST-application.process.application-1a2b3c4d.txt"
+                  size:
+                    type: integer
+                  createdAt:
+                    type: string
+      403:
+        description: Not a profile admin.
+    """
+    if not _is_profile_admin():
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify({"profiles": list_profiles(limit)}), 200
+
+@profile_bp.route('/<file_name>', methods=['GET'])
+@traced_jwt_required()  # Secures this endpoint
+def download_profile(file_name):
+    """
+    Downloads one request profile: collapsed stacks (.txt, flame graph input) or pyinstrument HTML (.html).
+    ---
+    tags:
+      - Debug
+    summary: Download a request profile
+    security:
+      - BearerAuth: []
+    parameters:
+      - name: file_name
+        in: path
+        required: true
+        type: string
+    responses:
+      200:
+        description: The profile.
+      403:
+        description: Not a profile admin.
+      404:
+        description: Profile not found.
+    """
+    if not _is_profile_admin():
+        return jsonify({"error": "Unauthorized access"}), 403
+
+    profile = read_profile(file_name)
+    if profile is None:
+        return jsonify({"error": "Profile not found"}), 404
+
+    data, content_type = profile
+    return Response(
+        data,
+        content_type=content_type,
+        headers={"Content-Disposition": f"attachment; filename={file_name}"}
+    )
@@ -1,12 +1,38 @@
-from flask import Blueprint, request, jsonify, send_file
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from repositories.storage_repository import fetch_file_from_s3
-from services.user_upload_service import handle_file_upload
+import logging
+from flask import Blueprint, Response, request, jsonify
+from werkzeug.http import http_date
+from flask_jwt_extended import get_jwt_identity
+from utils.tracing import traced_jwt_required
+import os
+from repositories.storage_repository import (
+    S3_PRESIGNED_URL_EXPIRES_SECONDS,
+    fetch_file_from_s3,
+    generate_presigned_fetch_url,
+)
+from services.user_upload_service import (
+    complete_direct_upload,
+    create_direct_upload,
+    handle_file_upload,
+)
+
+logger = logging.getLogger(__name__)
 
 user_bp = Blueprint('user', __name__)
 
+# Default fetch mode: "proxy" streams the PDF through the API, "url" returns a presigned S3 URL
+PDF_FETCH_MODE = os.getenv("PDF_FETCH_MODE", "proxy")
+PDF_STREAM_CHUNK_SIZE = int(os.getenv("PDF_STREAM_CHUNK_SIZE_KB", "64")) * 1024
+
+# Streams an S3 body in fixed-size chunks and closes it when done
+def _stream_s3_body(body):
+    try:
+        for chunk in body.iter_chunks(chunk_size=PDF_STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        body.close()
+
 @user_bp.route('/upload-pdf', methods=['POST'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def upload_pdf():
     """
     Upload a PDF file for the user's resume.
@@ -57,11 +83,11 @@ def upload_pdf():
         }), 200
 
     except Exception as e:
-        print(f"Error in upload_pdf: {e}")
+        logger.error("Error in upload_pdf: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @user_bp.route('/fetch-pdf/<user_id>', methods=['GET'])
-@jwt_required()  # Secures this endpoint
+@traced_jwt_required()  # Secures this endpoint
 def fetch_pdf(user_id):
     """
     Fetch the uploaded PDF from S3 using the user ID and return it as a downloadable file.
@@ -70,19 +96,46 @@ def fetch_pdf(user_id):
       - User
     summary: Fetch PDF by User ID
     description: Retrieves the PDF file for the user's resume from S3 using their user ID.
+                 With mode=url, returns a short-lived presigned S3 URL instead of the file.
+                 Supports If-None-Match / If-Modified-Since (304) and single byte Range requests (206).
     parameters:
       - name: user_id
         in: path
         required: true
         type: string
         description: User ID to fetch the PDF.
+      - name: mode
+        in: query
+        required: false
+        type: string
+        enum: [proxy, url]
+        description: How to deliver the PDF (defaults to the server's PDF_FETCH_MODE).
+      - name: If-None-Match
+        in: header
+        required: false
+        type: string
+      - name: If-Modified-Since
+        in: header
+        required: false
+        type: string
+      - name: Range
+        in: header
+        required: false
+        type: string
+        description: A single byte range, e.g. "bytes=0-1023".
     responses:
       200:
-        description: PDF fetched successfully.
+        description: PDF fetched successfully, or the presigned URL when mode=url.
         schema:
           type: string
+      206:
+        description: The requested byte range of the PDF.
+      304:
+        description: The client's cached copy is still current.
       400:
         description: Failed to fetch the PDF file.
+      416:
+        description: The requested range is not satisfiable.
       401:
         description: Unauthorized access.
       500:
@@ -97,14 +150,123 @@ def fetch_pdf(user_id):
         return jsonify({"error": "Unauthorized access"}), 403
 
     try:
-        # Fetch file from S3
-        pdf_file = fetch_file_from_s3(user_id)
-        return send_file(
-            pdf_file,
+        # Hand out a presigned URL so the bytes never pass through this function
+        if request.args.get("mode", PDF_FETCH_MODE) == "url":
+            return jsonify({
+                "url": generate_presigned_fetch_url(user_id),
+                "expiresIn": S3_PRESIGNED_URL_EXPIRES_SECONDS,
+            }), 200
+
+        # Fetch file from S3, letting S3 evaluate the validators and range
+        s3_object = fetch_file_from_s3(
+            user_id,
+            if_none_match=request.headers.get("If-None-Match"),
+            if_modified_since=request.if_modified_since,
+            byte_range=request.headers.get("Range"),
+        )
+
+        if s3_object.get("notModified"):
+            headers = {"ETag": s3_object["etag"]} if s3_object.get("etag") else {}
+            return Response(status=304, headers=headers)
+
+        if s3_object.get("rangeNotSatisfiable"):
+            headers = {"Content-Range": s3_object["contentRange"]} if s3_object.get("contentRange") else {}
+            return Response(status=416, headers=headers)
+
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f'attachment; filename="{user_id}-resume.pdf"',
+            "Content-Length": str(s3_object["contentLength"]),
+            "Cache-Control": "private, no-cache",
+        }
+        if s3_object.get("etag"):
+            headers["ETag"] = s3_object["etag"]
+        if s3_object.get("lastModified"):
+            headers["Last-Modified"] = http_date(s3_object["lastModified"])
+        if s3_object.get("contentRange"):
+            headers["Content-Range"] = s3_object["contentRange"]
+
+        return Response(
+            _stream_s3_body(s3_object["body"]),
+            status=206 if s3_object.get("contentRange") else 200,
             mimetype="application/pdf",
-            as_attachment=True,
-            download_name=f"{user_id}-resume.pdf",
+            headers=headers,
+            direct_passthrough=True,
         )
     except Exception as e:
-        print(f"Error in fetch_pdf: {e}")
+        logger.error("Error in fetch_pdf: %s", e)
         return jsonify({"error": str(e)}), 500
+
+@user_bp.route('/upload-url', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+def upload_url():
+    """
+    Create a presigned POST for uploading the resume PDF directly to S3.
+    ---
+    tags:
+      - User
+    summary: Get a direct-to-S3 upload form
+    description: Returns the URL and form fields for a multipart POST straight to S3.
+                 Call /user/upload-complete once the upload succeeds to extract the resume text.
+    responses:
+      200:
+        description: Presigned upload created.
+        schema:
+          type: object
+          properties:
+            upload:
+              type: object
+              properties:
+                url:
+                  type: string
+                fields:
+                  type: object
+            expiresIn:
+              type: integer
+      500:
+        description: Internal server error.
+    security:
+      - BearerAuth: []
+    """
+    current_user_id = get_jwt_identity()
+
+    result = create_direct_upload(current_user_id)
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 500
+    return jsonify(result), 200
+
+@user_bp.route('/upload-complete', methods=['POST'])
+@traced_jwt_required()  # Secures this endpoint
+def upload_complete():
+    """
+    Complete a direct-to-S3 upload and extract the resume text.
+    ---
+    tags:
+      - User
+    summary: Complete a direct upload
+    description: Reads the uploaded PDF from S3, extracts its text and updates the user's resume.
+    responses:
+      200:
+        description: Resume processed successfully.
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+            resumeUrl:
+              type: string
+      400:
+        description: The uploaded object is missing or invalid.
+    security:
+      - BearerAuth: []
+    """
+    current_user_id = get_jwt_identity()
+
+    result = complete_direct_upload(current_user_id)
+    if "error" in result:
+        return jsonify({"error": result["error"]}), 400
+
+    return jsonify({
+        "message": "Resume uploaded successfully.",
+        "resumeUrl": result.get("resumeUrl", "No URL available"),
+    }), 200
@@ -1,32 +1,65 @@
 from datetime import datetime
-from typing import Dict, List
-from bson import ObjectId
-
-
-class Application:
-    def __init__(self, companyName: str, position: str, location: str, jobDescription: str,
-                 resumeFeedback: Dict, coverLetter: Dict, interviewQuestions: List[Dict], status: str):
-        self.id = str(ObjectId())
-        self.companyName = companyName
-        self.position = position
-        self.location = location
-        self.jobDescription = jobDescription
-        self.resumeFeedback = resumeFeedback 
-        self.coverLetter = coverLetter
-        self.interviewQuestions = interviewQuestions
-        self.status = status
-        self.dateCreated = datetime.utcnow()
+from typing import Any, Dict, List, Optional, Union
+from uuid import uuid4
+import msgspec
+
+
+# Structured resume feedback returned by the LLM. Fields the model left out stay out of
+# the encoded output (omit_defaults) so stored documents keep their previous shape.
+class ResumeFeedback(msgspec.Struct, omit_defaults=True):
+    companyName: Optional[str] = "Not specified"
+    position: Optional[str] = "Not specified"
+    location: Optional[str] = "Not specified"
+    jobDescription: Optional[str] = "Not specified"
+    resumeFeedback: Union[str, List[Any], Dict[str, Any]] = ""
+    resumeScore: Union[int, float, str, None] = None
+
+
+# Resume-independent analysis of a job posting, shared by every user who submits it
+class JobDescriptionAnalysis(msgspec.Struct):
+    companyName: Optional[str] = "Not specified"
+    position: Optional[str] = "Not specified"
+    location: Optional[str] = "Not specified"
+    jobDescription: Optional[str] = "Not specified"
+
+
+# Cover letter returned by the LLM
+class CoverLetter(msgspec.Struct, omit_defaults=True, kw_only=True):
+    companyName: Optional[str] = None
+    position: Optional[str] = None
+    coverLetterBody: str
+
+
+# One generated interview question with its model answer
+class InterviewQuestion(msgspec.Struct, omit_defaults=True, kw_only=True):
+    type: Optional[str] = None
+    question: str
+    answer: str = ""
+
+
+# Envelope of the interview questions LLM response
+class InterviewQuestionsResponse(msgspec.Struct):
+    interviewQuestions: List[InterviewQuestion] = msgspec.field(default_factory=list)
+
+
+# Application embedded in a user document. Artifacts are kept as documents so that
+# failed generations ({"error": ...}) and later additions round-trip unchanged.
+class Application(msgspec.Struct, kw_only=True):
+    id: str = msgspec.field(default_factory=lambda: str(uuid4()))
+    companyName: str
+    position: str
+    location: str
+    jobDescription: str
+    # The job posting as submitted; artifacts are regenerated from it rather than from the summary
+    sourceJobDescription: Optional[str] = None
+    resumeFeedback: Dict[str, Any]
+    coverLetter: Dict[str, Any]
+    interviewQuestions: Union[List[Dict[str, Any]], Dict[str, Any]]
+    status: str
+    errors: Optional[Dict[str, str]] = None
+    # Artifacts not generated before the deadline of a "Partial" application
+    missingArtifacts: Optional[List[str]] = None
+    dateCreated: str = msgspec.field(default_factory=lambda: datetime.utcnow().isoformat())
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "companyName": self.companyName,
-            "position": self.position,
-            "location": self.location,
-            "jobDescription": self.jobDescription,
-            "resumeFeedback": self.resumeFeedback,
-            "coverLetter": self.coverLetter,
-            "interviewQuestions": self.interviewQuestions,
-            "status": self.status,
-            "dateCreated": self.dateCreated
-        }
+        return msgspec.to_builtins(self, builtin_types=(datetime,))
@@ -1,28 +1,22 @@
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from bson import ObjectId
+import msgspec
 
-class User:
-    def __init__(self, userId: str, email: str, firstName: str, lastName: str, resume: str, applications: List[Dict]):
-        self._id = ObjectId()
-        self.userId = userId
-        self.email = email
-        self.firstName = firstName
-        self.lastName = lastName
-        self.resume = resume
-        self.applications = applications  # List of embedded Application objects
-        self.createdAt = datetime.utcnow()
-        self.updatedAt = datetime.utcnow()
+class User(msgspec.Struct):
+    userId: str
+    email: str
+    firstName: str
+    lastName: str
+    resume: str = ""
+    applications: List[Dict] = msgspec.field(default_factory=list)  # List of embedded application documents
+    resumeUrl: Optional[str] = None
+    resumeHash: Optional[str] = None
+    resumeVersions: List[str] = msgspec.field(default_factory=list)
+    _id: str = msgspec.field(default_factory=lambda: str(ObjectId()))  # string ids, like existing users
+    createdAt: datetime = msgspec.field(default_factory=datetime.utcnow)
+    updatedAt: datetime = msgspec.field(default_factory=datetime.utcnow)
 
+    # Mongo document: datetimes stay native so they are stored as BSON dates
     def to_dict(self):
-        return {
-            "_id": str(self._id),
-            "userId": self.userId,
-            "email": self.email,
-            "firstName": self.firstName,
-            "lastName": self.lastName,
-            "resume": self.resume,
-            "applications": [app.to_dict() for app in self.applications],
-            "createdAt": self.createdAt,
-            "updatedAt": self.updatedAt
-        }
+        return {key: value for key, value in msgspec.structs.asdict(self).items() if value is not None}
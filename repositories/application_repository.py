@@ -1,7 +1,12 @@
+import logging
 from config.database import user_collections
 from datetime import datetime
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
 
 # Save application to database
+@traced("db.save_application")
 def save_application(user_id, application_data):
     try:
         result = user_collections.update_one(
@@ -13,10 +18,27 @@ def save_application(user_id, application_data):
         )
         return result.modified_count > 0
     except Exception as e:
-        print(f"Error saving application: {e}")
+        logger.error("Error saving application: %s", e)
+        return False
+
+# Save several applications to the database in one write
+@traced("db.save_applications")
+def save_applications(user_id, applications):
+    try:
+        result = user_collections.update_one(
+            {"userId": user_id},
+            {
+                "$push": {"applications": {"$each": applications}},
+                "$set": {"updatedAt": datetime.utcnow()}
+            }
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        logger.error("Error saving applications: %s", e)
         return False
 
 # Get all applications for a user, excluding resumeFeedback, coverLetter, and interviewQuestions
+@traced("db.get_applications_by_user")
 def get_applications_by_user(user_id):
     user = user_collections.find_one(
         {"userId": user_id},
@@ -33,25 +55,51 @@ def get_applications_by_user(user_id):
     return user.get("applications", []) if user else []
 
 
+# Get only the given fields of each of a user's applications
+@traced("db.get_application_fields_by_user")
+def get_application_fields_by_user(user_id, fields):
+    user = user_collections.find_one(
+        {"userId": user_id},
+        {"_id": 0, **{f"applications.{field}": 1 for field in fields}}
+    )
+    return user.get("applications", []) if user else []
+
+
 
-# Get application details by application ID
-def get_application_by_id(user_id, app_id):
-    user = user_collections.find_one({"userId": user_id})
-    if not user:
-        return None
-    return next((app for app in user.get("applications", []) if str(app["id"]) == app_id), None)
+# Get application details by application ID. Only the matching application leaves the database,
+# and `fields` (paths inside the application, e.g. "resumeFeedback.resumeScore") narrows it further.
+@traced("db.get_application_by_id")
+def get_application_by_id(user_id, app_id, fields=None):
+    pipeline = [
+        {"$match": {"userId": user_id, "applications.id": app_id}},
+        {"$project": {
+            "_id": 0,
+            "application": {"$arrayElemAt": [
+                {"$filter": {"input": "$applications", "as": "app", "cond": {"$eq": ["$$app.id", app_id]}}},
+                0
+            ]}
+        }}
+    ]
+    if fields:
+        pipeline.append({"$project": {"application.id": 1, **{f"application.{field}": 1 for field in fields}}})
+
+    result = next(user_collections.aggregate(pipeline), None)
+    return result.get("application") if result else None
 
 # Get cover letter for a specific application
+@traced("db.get_cover_letter_by_app_id")
 def get_cover_letter_by_app_id(user_id, app_id):
-    application = get_application_by_id(user_id, app_id)
+    application = get_application_by_id(user_id, app_id, ["coverLetter"])
     return application.get("coverLetter") if application else None
 
 # Get interview questions for a specific application
+@traced("db.get_interview_questions_by_app_id")
 def get_interview_questions_by_app_id(user_id, app_id):
-    application = get_application_by_id(user_id, app_id)
+    application = get_application_by_id(user_id, app_id, ["interviewQuestions"])
     return application.get("interviewQuestions") if application else None
 
 # Delete application by id
+@traced("db.delete_application_by_id")
 def delete_application_by_id(user_id, app_id):
     try:
         result = user_collections.update_one(
@@ -60,10 +108,11 @@ def delete_application_by_id(user_id, app_id):
         )
         return result.modified_count > 0
     except Exception as e:
-        print(f"Error deleting application: {e}")
+        logger.error("Error deleting application: %s", e)
         return False
     
 # Update application status
+@traced("db.update_application_status")
 def update_application_status(user_id, application_id, new_status):
     try:
         result = user_collections.update_one(
@@ -72,5 +121,66 @@ def update_application_status(user_id, application_id, new_status):
         )
         return result.modified_count > 0
     except Exception as e:
-        print(f"Error updating application status: {e}")
-        return False
\ No newline at end of file
+        logger.error("Error updating application status: %s", e)
+        return False
+
+# Update fields of one application in place with a targeted $set
+@traced("db.update_application_fields")
+def update_application_fields(user_id, application_id, fields):
+    try:
+        result = user_collections.update_one(
+            {"userId": user_id, "applications.id": application_id},
+            {"$set": {
+                **{f"applications.$.{field}": value for field, value in fields.items()},
+                "updatedAt": datetime.utcnow()
+            }}
+        )
+        # Matched, not modified: rewriting values already stored within the same millisecond
+        # (dates are stored at millisecond precision) changes nothing but still succeeded
+        return result.matched_count > 0
+    except Exception as e:
+        logger.error("Error updating application fields: %s", e)
+        return False
+
+# Append interview questions to an application
+@traced("db.append_interview_questions")
+def append_interview_questions(user_id, application_id, questions):
+    try:
+        result = user_collections.update_one(
+            {"userId": user_id, "applications.id": application_id},
+            {
+                "$push": {"applications.$.interviewQuestions": {"$each": questions}},
+                "$set": {"updatedAt": datetime.utcnow()}
+            }
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        logger.error("Error appending interview questions: %s", e)
+        return False
+
+# Save an artifact that a partial application is still missing and, once nothing is missing, set
+# its completed status. Returns False if the artifact was no longer missing (already completed).
+@traced("db.save_missing_artifact")
+def save_missing_artifact(user_id, application_id, artifact, fields, completed_status):
+    try:
+        result = user_collections.update_one(
+            {"userId": user_id, "applications": {"$elemMatch": {"id": application_id, "missingArtifacts": artifact}}},
+            {
+                "$set": {
+                    **{f"applications.$.{field}": value for field, value in fields.items()},
+                    "updatedAt": datetime.utcnow()
+                },
+                "$pull": {"applications.$.missingArtifacts": artifact}
+            }
+        )
+        if result.modified_count == 0:
+            return False
+
+        user_collections.update_one(
+            {"userId": user_id, "applications": {"$elemMatch": {"id": application_id, "missingArtifacts": {"$size": 0}}}},
+            {"$set": {"applications.$.status": completed_status, "applications.$.missingArtifacts": None}}
+        )
+        return True
+    except Exception as e:
+        logger.error("Error saving missing artifact: %s", e)
+        return False
@@ -0,0 +1,79 @@
+import logging
+from config.database import generation_lease_collections
+from datetime import datetime, timedelta
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+_indexes_ready = False
+
+# Leases and their results are removed by a TTL index once they expire
+def _ensure_indexes():
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    try:
+        generation_lease_collections.create_index([("expiresAt", ASCENDING)], expireAfterSeconds=0)
+        _indexes_ready = True
+    except Exception as e:
+        logger.error("Error creating generation lease indexes: %s", e)
+
+# Acquire the lease for a generation key. Returns (True, None) for the owner, or (False, existing lease).
+# An expired lease is taken over: a running one whose owner died, or a completed one the TTL monitor
+# has not removed yet.
+@traced("db.acquire_generation_lease")
+def acquire_generation_lease(key, lease_seconds):
+    _ensure_indexes()
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=lease_seconds)
+    try:
+        generation_lease_collections.insert_one({"_id": key, "status": "running", "createdAt": now, "expiresAt": expires_at})
+        return True, None
+    except DuplicateKeyError:
+        pass
+
+    result = generation_lease_collections.update_one(
+        {"_id": key, "expiresAt": {"$lt": now}},
+        {"$set": {"status": "running", "createdAt": now, "expiresAt": expires_at}, "$unset": {"result": ""}}
+    )
+    if result.modified_count > 0:
+        return True, None
+    return False, find_generation_lease(key)
+
+# Get a generation lease
+@traced("db.find_generation_lease")
+def find_generation_lease(key):
+    try:
+        return generation_lease_collections.find_one({"_id": key})
+    except Exception as e:
+        logger.error("Error finding generation lease: %s", e)
+        return None
+
+# Publish the result of a generation for waiting instances
+@traced("db.complete_generation_lease")
+def complete_generation_lease(key, result, result_ttl_seconds):
+    try:
+        generation_lease_collections.update_one(
+            {"_id": key},
+            {"$set": {
+                "status": "completed",
+                "result": result,
+                "expiresAt": datetime.utcnow() + timedelta(seconds=result_ttl_seconds),
+            }}
+        )
+        return True
+    except Exception as e:
+        logger.error("Error completing generation lease: %s", e)
+        return False
+
+# Drop a lease whose generation failed so waiters run it themselves
+@traced("db.release_generation_lease")
+def release_generation_lease(key):
+    try:
+        generation_lease_collections.delete_one({"_id": key, "status": "running"})
+        return True
+    except Exception as e:
+        logger.error("Error releasing generation lease: %s", e)
+        return False
@@ -0,0 +1,87 @@
+import logging
+from config.database import idempotency_collections
+from datetime import datetime, timedelta
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+_indexes_ready = False
+
+# Completed keys are removed by a TTL index once they expire
+def _ensure_indexes():
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    try:
+        idempotency_collections.create_index([("expiresAt", ASCENDING)], expireAfterSeconds=0)
+        _indexes_ready = True
+    except Exception as e:
+        logger.error("Error creating idempotency indexes: %s", e)
+
+# Claim a key for processing. Returns (True, None) when the caller owns it, or (False, existing record).
+# An in-progress record whose lease has run out (its owner crashed) is taken over.
+@traced("db.claim_idempotency_key")
+def claim_idempotency_key(key_id, request_hash, lease_seconds, ttl_seconds):
+    _ensure_indexes()
+    now = datetime.utcnow()
+    record = {
+        "_id": key_id,
+        "status": "in_progress",
+        "requestHash": request_hash,
+        "createdAt": now,
+        "leaseExpiresAt": now + timedelta(seconds=lease_seconds),
+        "expiresAt": now + timedelta(seconds=ttl_seconds),
+    }
+    try:
+        idempotency_collections.insert_one(record)
+        return True, None
+    except DuplicateKeyError:
+        pass
+
+    result = idempotency_collections.update_one(
+        {"_id": key_id, "status": "in_progress", "requestHash": request_hash, "leaseExpiresAt": {"$lt": now}},
+        {"$set": {"leaseExpiresAt": record["leaseExpiresAt"], "expiresAt": record["expiresAt"]}}
+    )
+    if result.modified_count > 0:
+        return True, None
+    return False, find_idempotency_key(key_id)
+
+# Get the record of a key
+@traced("db.find_idempotency_key")
+def find_idempotency_key(key_id):
+    try:
+        return idempotency_collections.find_one({"_id": key_id})
+    except Exception as e:
+        logger.error("Error finding idempotency key: %s", e)
+        return None
+
+# Store the response of a completed request
+@traced("db.complete_idempotency_key")
+def complete_idempotency_key(key_id, response_body, status_code, ttl_seconds):
+    try:
+        result = idempotency_collections.update_one(
+            {"_id": key_id},
+            {"$set": {
+                "status": "completed",
+                "responseBody": response_body,
+                "statusCode": status_code,
+                "completedAt": datetime.utcnow(),
+                "expiresAt": datetime.utcnow() + timedelta(seconds=ttl_seconds),
+            }}
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        logger.error("Error completing idempotency key: %s", e)
+        return False
+
+# Release a key whose request failed so a retry can run it again
+@traced("db.release_idempotency_key")
+def release_idempotency_key(key_id):
+    try:
+        result = idempotency_collections.delete_one({"_id": key_id, "status": "in_progress"})
+        return result.deleted_count > 0
+    except Exception as e:
+        logger.error("Error releasing idempotency key: %s", e)
+        return False
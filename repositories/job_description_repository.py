@@ -0,0 +1,79 @@
+import logging
+from config.database import job_analysis_collections
+from datetime import datetime
+from typing import List
+from pymongo import ASCENDING
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+_indexes_ready = False
+
+# Band lookups for near-duplicates; analyses nobody used for ttl_seconds are removed
+def _ensure_indexes(ttl_seconds: int):
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    try:
+        job_analysis_collections.create_index([("bands", ASCENDING)])
+        job_analysis_collections.create_index([("lastUsedAt", ASCENDING)], expireAfterSeconds=ttl_seconds)
+        _indexes_ready = True
+    except Exception as e:
+        logger.error("Error creating job description analysis indexes: %s", e)
+
+# Get the analysis of an exactly matching (normalised) job description and mark it used
+@traced("db.find_job_analysis")
+def find_job_analysis(fingerprint: str, analyzer_version: int):
+    try:
+        return job_analysis_collections.find_one_and_update(
+            {"_id": fingerprint, "analyzerVersion": analyzer_version},
+            {"$set": {"lastUsedAt": datetime.utcnow()}, "$inc": {"hits": 1}},
+            projection={"analysis": 1}
+        )
+    except Exception as e:
+        logger.error("Error finding job description analysis: %s", e)
+        return None
+
+# Get near-duplicate candidates: analyses sharing at least one LSH band
+@traced("db.find_job_analysis_candidates")
+def find_job_analysis_candidates(bands: List[str], analyzer_version: int, limit: int = 20):
+    try:
+        return list(job_analysis_collections.find(
+            {"bands": {"$in": bands}, "analyzerVersion": analyzer_version},
+            {"analysis": 1, "signature": 1, "figures": 1}
+        ).limit(limit))
+    except Exception as e:
+        logger.error("Error finding job description analysis candidates: %s", e)
+        return []
+
+# Record a near-duplicate hit on an existing analysis
+@traced("db.touch_job_analysis")
+def touch_job_analysis(fingerprint: str) -> bool:
+    try:
+        result = job_analysis_collections.update_one(
+            {"_id": fingerprint},
+            {"$set": {"lastUsedAt": datetime.utcnow()}, "$inc": {"hits": 1}}
+        )
+        return result.acknowledged
+    except Exception as e:
+        logger.error("Error updating job description analysis: %s", e)
+        return False
+
+# Save an analysis with its MinHash signature and LSH bands
+@traced("db.save_job_analysis")
+def save_job_analysis(fingerprint: str, document: dict, ttl_seconds: int) -> bool:
+    _ensure_indexes(ttl_seconds)
+    try:
+        now = datetime.utcnow()
+        result = job_analysis_collections.update_one(
+            {"_id": fingerprint},
+            {
+                "$set": {**document, "updatedAt": now, "lastUsedAt": now},
+                "$setOnInsert": {"createdAt": now, "hits": 0}
+            },
+            upsert=True
+        )
+        return result.acknowledged
+    except Exception as e:
+        logger.error("Error saving job description analysis: %s", e)
+        return False
@@ -0,0 +1,100 @@
+import logging
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+from repositories.storage_repository import AWS_S3_BUCKET, s3_client
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# "local" keeps profiles on this instance's disk; "s3" shares them between instances
+PROFILE_STORAGE = os.getenv("PROFILE_STORAGE", "local").lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/profiles")
+PROFILE_S3_PREFIX = "profiles/"
+# Local profiles beyond this many are deleted oldest first (use a lifecycle rule on the S3 prefix)
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+
+PROFILE_CONTENT_TYPES = {"txt": "text/plain; charset=utf-8", "html": "text/html; charset=utf-8"}
+
+
+def _local_path(file_name: str) -> str:
+    return os.path.join(PROFILE_DIR, file_name)
+
+
+def _prune_local_profiles():
+    profiles = sorted(os.scandir(PROFILE_DIR), key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in profiles[PROFILE_MAX_STORED:]:
+        os.remove(entry.path)
+
+
+# Stores a profile as <profile_id>.<extension>
+@traced("profile.save_profile")
+def save_profile(profile_id: str, extension: str, data: bytes) -> bool:
+    file_name = f"{profile_id}.{extension}"
+    try:
+        if PROFILE_STORAGE == "s3":
+            s3_client.put_object(
+                Bucket=AWS_S3_BUCKET,
+                Key=PROFILE_S3_PREFIX + file_name,
+                Body=data,
+                ContentType=PROFILE_CONTENT_TYPES[extension],
+            )
+        else:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(_local_path(file_name), "wb") as f:
+                f.write(data)
+            _prune_local_profiles()
+        return True
+    except Exception as e:
+        logger.error("Error saving profile: %s", e)
+        return False
+
+
+# Most recent profiles first: [{fileName, size, createdAt}]
+def list_profiles(limit: int = 50) -> List[dict]:
+    try:
+        if PROFILE_STORAGE == "s3":
+            profiles = []
+            paginator = s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=AWS_S3_BUCKET, Prefix=PROFILE_S3_PREFIX):
+                for s3_object in page.get("Contents", []):
+                    profiles.append({
+                        "fileName": s3_object["Key"][len(PROFILE_S3_PREFIX):],
+                        "size": s3_object["Size"],
+                        "createdAt": s3_object["LastModified"],
+                    })
+        else:
+            if not os.path.isdir(PROFILE_DIR):
+                return []
+            profiles = [
+                {
+                    "fileName": entry.name,
+                    "size": entry.stat().st_size,
+                    "createdAt": datetime.fromtimestamp(entry.stat().st_mtime, timezone.utc),
+                }
+                for entry in os.scandir(PROFILE_DIR)
+            ]
+        profiles.sort(key=lambda profile: profile["createdAt"], reverse=True)
+        return profiles[:limit]
+    except Exception as e:
+        logger.error("Error listing profiles: %s", e)
+        return []
+
+
+# Returns (data, content type), or None when there is no such profile
+def read_profile(file_name: str) -> Optional[tuple]:
+    extension = file_name.rsplit(".", 1)[-1]
+    # Names come from list_profiles; anything else (paths, other extensions) is rejected
+    if extension not in PROFILE_CONTENT_TYPES or os.path.basename(file_name) != file_name:
+        return None
+    try:
+        if PROFILE_STORAGE == "s3":
+            s3_object = s3_client.get_object(Bucket=AWS_S3_BUCKET, Key=PROFILE_S3_PREFIX + file_name)
+            return s3_object["Body"].read(), PROFILE_CONTENT_TYPES[extension]
+        with open(_local_path(file_name), "rb") as f:
+            return f.read(), PROFILE_CONTENT_TYPES[extension]
+    except (FileNotFoundError, s3_client.exceptions.NoSuchKey):
+        return None
+    except Exception as e:
+        logger.error("Error reading profile: %s", e)
+        return None
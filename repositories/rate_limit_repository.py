@@ -0,0 +1,91 @@
+import logging
+from config.database import rate_limit_collections
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Idle counters are removed by a TTL index after this long
+COUNTER_IDLE_TTL_SECONDS = 3600
+
+
+# Mongo-backed counter store shared by all instances (same interface as utils.rate_limiter.InMemoryCounterStore)
+class MongoCounterStore:
+    def __init__(self, collection=rate_limit_collections):
+        self.collection = collection
+        self._indexes_ready = False
+
+    def _ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        try:
+            self.collection.create_index([("expiresAt", ASCENDING)], expireAfterSeconds=0)
+            self._indexes_ready = True
+        except Exception as e:
+            logger.error("Error creating rate limit indexes: %s", e)
+
+    # Token bucket refilled and charged atomically with an update pipeline; like the in-memory
+    # store, a cost above capacity needs a full bucket and leaves it in debt
+    def take_tokens(self, key, cost, rate, capacity):
+        self._ensure_indexes()
+        required = min(cost, capacity)
+        now = datetime.utcnow()
+        elapsed_seconds = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updatedAt", now]}]}, 1000]}
+        try:
+            bucket = self.collection.find_one_and_update(
+                {"_id": f"bucket:{key}"},
+                [
+                    {"$set": {
+                        "tokens": {"$min": [capacity, {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed_seconds, rate]}]}]},
+                        "updatedAt": now,
+                        "expiresAt": now + timedelta(seconds=COUNTER_IDLE_TTL_SECONDS),
+                    }},
+                    {"$set": {"allowed": {"$gte": ["$tokens", required]}}},
+                    {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]}}},
+                ],
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except Exception as e:
+            # Fail open: rate limiting must not take the API down with the database
+            logger.error("Error taking rate limit tokens: %s", e)
+            return 0
+        if bucket["allowed"]:
+            return 0
+        return (required - bucket["tokens"]) / rate
+
+    # Give back tokens taken for a request that was then turned away
+    def refund_tokens(self, key, cost, capacity):
+        try:
+            self.collection.update_one(
+                {"_id": f"bucket:{key}"},
+                [{"$set": {"tokens": {"$min": [capacity, {"$add": ["$tokens", cost]}]}}}]
+            )
+        except Exception as e:
+            logger.error("Error refunding rate limit tokens: %s", e)
+
+    # Concurrency slot; the upsert collides on _id when the counter is already at the limit
+    def acquire_slot(self, key, limit):
+        self._ensure_indexes()
+        try:
+            self.collection.find_one_and_update(
+                {"_id": f"slots:{key}", "inFlight": {"$lt": limit}},
+                {
+                    "$inc": {"inFlight": 1},
+                    "$set": {"expiresAt": datetime.utcnow() + timedelta(seconds=COUNTER_IDLE_TTL_SECONDS)},
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+        except Exception as e:
+            logger.error("Error acquiring concurrency slot: %s", e)
+            return True
+
+    def release_slot(self, key):
+        try:
+            self.collection.update_one({"_id": f"slots:{key}", "inFlight": {"$gt": 0}}, {"$inc": {"inFlight": -1}})
+        except Exception as e:
+            logger.error("Error releasing concurrency slot: %s", e)
@@ -0,0 +1,34 @@
+import logging
+from config.database import resume_parse_collections
+from datetime import datetime
+from typing import Iterable, Optional
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Get a parse artifact by the SHA-256 of its PDF, optionally limited to some fields
+@traced("db.find_resume_parse")
+def find_resume_parse(content_hash: str, fields: Optional[Iterable[str]] = None):
+    try:
+        projection = {field: 1 for field in fields} if fields else None
+        return resume_parse_collections.find_one({"_id": content_hash}, projection)
+    except Exception as e:
+        logger.error("Error finding resume parse: %s", e)
+        return None
+
+# Save a parse artifact (idempotent: the same PDF always produces the same document id)
+@traced("db.save_resume_parse")
+def save_resume_parse(content_hash: str, artifact: dict) -> bool:
+    try:
+        result = resume_parse_collections.update_one(
+            {"_id": content_hash},
+            {
+                "$set": {**artifact, "updatedAt": datetime.utcnow()},
+                "$setOnInsert": {"createdAt": datetime.utcnow()}
+            },
+            upsert=True
+        )
+        return result.acknowledged
+    except Exception as e:
+        logger.error("Error saving resume parse: %s", e)
+        return False
@@ -1,10 +1,22 @@
+import logging
 import boto3
 import os
 import io
+from datetime import datetime
+from typing import Optional
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET")
 AWS_REGION = os.getenv("AWS_REGION")
+# Optional S3-compatible endpoint (e.g. MinIO or moto_server for local testing)
+AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")
+S3_PRESIGNED_URL_EXPIRES_SECONDS = int(os.getenv("S3_PRESIGNED_URL_EXPIRES_SECONDS", "300"))
 
 # S3 Client
 s3_client = boto3.client(
@@ -12,34 +24,128 @@ s3_client = boto3.client(
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
     aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
     region_name=AWS_REGION,
+    endpoint_url=AWS_S3_ENDPOINT_URL,
+    # Local stand-ins generally only support path-style addressing
+    config=Config(s3={"addressing_style": "path"}) if AWS_S3_ENDPOINT_URL else None,
+)
+
+# Multipart transfer settings (sizes in MB) for larger files
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8")) * 1024 * 1024,
+    multipart_chunksize=int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "8")) * 1024 * 1024,
+    max_concurrency=int(os.getenv("S3_MAX_CONCURRENCY", "10")),
+    use_threads=True,
 )
 
-# Uploads a file to the S3 bucket.
-def upload_file_to_s3(file_path: str, user_id: str) -> str:
+# Builds the S3 key of a user's resume
+def get_resume_key(user_id: str) -> str:
+    return f"resumes/{user_id}-resume.pdf"
+
+# Builds the URL of an object in the bucket
+def get_file_url(s3_key: str) -> str:
+    if AWS_S3_ENDPOINT_URL:
+        return f"{AWS_S3_ENDPOINT_URL.rstrip('/')}/{AWS_S3_BUCKET}/{s3_key}"
+    return f"https://{AWS_S3_BUCKET}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
+
+# Uploads an in-memory file to the S3 bucket.
+@traced("s3.upload_file_to_s3")
+def upload_file_to_s3(file_bytes: bytes, user_id: str) -> str:
     try:
         # Define the S3 file path
-        s3_key = f"resumes/{user_id}-resume.pdf"
+        s3_key = get_resume_key(user_id)
 
-        # Upload file to S3
-        s3_client.upload_file(file_path, AWS_S3_BUCKET, s3_key)
+        # Upload file to S3 straight from memory
+        s3_client.upload_fileobj(
+            io.BytesIO(file_bytes),
+            AWS_S3_BUCKET,
+            s3_key,
+            ExtraArgs={"ContentType": "application/pdf"},
+            Config=S3_TRANSFER_CONFIG,
+        )
 
         # Generate the file's public URL
-        return f"https://{AWS_S3_BUCKET}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
+        return get_file_url(s3_key)
     except Exception as e:
-        print(f"Error uploading to S3: {e}")
+        logger.error("Error uploading to S3: %s", e)
         raise
 
-# Fetches a file from the S3 bucket and returns it as an in-memory file.
-def fetch_file_from_s3(user_id: str) -> io.BytesIO:
+# Fetches a file from the S3 bucket as a streaming body, honouring conditional and range requests.
+# Returns {"notModified": True} when the client's copy is current and {"rangeNotSatisfiable": True} for bad ranges.
+@traced("s3.fetch_file_from_s3")
+def fetch_file_from_s3(user_id: str, if_none_match: Optional[str] = None,
+                       if_modified_since: Optional[datetime] = None, byte_range: Optional[str] = None) -> dict:
     try:
-        s3_key = f"resumes/{user_id}-resume.pdf"
+        params = {"Bucket": AWS_S3_BUCKET, "Key": get_resume_key(user_id)}
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        if if_modified_since:
+            params["IfModifiedSince"] = if_modified_since
+        if byte_range:
+            params["Range"] = byte_range
+
+        try:
+            s3_response = s3_client.get_object(**params)
+        except ClientError as e:
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+            if status == 304:
+                return {"notModified": True, "etag": headers.get("etag"), "lastModified": headers.get("last-modified")}
+            if status == 416:
+                return {"rangeNotSatisfiable": True, "contentRange": headers.get("content-range")}
+            raise
 
-        # Fetch file
-        s3_response = s3_client.get_object(Bucket=AWS_S3_BUCKET, Key=s3_key)
-        pdf_content = s3_response["Body"].read()
+        return {
+            "body": s3_response["Body"],
+            "etag": s3_response.get("ETag"),
+            "lastModified": s3_response.get("LastModified"),
+            "contentLength": s3_response.get("ContentLength"),
+            "contentRange": s3_response.get("ContentRange"),
+        }
+    except Exception as e:
+        logger.error("Error fetching file from S3: %s", e)
+        raise
 
-        # Convert bytes into a file-like object
-        return io.BytesIO(pdf_content)
+# Reads a whole file from the S3 bucket into memory, returning (bytes, ETag).
+@traced("s3.read_file_from_s3")
+def read_file_from_s3(user_id: str) -> tuple:
+    s3_object = fetch_file_from_s3(user_id)
+    try:
+        return s3_object["body"].read(), s3_object["etag"]
+    finally:
+        s3_object["body"].close()
+
+# Generates a short-lived presigned GET URL for the user's resume
+@traced("s3.generate_presigned_fetch_url")
+def generate_presigned_fetch_url(user_id: str, expires_in: Optional[int] = None) -> str:
+    try:
+        return s3_client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": AWS_S3_BUCKET,
+                "Key": get_resume_key(user_id),
+                "ResponseContentType": "application/pdf",
+                "ResponseContentDisposition": f'attachment; filename="{user_id}-resume.pdf"',
+            },
+            ExpiresIn=expires_in or S3_PRESIGNED_URL_EXPIRES_SECONDS,
+        )
+    except Exception as e:
+        logger.error("Error generating presigned fetch URL: %s", e)
+        raise
+
+# Generates a presigned POST that lets the client upload the resume directly to S3
+@traced("s3.generate_presigned_upload")
+def generate_presigned_upload(user_id: str, max_size_bytes: int, expires_in: Optional[int] = None) -> dict:
+    try:
+        return s3_client.generate_presigned_post(
+            Bucket=AWS_S3_BUCKET,
+            Key=get_resume_key(user_id),
+            Fields={"Content-Type": "application/pdf"},
+            Conditions=[
+                {"Content-Type": "application/pdf"},
+                ["content-length-range", 1, max_size_bytes],
+            ],
+            ExpiresIn=expires_in or S3_PRESIGNED_URL_EXPIRES_SECONDS,
+        )
     except Exception as e:
-        print(f"Error fetching file from S3: {e}")
+        logger.error("Error generating presigned upload: %s", e)
         raise
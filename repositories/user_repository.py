@@ -1,42 +1,147 @@
-from datetime import datetime
+import logging
+import os
+from datetime import datetime, timedelta
 from models.user_model import User
 from config.database import user_collections
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# An unfinished upload claim older than this is assumed dead (e.g. its Lambda timed out) and can be taken over
+RESUME_UPLOAD_CLAIM_LEASE_SECONDS = int(os.getenv("RESUME_UPLOAD_CLAIM_LEASE_SECONDS", "120"))
 
 # Retrieve a user by ID
+@traced("db.find_user_by_id")
 def find_user_by_id(user_id: str):
     try:
         return user_collections.find_one({"userId": user_id})
     except Exception as e:
-        print(f"Error finding user: {e}")
+        logger.error("Error finding user: %s", e)
         return None
     
+# Retrieve only the resume metadata of a user (avoids loading every application)
+@traced("db.find_user_resume_info")
+def find_user_resume_info(user_id: str):
+    try:
+        return user_collections.find_one(
+            {"userId": user_id},
+            {"resumeHash": 1, "resumeUrl": 1}
+        )
+    except Exception as e:
+        logger.error("Error finding user resume info: %s", e)
+        return None
+
+# Retrieve only the stored resume text of a user
+@traced("db.find_user_resume_text")
+def find_user_resume_text(user_id: str):
+    try:
+        user = user_collections.find_one({"userId": user_id}, {"resume": 1})
+        return user.get("resume") if user else None
+    except Exception as e:
+        logger.error("Error finding user resume text: %s", e)
+        return None
+
+# Check that a resume version (PDF content hash) belongs to the user
+@traced("db.user_has_resume_version")
+def user_has_resume_version(user_id: str, resume_hash: str) -> bool:
+    try:
+        return user_collections.count_documents(
+            {"userId": user_id, "$or": [{"resumeVersions": resume_hash}, {"resumeHash": resume_hash}]},
+            limit=1
+        ) > 0
+    except Exception as e:
+        logger.error("Error checking resume version: %s", e)
+        return False
+
 # Create a new user in the database
+@traced("db.create_user")
 def create_user(user_data: User):
     try:
         result = user_collections.insert_one(user_data.to_dict())
         return result.inserted_id
     except Exception as e:
-        print(f"Error creating user: {e}")
+        logger.error("Error creating user: %s", e)
         return None
 
-# Update the user's resume in the database
-def update_user_resume(user_id: str, resume_text: str) -> bool:
+# Update the user's resume (and optionally its S3 URL and PDF content hash) in the database
+@traced("db.update_user_resume")
+def update_user_resume(user_id: str, resume_text: str, resume_url: str = None, resume_hash: str = None) -> bool:
     try:
+        fields = {
+            "resume": resume_text,
+            "updatedAt": datetime.utcnow()
+        }
+        if resume_url:
+            fields["resumeUrl"] = resume_url
+        update = {"$set": fields}
+        if resume_hash:
+            fields["resumeHash"] = resume_hash
+            # Every uploaded version stays addressable by its hash
+            update["$addToSet"] = {"resumeVersions": resume_hash}
+
         result = user_collections.update_one(
             {"userId": user_id},
-            {
-                "$set": {
-                    "resume": resume_text,
-                    "updatedAt": datetime.utcnow()
-                }
-            }
+            update
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        logger.error("Error updating user resume: %s", e)
+        return False
+
+# Claim the processing of one uploaded resume object (its S3 key and ETag). Returns False when
+# that upload was already completed or is being processed, so the client callback and the S3 event
+# process it only once. A claim left unfinished past its lease can be taken over.
+@traced("db.claim_resume_upload")
+def claim_resume_upload(user_id: str, upload_id: str) -> bool:
+    now = datetime.utcnow()
+    try:
+        result = user_collections.update_one(
+            {"userId": user_id, "$or": [
+                {"resumeUploadId": {"$ne": upload_id}},
+                {
+                    "resumeUploadCompleted": {"$ne": True},
+                    "resumeUploadClaimedAt": {"$lt": now - timedelta(seconds=RESUME_UPLOAD_CLAIM_LEASE_SECONDS)},
+                },
+            ]},
+            {"$set": {"resumeUploadId": upload_id, "resumeUploadClaimedAt": now, "resumeUploadCompleted": False}}
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        logger.error("Error claiming resume upload: %s", e)
+        return False
+
+# Mark a claimed upload as stored so later notifications for it are ignored
+@traced("db.complete_resume_upload")
+def complete_resume_upload(user_id: str, upload_id: str) -> bool:
+    try:
+        result = user_collections.update_one(
+            {"userId": user_id, "resumeUploadId": upload_id},
+            {"$set": {"resumeUploadCompleted": True}}
+        )
+        return result.modified_count > 0
+    except Exception as e:
+        logger.error("Error completing resume upload: %s", e)
+        return False
+
+# Release a claim whose processing failed so the upload can be completed again. Without an
+# upload_id any claim is cleared (the resume was replaced another way).
+@traced("db.release_resume_upload")
+def release_resume_upload(user_id: str, upload_id: str = None) -> bool:
+    query = {"userId": user_id}
+    if upload_id is not None:
+        query["resumeUploadId"] = upload_id
+    try:
+        result = user_collections.update_one(
+            query,
+            {"$unset": {"resumeUploadId": "", "resumeUploadClaimedAt": "", "resumeUploadCompleted": ""}}
         )
         return result.modified_count > 0
     except Exception as e:
-        print(f"Error updating user resume: {e}")
+        logger.error("Error releasing resume upload: %s", e)
         return False
 
 # Save a user fetched from Auth0 to MongoDB
+@traced("db.save_user")
 def save_user(user_info: dict) -> bool:
     try:
         user_id = user_info.get("sub")
@@ -46,7 +151,7 @@ def save_user(user_info: dict) -> bool:
 
         # Check if the user already exists
         if find_user_by_id(user_id):
-            print("User already exists in the database.")
+            logger.info("User already exists in the database.", extra={"sample_rate": 0.1})
             return True  # Return early if user exists
 
         # Create new user object
@@ -64,5 +169,5 @@ def save_user(user_info: dict) -> bool:
         return result.acknowledged
 
     except Exception as e:
-        print(f"Error saving user to DB: {e}")
+        logger.error("Error saving user to DB: %s", e)
         return False
\ No newline at end of file
@@ -0,0 +1,70 @@
+import math
+import os
+from contextlib import contextmanager
+from utils.rate_limiter import FairShareScheduler, InMemoryCounterStore
+from utils.tracing import span
+
+# Priorities for the fair-share scheduler (lower runs first)
+PRIORITY_INTERACTIVE = 0  # single-artifact generation and regeneration
+PRIORITY_STANDARD = 1     # full /process-application
+PRIORITY_BULK = 2         # batch processing
+
+# Per-user budget, in LLM calls: a bucket of LLM_USER_BURST calls refilled at LLM_USER_CALLS_PER_MINUTE.
+# Requests are charged their full cost; one larger than the burst waits for a full bucket and leaves it in debt.
+LLM_USER_CALLS_PER_MINUTE = float(os.getenv("LLM_USER_CALLS_PER_MINUTE", "30"))
+LLM_USER_BURST = float(os.getenv("LLM_USER_BURST", "30"))
+# Concurrent LLM-backed requests per user
+LLM_USER_CONCURRENCY = int(os.getenv("LLM_USER_CONCURRENCY", "2"))
+# Concurrent LLM calls per instance, shared fairly between users
+LLM_GLOBAL_CONCURRENCY = int(os.getenv("LLM_GLOBAL_CONCURRENCY", "24"))
+# How long a request may queue for an LLM slot before it is turned away
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
+
+
+# "memory" keeps counters per instance, "mongo" shares them across instances
+def _create_counter_store():
+    if os.getenv("RATE_LIMIT_STORE", "memory") == "mongo":
+        from repositories.rate_limit_repository import MongoCounterStore
+        return MongoCounterStore()
+    return InMemoryCounterStore()
+
+
+counter_store = _create_counter_store()
+scheduler = FairShareScheduler(LLM_GLOBAL_CONCURRENCY)
+
+
+# Raised when a caller is over budget; retry_after is in seconds
+class AdmissionRejected(Exception):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+# Admit an LLM-backed request for a user. `cost` is the number of LLM calls it makes and
+# `weight` the number of concurrent calls it runs; raises AdmissionRejected when over budget.
+# Tokens are only spent by admitted requests: the concurrency slot is checked first, and a
+# request turned away while queueing gets its tokens back.
+@contextmanager
+def admit(user_id: str, priority: int = PRIORITY_STANDARD, cost: int = 1, weight: int = 1):
+    if not counter_store.acquire_slot(f"concurrency:{user_id}", LLM_USER_CONCURRENCY):
+        raise AdmissionRejected("Too many concurrent requests", ADMISSION_RETRY_AFTER_SECONDS)
+
+    try:
+        retry_after = counter_store.take_tokens(
+            f"rate:{user_id}", cost, LLM_USER_CALLS_PER_MINUTE / 60, LLM_USER_BURST
+        )
+        if retry_after > 0:
+            raise AdmissionRejected("Rate limit exceeded", retry_after)
+
+        with span("admission.queue"):
+            admitted = scheduler.acquire(priority, weight, timeout=ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        if not admitted:
+            counter_store.refund_tokens(f"rate:{user_id}", cost, LLM_USER_BURST)
+            raise AdmissionRejected("Server is busy", ADMISSION_RETRY_AFTER_SECONDS)
+        try:
+            yield
+        finally:
+            scheduler.release(weight)
+    finally:
+        counter_store.release_slot(f"concurrency:{user_id}")
@@ -0,0 +1,56 @@
+import os
+from typing import Dict, List
+from repositories.application_repository import get_application_fields_by_user
+from utils.application_index import ApplicationIndex
+from utils.tracing import span
+from utils.ttl_cache import TTLCache
+
+# Per-user application indexes; an evicted index is rebuilt from the database on the next ranking
+_application_indexes = TTLCache(
+    maxsize=int(os.getenv("RANK_INDEX_CACHE_SIZE", "256")),
+    ttl=int(os.getenv("RANK_INDEX_CACHE_TTL_SECONDS", "3600")),
+)
+
+RANKED_APPLICATION_FIELDS = ("id", "companyName", "position", "location", "status", "dateCreated")
+
+
+def _get_index(user_id: str) -> ApplicationIndex:
+    index = _application_indexes.get(user_id)
+    if index is None:
+        index = ApplicationIndex()
+        _application_indexes.set(user_id, index)
+    return index
+
+
+# Rank all of a user's saved applications by how well their job descriptions match a resume.
+# No LLM calls: the cached index is synced with the stored applications, then scored in one pass.
+def rank_applications(user_id: str, user_resume: str, limit: int = None) -> List[Dict]:
+    applications = get_application_fields_by_user(user_id, RANKED_APPLICATION_FIELDS + ("jobDescription",))
+    index = _get_index(user_id)
+    with span("rank.index"):
+        index.sync({application["id"]: application.get("jobDescription") for application in applications})
+    with span("rank.score"):
+        ranked = index.rank(user_resume)
+
+    by_id = {application["id"]: application for application in applications}
+    results = [
+        {**{field: by_id[application_id].get(field) for field in RANKED_APPLICATION_FIELDS}, "matchScore": score}
+        for application_id, score in ranked
+        if application_id in by_id
+    ]
+    return results[:limit] if limit else results
+
+
+# Keep a cached index current when applications are saved or their job description changes;
+# uncached users are indexed on demand
+def index_applications(user_id: str, applications: List[Dict]):
+    index = _application_indexes.get(user_id)
+    if index is not None:
+        index.remove([application["id"] for application in applications])
+        index.add({application["id"]: application.get("jobDescription") for application in applications})
+
+
+def unindex_application(user_id: str, application_id: str):
+    index = _application_indexes.get(user_id)
+    if index is not None:
+        index.remove([application_id])
@@ -1,82 +1,501 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from uuid import uuid4
+import logging
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional
 from models.application_model import Application
+from utils.match_scoring import score_match
+from utils.resume_sections import normalize_resume_text
+from utils.tracing import propagate, span
 from services.cover_letter_service import generate_cover_letter
 from services.resume_feedback_service import generate_resume_feedback
 from services.interview_questions_service import generate_interview_questions
+from services.application_ranking_service import index_applications, unindex_application
+from services.llm_client import llm_deadline
 from repositories.application_repository import (
     delete_application_by_id,
     save_application,
+    save_applications,
     get_application_by_id,
     get_applications_by_user,
     get_cover_letter_by_app_id,
     get_interview_questions_by_app_id,
-    update_application_status
+    update_application_status,
+    update_application_fields,
+    append_interview_questions,
+    save_missing_artifact,
 )
 
-# Process a job application
-def process_application(user_id: str, user_resume: str, job_description: str, question_type: str = "Technical", num_questions: int = 3) -> Dict:
-    try:
-        # Define tasks for concurrent execution
-        tasks = {
-            "resumeFeedback": (generate_resume_feedback, (user_resume, job_description)),
-            "coverLetter": (generate_cover_letter, (user_resume, job_description)),
-            "interviewQuestions": (generate_interview_questions, (user_resume, job_description, question_type, num_questions))
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_JOB_DESCRIPTIONS = int(os.getenv("BATCH_MAX_JOB_DESCRIPTIONS", "25"))
+# Upper bound on concurrent LLM calls for one batch request (three calls per job description)
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "9"))
+# Most interview questions generated in one call
+MAX_INTERVIEW_QUESTIONS = int(os.getenv("MAX_INTERVIEW_QUESTIONS", "10"))
+
+# Top-level application fields that can be selected with "fields="
+APPLICATION_FIELDS = {
+    "id", "companyName", "position", "location", "jobDescription", "sourceJobDescription", "resumeFeedback",
+    "coverLetter", "interviewQuestions", "status", "errors", "missingArtifacts", "dateCreated",
+}
+FIELD_SEGMENT_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+MAX_APPLICATION_FIELDS = 20
+
+# Status of an application whose artifacts are still being generated
+APPLICATION_PROCESSING = "Processing"
+# Status of an application returned with some artifacts missing after the deadline
+APPLICATION_PARTIAL = "Partial"
+
+# Time budget for generating an application's artifacts; stay below the API Gateway/Lambda timeout
+APPLICATION_DEADLINE_SECONDS = float(os.getenv("APPLICATION_DEADLINE_SECONDS", "25"))
+# A "Processing" application older than this is treated as abandoned by its request
+APPLICATION_PROCESSING_STALE_SECONDS = float(os.getenv("APPLICATION_PROCESSING_STALE_SECONDS", "120"))
+# LLM calls of an artifact that missed its deadline are cut off this much later; a result arriving
+# in between is still saved by the late-save callback
+ARTIFACT_CALL_GRACE_SECONDS = float(os.getenv("ARTIFACT_CALL_GRACE_SECONDS", "2"))
+# Per-artifact deadlines, "artifact=seconds,..." (each capped by APPLICATION_DEADLINE_SECONDS)
+ARTIFACT_DEADLINES = {
+    name.strip(): float(seconds)
+    for name, seconds in (item.split("=", 1) for item in os.getenv("ARTIFACT_DEADLINES", "").split(",") if "=" in item)
+}
+
+# Local resume/job description match, computed in milliseconds without the LLM
+def score_resume_match(user_resume: str, job_description: str) -> Dict:
+    with span("match.score"):
+        return score_match(user_resume, job_description)
+
+# Resume feedback with the local match score stored next to the LLM's resumeScore
+def _generate_scored_resume_feedback(user_resume: str, job_description: str) -> Dict:
+    feedback = generate_resume_feedback(user_resume, job_description)
+    if isinstance(feedback, dict) and "error" not in feedback:
+        match = score_resume_match(user_resume, job_description)
+        feedback = {
+            **feedback,
+            "localScore": match["score"],
+            "localMatch": {key: value for key, value in match.items() if key != "score"},
         }
+    return feedback
 
-        results = {}
-        errors = {}
+# Define the generation tasks for one resume/job description pair
+def _application_tasks(user_resume: str, job_description: str, question_type: str, num_questions: int) -> Dict:
+    return {
+        "resumeFeedback": (_generate_scored_resume_feedback, (user_resume, job_description)),
+        "coverLetter": (generate_cover_letter, (user_resume, job_description)),
+        "interviewQuestions": (generate_interview_questions, (user_resume, job_description, question_type, num_questions))
+    }
 
-        # Run tasks concurrently
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {executor.submit(func, *args): key for key, (func, args) in tasks.items()}
+# Collect a finished task's result, recording failures in errors
+def _collect_result(future, key: str, results: Dict, errors: Dict):
+    try:
+        results[key] = future.result()
+    except Exception as e:
+        errors[key] = str(e)
+        logger.error("Error in task '%s': %s", key, e)
+        results[key] = {"error": str(e)}
 
-            for future in as_completed(futures):
-                key = futures[future]
-                try:
-                    results[key] = future.result()
-                except Exception as e:
-                    errors[key] = str(e)
-                    print(f"Error in task '{key}': {e}")
-                    results[key] = {"error": str(e)}
-
-        # Build application object
-        application = {
-            "id": str(uuid4()),
-            "companyName": results.get("resumeFeedback", {}).get("companyName", "Not specified"),
-            "position": results.get("resumeFeedback", {}).get("position", "Not specified"),
-            "location": results.get("resumeFeedback", {}).get("location", "Not specified"),
-            "jobDescription": results.get("resumeFeedback", {}).get("jobDescription", "Not specified"),
-            "resumeFeedback": results.get("resumeFeedback", {}),
-            "coverLetter": results.get("coverLetter", {}),
-            "interviewQuestions": results.get("interviewQuestions", []),
-            "status": "Application Submitted" if not errors else "Partial Failure",
-            "errors": errors if errors else None,
-            "dateCreated": datetime.utcnow().isoformat()
+# Build the application document from the generation results
+def _build_application(job_description: str, results: Dict, errors: Dict) -> Dict:
+    feedback = results.get("resumeFeedback", {})
+    return Application(
+        companyName=feedback.get("companyName") or "Not specified",
+        position=feedback.get("position") or "Not specified",
+        location=feedback.get("location") or "Not specified",
+        jobDescription=feedback.get("jobDescription") or "Not specified",
+        sourceJobDescription=job_description,
+        resumeFeedback=feedback,
+        coverLetter=results.get("coverLetter", {}),
+        interviewQuestions=results.get("interviewQuestions", []),
+        status=_final_status(errors),
+        errors=errors if errors else None,
+    ).to_dict()
+
+def _final_status(errors: Dict) -> str:
+    return "Application Submitted" if not errors else "Partial Failure"
+
+# The job posting an application's artifacts are regenerated from: the posting as submitted, or the
+# summary for applications saved before postings were stored. None when neither is known.
+def _source_job_description(application: Dict) -> Optional[str]:
+    if application.get("sourceJobDescription"):
+        return application["sourceJobDescription"]
+    summary = application.get("jobDescription")
+    return summary if summary and summary != "Not specified" else None
+
+# Application fields written when one artifact finishes; the job details come with the feedback
+def _artifact_fields(key: str, result) -> Dict:
+    if key != "resumeFeedback":
+        return {key: result}
+    feedback = result if isinstance(result, dict) else {}
+    return {
+        "companyName": feedback.get("companyName") or "Not specified",
+        "position": feedback.get("position") or "Not specified",
+        "location": feedback.get("location") or "Not specified",
+        "jobDescription": feedback.get("jobDescription") or "Not specified",
+        "resumeFeedback": result,
+    }
+
+# Runs a task with its LLM calls timing out at deadline
+def _call_with_deadline(deadline: float, func, *args):
+    with llm_deadline(deadline):
+        return func(*args)
+
+# Runs generation tasks concurrently, calling save(key, result) as each one finishes. Tasks still
+# running at their deadline (ARTIFACT_DEADLINES, capped by deadline_seconds) are given up on: the
+# pool is shut down without waiting and their futures are returned as {key: future}. Their LLM
+# calls time out ARTIFACT_CALL_GRACE_SECONDS later, so the work stops; a result that arrives
+# within the grace period can still be saved.
+def _run_with_deadlines(tasks: Dict, deadline_seconds: float, save) -> tuple:
+    results = {}
+    errors = {}
+    missed = {}
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(tasks))
+    try:
+        task_deadlines = {
+            key: started + min(ARTIFACT_DEADLINES.get(key, deadline_seconds), deadline_seconds) for key in tasks
+        }
+        futures = {
+            executor.submit(propagate(_call_with_deadline), task_deadlines[key] + ARTIFACT_CALL_GRACE_SECONDS, func, *args): key
+            for key, (func, args) in tasks.items()
         }
+        deadlines = {future: task_deadlines[key] for future, key in futures.items()}
+
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            for future in [future for future in pending if deadlines[future] <= now]:
+                pending.discard(future)
+                missed[futures[future]] = future
+                logger.warning("Artifact '%s' missed its deadline", futures[future])
+            if not pending:
+                break
+
+            done, pending = wait(pending, timeout=min(deadlines[future] for future in pending) - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = futures[future]
+                _collect_result(future, key, results, errors)
+                save(key, results[key])
+    finally:
+        # Queued tasks are cancelled; running ones cannot be interrupted and finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, errors, missed
+
+# Whether a "Processing" application has outlived the request that created it (e.g. a timed-out Lambda)
+def _is_stale(application: Dict) -> bool:
+    try:
+        created = datetime.fromisoformat(application.get("dateCreated") or "")
+    except ValueError:
+        return True
+    return (datetime.utcnow() - created).total_seconds() > APPLICATION_PROCESSING_STALE_SECONDS
+
+# Saves a generated artifact of a partial application if it is still missing; failures stay missing
+def _save_missing_artifact(user_id: str, application_id: str, key: str, result, completed_status: str) -> bool:
+    if isinstance(result, dict) and "error" in result:
+        return False
+    fields = _artifact_fields(key, result)
+    if not save_missing_artifact(user_id, application_id, key, fields, completed_status):
+        return False
+    if "jobDescription" in fields:
+        index_applications(user_id, [{"id": application_id, **fields}])
+    return True
+
+# Saves a result that arrives after the deadline, if the artifact is still missing
+def _save_late_artifact(user_id: str, application_id: str, key: str, future, completed_status: str):
+    try:
+        result = future.result()
+    except CancelledError:
+        return
+    except Exception as e:
+        logger.error("Error in late task '%s': %s", key, e)
+        return
+    if _save_missing_artifact(user_id, application_id, key, result, completed_status):
+        logger.info("Saved late artifact '%s' for application %s", key, application_id)
+
+# Process a job application. The application is saved first with a "Processing" status and each
+# artifact is written as soon as it is generated, so clients can show results progressively and
+# finished work is kept if the request dies before the rest completes. Artifacts not ready by the
+# deadline are left to finish in the background and the application is returned as "Partial".
+def process_application(user_id: str, user_resume: str, job_description: str, question_type: str = "Technical", num_questions: int = 3) -> Dict:
+    try:
+        # Define tasks for concurrent execution
+        tasks = _application_tasks(user_resume, job_description, question_type, num_questions)
+
+        application = Application(
+            companyName="Not specified",
+            position="Not specified",
+            location="Not specified",
+            jobDescription="Not specified",
+            sourceJobDescription=job_description,
+            resumeFeedback={},
+            coverLetter={},
+            interviewQuestions=[],
+            status=APPLICATION_PROCESSING,
+            # Every artifact starts missing and leaves the list once saved, so if this process dies
+            # mid-generation POST .../complete knows what to regenerate
+            missingArtifacts=sorted(tasks),
+        ).to_dict()
 
         # Save application to database
         success = save_application_to_user(user_id, application)
         if not success:
             return {"error": "Failed to save application", "status": "Failure", "dateCreated": datetime.utcnow().isoformat()}
 
+        saved = set()
+
+        def save(key, result):
+            if _save_missing_artifact(user_id, application["id"], key, result, _final_status({})):
+                application.update(_artifact_fields(key, result))
+                saved.add(key)
+
+        # Run tasks concurrently, saving each result as it completes
+        results, errors, missed = _run_with_deadlines(tasks, APPLICATION_DEADLINE_SECONDS, save)
+
+        # Failed results are stored as before; only artifacts that missed the deadline stay missing
+        final_fields = {}
+        for key, result in results.items():
+            if key not in saved:
+                final_fields.update(_artifact_fields(key, result))
+        final_fields["status"] = APPLICATION_PARTIAL if missed else _final_status(errors)
+        final_fields["errors"] = errors if errors else None
+        final_fields["missingArtifacts"] = sorted(missed) if missed else None
+        application.update(final_fields)
+        if not update_application_fields(user_id, application["id"], final_fields):
+            return {"error": "Failed to save application", "status": "Failure", "dateCreated": application["dateCreated"]}
+        if "resumeFeedback" not in saved:
+            index_applications(user_id, [application])
+
+        # Missed calls time out shortly after the deadline; a result that still arrives in time is
+        # saved best-effort, and POST .../complete regenerates whatever stays missing
+        for key, future in missed.items():
+            future.add_done_callback(
+                lambda future, key=key: _save_late_artifact(user_id, application["id"], key, future, _final_status(errors))
+            )
+
         return application
 
     except Exception as e:
-        print(f"Error processing application: {e}")
+        logger.error("Error processing application: %s", e)
         return {"error": str(e), "status": "Failure", "dateCreated": datetime.utcnow().isoformat()}
 
 
+# Process one resume against many job descriptions: the resume is prepared once, every
+# generation call shares one bounded pool, and all applications are saved in a single write
+def process_applications_batch(user_id: str, user_resume: str, job_descriptions: List[str], question_type: str = "Technical", num_questions: int = 3) -> Dict:
+    try:
+        user_resume = normalize_resume_text(user_resume)
+        item_results = [{} for _ in job_descriptions]
+        item_errors = [{} for _ in job_descriptions]
+
+        with ThreadPoolExecutor(max_workers=min(BATCH_LLM_CONCURRENCY, 3 * len(job_descriptions) or 1)) as executor:
+            futures = {}
+            for index, job_description in enumerate(job_descriptions):
+                tasks = _application_tasks(user_resume, job_description, question_type, num_questions)
+                for key, (func, args) in tasks.items():
+                    futures[executor.submit(propagate(func), *args)] = (index, key)
+
+            for future in as_completed(futures):
+                index, key = futures[future]
+                _collect_result(future, key, item_results[index], item_errors[index])
+
+        applications = []
+        items = []
+        for index, (results, errors) in enumerate(zip(item_results, item_errors)):
+            # Services report failures as {"error": ...} results as well as exceptions
+            failed = [key for key, value in results.items() if isinstance(value, dict) and "error" in value]
+            for key in failed:
+                errors.setdefault(key, results[key]["error"])
+
+            if len(failed) == len(results):
+                items.append({"index": index, "status": "Failure", "errors": errors})
+                continue
+
+            application = _build_application(job_descriptions[index], results, errors)
+            applications.append(application)
+            items.append({
+                "index": index,
+                "status": application["status"],
+                "applicationId": application["id"],
+                "errors": application["errors"],
+            })
+
+        # Save every application with one write
+        if applications and not save_applications(user_id, applications):
+            return {"error": "Failed to save applications", "status": "Failure", "items": items}
+        index_applications(user_id, applications)
+
+        return {"items": items, "applications": applications}
+
+    except Exception as e:
+        logger.error("Error processing application batch: %s", e)
+        return {"error": str(e), "status": "Failure"}
+
+
+# Regenerate a single artifact of an existing application and update it in place; regenerated
+# resume feedback also refreshes the job details derived from it
+def regenerate_application_artifact(user_id: str, application_id: str, artifact: str, user_resume: str,
+                                    job_description: str = None, question_type: str = "Technical", num_questions: int = 3) -> Dict:
+    try:
+        application = get_application_by_id(user_id, application_id)
+        if not application:
+            return {"error": "Application not found", "notFound": True}
+
+        job_description = job_description or _source_job_description(application)
+        if not job_description:
+            return {"error": "jobDescription is required to regenerate this application", "badRequest": True}
+        func, args = _application_tasks(user_resume, job_description, question_type, num_questions)[artifact]
+        result = func(*args)
+        if isinstance(result, dict) and "error" in result:
+            return {"error": result["error"]}
+
+        fields = _artifact_fields(artifact, result)
+
+        # An artifact a partial application is missing is saved through the same path as a late result,
+        # so it leaves missingArtifacts and the application completes once nothing is missing
+        if artifact in (application.get("missingArtifacts") or []):
+            if _save_missing_artifact(user_id, application_id, artifact, result, _final_status(application.get("errors"))):
+                return {"id": application_id, **fields}
+
+        if not update_application_fields(user_id, application_id, fields):
+            return {"error": "Failed to update application"}
+        if "jobDescription" in fields:
+            index_applications(user_id, [{"id": application_id, **fields}])
+
+        return {"id": application_id, **fields}
+
+    except Exception as e:
+        logger.error("Error regenerating '%s': %s", artifact, e)
+        return {"error": str(e)}
+
+
+# Generate the artifacts a partial application is missing, under the same deadlines as process_application
+def complete_application(user_id: str, application_id: str, user_resume: str,
+                         job_description: str = None, question_type: str = "Technical", num_questions: int = 3) -> Dict:
+    try:
+        application = get_application_by_id(user_id, application_id)
+        if not application:
+            return {"error": "Application not found", "notFound": True}
+
+        missing = application.get("missingArtifacts") or []
+        if application.get("status") == APPLICATION_PROCESSING:
+            if not _is_stale(application):
+                return {"error": "Application is still being processed", "conflict": True}
+            # The request that created it died before finishing; applications created before
+            # missingArtifacts was set up front are missing whatever is still empty
+            missing = missing or [key for key in ("resumeFeedback", "coverLetter", "interviewQuestions") if not application.get(key)]
+            if not update_application_fields(user_id, application_id, {"status": APPLICATION_PARTIAL, "missingArtifacts": missing or None}):
+                return {"error": "Failed to update application"}
+        if not missing:
+            return {"id": application_id, "status": application.get("status"), "missingArtifacts": []}
+
+        job_description = job_description or _source_job_description(application)
+        if not job_description:
+            return {"error": "jobDescription is required to complete this application", "badRequest": True}
+
+        completed_status = _final_status(application.get("errors"))
+        tasks = {key: task for key, task in _application_tasks(user_resume, job_description, question_type, num_questions).items() if key in missing}
+        completed = {}
+
+        def save(key, result):
+            if _save_missing_artifact(user_id, application_id, key, result, completed_status):
+                completed[key] = result
+
+        results, _, missed = _run_with_deadlines(tasks, APPLICATION_DEADLINE_SECONDS, save)
+        for key, future in missed.items():
+            future.add_done_callback(
+                lambda future, key=key: _save_late_artifact(user_id, application_id, key, future, completed_status)
+            )
+
+        current = get_application_by_id(user_id, application_id, ["status", "missingArtifacts"]) or {}
+        failed = {key: result["error"] for key, result in results.items() if isinstance(result, dict) and "error" in result}
+        return {
+            "id": application_id,
+            "status": current.get("status"),
+            "missingArtifacts": current.get("missingArtifacts") or [],
+            **completed,
+            **({"errors": failed} if failed else {}),
+        }
+
+    except Exception as e:
+        logger.error("Error completing application: %s", e)
+        return {"error": str(e)}
+
+
+# Generate another page of interview questions for an application, excluding the ones already generated
+def generate_more_interview_questions(user_id: str, application_id: str, user_resume: str,
+                                      job_description: str = None, question_type: str = "Technical", num_questions: int = 3) -> Dict:
+    try:
+        application = get_application_by_id(user_id, application_id)
+        if not application:
+            return {"error": "Application not found", "notFound": True}
+
+        job_description = job_description or _source_job_description(application)
+        if not job_description:
+            return {"error": "jobDescription is required to generate more questions", "badRequest": True}
+
+        existing = application.get("interviewQuestions") or []
+        previous_questions = [item.get("question") for item in existing if isinstance(item, dict) and item.get("question")]
+
+        questions = generate_interview_questions(
+            user_resume,
+            job_description,
+            question_type,
+            num_questions,
+            previous_questions,
+        )
+        if isinstance(questions, dict) and "error" in questions:
+            return {"error": questions["error"]}
+
+        # Drop anything the model repeated despite the instructions
+        seen = {question.strip().lower() for question in previous_questions}
+        questions = [item for item in questions if item.get("question", "").strip().lower() not in seen]
+
+        if questions and not append_interview_questions(user_id, application_id, questions):
+            return {"error": "Failed to update application"}
+
+        return {
+            "id": application_id,
+            "interviewQuestions": questions,
+            "offset": len(existing),
+            "total": len(existing) + len(questions),
+        }
+
+    except Exception as e:
+        logger.error("Error generating more interview questions: %s", e)
+        return {"error": str(e)}
+
+
 # Retrieve all applications for a user
 def get_user_applications(user_id: str):
     return get_applications_by_user(user_id)
 
 
-# Retrieve details of a specific application
-def get_application_details(user_id: str, application_id: str):
-    return get_application_by_id(user_id, application_id)
+# Retrieve details of a specific application, optionally only some fields
+def get_application_details(user_id: str, application_id: str, fields: List[str] = None):
+    return get_application_by_id(user_id, application_id, fields)
+
+
+# Parse a "fields=" query value into projection paths; raises ValueError for unknown or malformed fields
+def parse_application_fields(fields_param: str) -> List[str]:
+    requested = []
+    for field in (part.strip() for part in fields_param.split(",")):
+        if not field:
+            continue
+        segments = field.split(".")
+        if segments[0] not in APPLICATION_FIELDS or not all(FIELD_SEGMENT_PATTERN.match(segment) for segment in segments):
+            raise ValueError(f"Unknown field '{field}'")
+        requested.append(field)
+
+    if len(requested) > MAX_APPLICATION_FIELDS:
+        raise ValueError(f"At most {MAX_APPLICATION_FIELDS} fields may be requested")
+
+    # Mongo rejects a projection with both a path and one of its parents; keep the parent
+    return sorted({
+        field for field in requested
+        if not any(field.startswith(f"{other}.") for other in requested)
+    })
 
 
 # Retrieve the cover letter for a given application
@@ -92,7 +511,10 @@ def save_application_to_user(user_id: str, application_data: Application) -> boo
     return save_application(user_id, application_data)
 
 def delete_application_by_app_id(user_id: str, application_id: str):
-    return delete_application_by_id(user_id, application_id)
+    deleted = delete_application_by_id(user_id, application_id)
+    if deleted:
+        unindex_application(user_id, application_id)
+    return deleted
 
 def update_application_status_by_app_id(user_id, application_id, new_status):
     return update_application_status(user_id, application_id, new_status)
\ No newline at end of file
@@ -1,8 +1,11 @@
+import logging
 import os
 import requests
 from services.user_service import register_user, get_user
 from models.user_model import User  
 
+logger = logging.getLogger(__name__)
+
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
 
 def verify_auth0_token(access_token):
@@ -16,7 +19,7 @@ def verify_auth0_token(access_token):
 
         return response.json()
     except Exception as e:
-        print(f"Error verifying Auth0 token: {e}")
+        logger.error("Error verifying Auth0 token: %s", e)
         return None
 
 def validate_and_create_user(access_token):
@@ -0,0 +1,96 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from functools import wraps
+from typing import Callable
+from utils.single_flight import SingleFlight
+from repositories.generation_lease_repository import (
+    acquire_generation_lease,
+    complete_generation_lease,
+    find_generation_lease,
+    release_generation_lease,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cross-instance coalescing through a Mongo lease (in-process coalescing is always on)
+COALESCE_MONGO_ENABLED = os.getenv("COALESCE_MONGO", "false").lower() == "true"
+COALESCE_LEASE_SECONDS = int(os.getenv("COALESCE_LEASE_SECONDS", "120"))
+COALESCE_WAIT_SECONDS = float(os.getenv("COALESCE_WAIT_SECONDS", "90"))
+# How long a finished result is served to identical requests arriving just after it completed
+COALESCE_RESULT_TTL_SECONDS = int(os.getenv("COALESCE_RESULT_TTL_SECONDS", "5"))
+COALESCE_POLL_SECONDS = 0.25
+
+_flights = SingleFlight()
+
+
+# Key identifying identical generation inputs
+def coalescing_key(name: str, args: tuple, kwargs: dict) -> str:
+    payload = json.dumps([name, args, kwargs], sort_keys=True, default=str)
+    return f"{name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+# Results reported as {"error": ...} are not shared across instances
+def _is_error(result) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+# Wait for another instance holding the lease; None if it failed or took too long
+def _wait_for_lease(key: str):
+    deadline = time.monotonic() + COALESCE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(COALESCE_POLL_SECONDS)
+        lease = find_generation_lease(key)
+        if not lease:
+            return None
+        if lease.get("status") == "completed":
+            return lease
+    return None
+
+
+# Run func once across instances for this key using the Mongo lease
+def _run_with_lease(key: str, func: Callable, args: tuple, kwargs: dict):
+    if not COALESCE_MONGO_ENABLED:
+        return func(*args, **kwargs)
+
+    try:
+        acquired, lease = acquire_generation_lease(key, COALESCE_LEASE_SECONDS)
+    except Exception as e:
+        logger.warning("Error acquiring generation lease, running uncoalesced: %s", e)
+        return func(*args, **kwargs)
+
+    if not acquired:
+        if lease and lease.get("status") != "completed":
+            lease = _wait_for_lease(key)
+        if lease and lease.get("status") == "completed":
+            return lease["result"]
+        # The owner failed or is too slow; do the work here
+        return func(*args, **kwargs)
+
+    try:
+        result = func(*args, **kwargs)
+    except Exception:
+        release_generation_lease(key)
+        raise
+
+    if _is_error(result):
+        release_generation_lease(key)
+    else:
+        complete_generation_lease(key, result, COALESCE_RESULT_TTL_SECONDS)
+    return result
+
+
+# Decorator: identical concurrent calls of a generate_* function share one execution
+def coalesced(name: str):
+    def decorator(func: Callable):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = coalescing_key(name, args, kwargs)
+            result, shared = _flights.do(key, _run_with_lease, key, func, args, kwargs)
+            # Callers may modify their result; followers get their own copy
+            return copy.deepcopy(result) if shared else result
+        return wrapper
+    return decorator
@@ -1,15 +1,16 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
-import json
+import logging
+import msgspec
+from models.application_model import CoverLetter
+from services.coalescing_service import coalesced
+from services.llm_client import complete_json
+from services.job_description_service import job_description_context
+from utils.tracing import traced
 
-# Load environment variables
-load_dotenv()
-
-# Initialize OpenAI Client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
 
 
+@traced("llm.coverLetter")
+@coalesced("coverLetter")
 def generate_cover_letter(user_resume: str, job_description: str) -> dict:
     try:
         # Construct the prompt
@@ -34,7 +35,7 @@ def generate_cover_letter(user_resume: str, job_description: str) -> dict:
         {user_resume}
 
         ### **Job Description:**
-        {job_description}
+        {job_description_context(job_description)}
 
         ### **Return your response in JSON format:**
         {{
@@ -45,28 +46,28 @@ def generate_cover_letter(user_resume: str, job_description: str) -> dict:
 
         """
 
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        response_content = complete_json(
+            "coverLetter",
+            [
                 {"role": "system", "content": "You are an expert cover letter writer. Return your response in strict JSON format."},
                 {"role": "user", "content": cover_letter_prompt}
             ],
-            max_tokens=750,
-            temperature=0.5,
-            response_format={"type": "json_object"}  # Structured JSON output
+            temperature=0.5
         )
 
-        # Extract and parse the response content
-        response_content = completion.choices[0].message.content.strip()
+        # Decode and validate in one pass against the expected schema
+        parsed_response = msgspec.json.decode(response_content, type=CoverLetter)
 
-        parsed_response = json.loads(response_content)
+        return msgspec.to_builtins(parsed_response)
 
-        return parsed_response
+    except msgspec.ValidationError as validation_error:
+        logger.warning("JSON Validation Error: %s", validation_error)
+        return {"error": f"OpenAI JSON response did not match the expected format: {validation_error}"}
 
-    except json.JSONDecodeError as json_error:
-        print(f"JSON Parsing Error: {json_error}")
+    except msgspec.DecodeError as json_error:
+        logger.warning("JSON Parsing Error: %s", json_error)
         return {"error": "Failed to parse OpenAI JSON response."}
 
     except Exception as e:
-        print(f"Error generating cover letter: {e}")
+        logger.error("Error generating cover letter: %s", e)
         return {"error": str(e)}
\ No newline at end of file
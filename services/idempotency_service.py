@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, Tuple
+from repositories.idempotency_repository import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    find_idempotency_key,
+    release_idempotency_key,
+)
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")) * 3600
+# How long a request may hold a key before another instance may take it over
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "300"))
+# How long a concurrent duplicate waits for the first request to finish
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "60"))
+IDEMPOTENCY_POLL_SECONDS = 0.25
+
+
+# Fingerprint of the request body, used to reject a key reused for a different request
+def _request_hash(request_payload: Dict) -> str:
+    return hashlib.sha256(json.dumps(request_payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# Wait for another request holding the same key to finish
+def _wait_for_completion(key_id: str) -> Dict:
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(IDEMPOTENCY_POLL_SECONDS)
+        record = find_idempotency_key(key_id)
+        if not record or record.get("status") == "completed":
+            return record
+    return None
+
+
+# Run handler at most once per (user, Idempotency-Key). The handler returns (body, status_code);
+# returns (body, status_code, replayed) where replayed is True when a stored result was returned.
+def run_idempotent(user_id: str, idempotency_key: str, request_payload: Dict,
+                   handler: Callable[[], Tuple[Dict, int]]) -> Tuple[Dict, int, bool]:
+    if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return {"error": f"Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters"}, 400, False
+
+    key_id = f"{user_id}:{idempotency_key}"
+    request_hash = _request_hash(request_payload)
+
+    claimed, record = claim_idempotency_key(key_id, request_hash, IDEMPOTENCY_LEASE_SECONDS, IDEMPOTENCY_TTL_SECONDS)
+    if not claimed:
+        if record and record.get("requestHash") != request_hash:
+            return {"error": "Idempotency-Key was already used for a different request"}, 422, False
+
+        if record and record.get("status") != "completed":
+            record = _wait_for_completion(key_id)
+            if record is None:
+                return {"error": "A request with this Idempotency-Key is still in progress"}, 409, False
+
+        if record and record.get("status") == "completed":
+            return record["responseBody"], record["statusCode"], True
+
+        # The first request failed and released the key; run it here instead
+        return run_idempotent(user_id, idempotency_key, request_payload, handler)
+
+    try:
+        body, status_code = handler()
+    except Exception:
+        release_idempotency_key(key_id)
+        raise
+
+    # Server errors are not stored so the client's retry gets a fresh attempt
+    if status_code >= 500:
+        release_idempotency_key(key_id)
+    else:
+        complete_idempotency_key(key_id, body, status_code, IDEMPOTENCY_TTL_SECONDS)
+    return body, status_code, False
@@ -1,17 +1,29 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
-import json
+import logging
+import msgspec
+from models.application_model import InterviewQuestionsResponse
+from typing import List
+from services.coalescing_service import coalesced
+from services.llm_client import complete_json
+from services.job_description_service import job_description_context
+from utils.tracing import traced
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Initialize OpenAI Client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-
-def generate_interview_questions(user_resume: str, job_description: str, question_type: str = "Technical", num_questions: int = 3) -> dict:
+@traced("llm.interviewQuestions")
+@coalesced("interviewQuestions")
+def generate_interview_questions(user_resume: str, job_description: str, question_type: str = "Technical", num_questions: int = 3,
+                                 previous_questions: List[str] = None) -> dict:
     try:
+        # Questions already generated for this application must not be repeated
+        previous_questions_prompt = ""
+        if previous_questions:
+            previous_questions_list = "\n".join(f"- {question}" for question in previous_questions)
+            previous_questions_prompt = f"""
+        **Already asked (do not repeat or rephrase these)**:
+        {previous_questions_list}
+        """
+
         # Construct the prompt
         interview_prompt = f"""
         You are an expert in interview preparation. Given the job description and the user's resume, generate {num_questions} {question_type} interview questions that could be asked for this position. 
@@ -35,33 +47,34 @@ def generate_interview_questions(user_resume: str, job_description: str, questio
         {user_resume}
 
         **Job Description**:
-        {job_description}
-
+        {job_description_context(job_description)}
+        {previous_questions_prompt}
         Only return valid JSON. Do not include extra text, explanations, or commentary.
         """
 
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        response_content = complete_json(
+            "interviewQuestions",
+            [
                 {"role": "system", "content": "You are an expert interview question generator. Return your response in strict JSON format."},
                 {"role": "user", "content": interview_prompt}
             ],
-            max_tokens=1250,
             temperature=0.5,
-            response_format={"type": "json_object"}  # Structured JSON output
+            num_questions=num_questions
         )
 
-        # Extract and parse the response content
-        response_content = completion.choices[0].message.content.strip()
+        # Decode and validate in one pass against the expected schema
+        parsed_response = msgspec.json.decode(response_content, type=InterviewQuestionsResponse)
 
-        parsed_response = json.loads(response_content)
+        return msgspec.to_builtins(parsed_response.interviewQuestions)
 
-        return parsed_response.get("interviewQuestions", [])
+    except msgspec.ValidationError as validation_error:
+        logger.warning("JSON Validation Error: %s", validation_error)
+        return {"error": f"OpenAI JSON response did not match the expected format: {validation_error}"}
 
-    except json.JSONDecodeError as json_error:
-        print(f"JSON Parsing Error: {json_error}")
+    except msgspec.DecodeError as json_error:
+        logger.warning("JSON Parsing Error: %s", json_error)
         return {"error": "Failed to parse OpenAI JSON response."}
 
     except Exception as e:
-        print(f"Error generating interview questions: {e}")
+        logger.error("Error generating interview questions: %s", e)
         return {"error": str(e)}
\ No newline at end of file
@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+import msgspec
+from models.application_model import JobDescriptionAnalysis
+from utils.minhash import estimate_similarity, lsh_bands, minhash_signature, shingles, tokenize
+from utils.ttl_cache import TTLCache
+from repositories.job_description_repository import (
+    find_job_analysis,
+    find_job_analysis_candidates,
+    save_job_analysis,
+    touch_job_analysis,
+)
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Bump when the prompt that produces analyses changes so older analyses are not reused
+JOB_ANALYZER_VERSION = 3
+JD_SHINGLE_SIZE = int(os.getenv("JD_SHINGLE_SIZE", "5"))
+JD_MINHASH_PERMUTATIONS = int(os.getenv("JD_MINHASH_PERMUTATIONS", "64"))
+JD_LSH_BANDS = int(os.getenv("JD_LSH_BANDS", "16"))
+# Estimated Jaccard similarity above which two postings share one analysis, provided their
+# position, location and figures (salary, years of experience) also agree
+JD_SIMILARITY_THRESHOLD = float(os.getenv("JD_SIMILARITY_THRESHOLD", "0.95"))
+# Less similar postings only pass their summary to the new analysis as a wording hint
+JD_HINT_SIMILARITY_THRESHOLD = float(os.getenv("JD_HINT_SIMILARITY_THRESHOLD", "0.8"))
+JD_ANALYSIS_TTL_SECONDS = int(os.getenv("JD_ANALYSIS_TTL_DAYS", "30")) * 86400
+# Resume-specific prompts get the stored summary instead of the raw posting
+JD_SUMMARY_IN_PROMPTS = os.getenv("JD_SUMMARY_IN_PROMPTS", "true").lower() == "true"
+
+# Tracking links, e-mail addresses and reference codes that differ between copies of one posting
+TRACKING_TEXT_PATTERN = re.compile(r"https?://\S+|www\.\S+|\S+@\S+\.\S+|\b(?:ref|req|job)\s*(?:id|#|no\.?)?\s*[:#]?\s*[\w-]*\d[\w-]*", re.IGNORECASE)
+
+# Analyses by fingerprint; near-duplicate hits are cached under the new fingerprint too
+_analysis_cache = TTLCache(maxsize=1024, ttl=int(os.getenv("JD_ANALYSIS_CACHE_TTL_SECONDS", "3600")))
+
+
+# Word tokens of a posting with tracking text removed; equal tokens mean the same posting
+def normalize_job_description(job_description: str) -> list:
+    return tokenize(TRACKING_TEXT_PATTERN.sub(" ", job_description))
+
+
+def job_description_fingerprint(tokens: list) -> str:
+    return hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+
+
+# Tokens with digits (salary, years of experience, postcodes); a near-duplicate must quote the same ones
+def job_description_figures(tokens: list) -> list:
+    return sorted({token for token in tokens if any(char.isdigit() for char in token)})
+
+
+# Whether a near-duplicate's analysis fits this posting: its position and location appear here
+# and both postings quote the same figures
+def _key_facts_agree(tokens: list, figures: list, candidate: Dict) -> bool:
+    if candidate.get("figures") != figures:
+        return False
+    present = set(tokens)
+    analysis = candidate.get("analysis") or {}
+    for field in ("position", "location"):
+        value = analysis.get(field)
+        if value and value != "Not specified" and not set(tokenize(value)) <= present:
+            return False
+    return True
+
+
+# Looks up the stored analysis of a posting, or of a near-duplicate whose key facts agree, without
+# calling the LLM. Returns (analysis, summary_hint): analysis is None on a miss, and summary_hint is
+# the summary of a similar posting whose analysis could not be reused.
+def lookup_job_description_analysis(job_description: str) -> Tuple[Optional[Dict], Optional[str]]:
+    tokens = normalize_job_description(job_description)
+    fingerprint = job_description_fingerprint(tokens)
+
+    analysis = _analysis_cache.get(fingerprint)
+    if analysis is not None:
+        return analysis, None
+
+    # Exact match on the normalised text
+    document = find_job_analysis(fingerprint, JOB_ANALYZER_VERSION)
+    if document:
+        _analysis_cache.set(fingerprint, document["analysis"])
+        return document["analysis"], None
+
+    # Near-duplicate match: candidates share an LSH band, then the signatures are compared
+    signature = minhash_signature(shingles(tokens, JD_SHINGLE_SIZE), JD_MINHASH_PERMUTATIONS)
+    figures = job_description_figures(tokens)
+    best, best_similarity = None, 0.0
+    for candidate in find_job_analysis_candidates(lsh_bands(signature, JD_LSH_BANDS), JOB_ANALYZER_VERSION):
+        similarity = estimate_similarity(signature, candidate.get("signature", []))
+        if similarity > best_similarity:
+            best, best_similarity = candidate, similarity
+    if best is not None and best_similarity >= JD_SIMILARITY_THRESHOLD and _key_facts_agree(tokens, figures, best):
+        touch_job_analysis(best["_id"])
+        _analysis_cache.set(fingerprint, best["analysis"])
+        return best["analysis"], None
+
+    if best is not None and best_similarity >= JD_HINT_SIMILARITY_THRESHOLD:
+        return None, best["analysis"].get("jobDescription")
+    return None, None
+
+
+# Stores the posting facts (company, position, location, summary) extracted by the resume feedback
+# call, so later requests for this posting or a near-duplicate reuse them without another LLM call
+def save_job_description_analysis(job_description: str, fields: Dict) -> Dict:
+    analysis = msgspec.to_builtins(JobDescriptionAnalysis(**{
+        field: fields.get(field) or "Not specified" for field in JobDescriptionAnalysis.__struct_fields__
+    }))
+    tokens = normalize_job_description(job_description)
+    fingerprint = job_description_fingerprint(tokens)
+    signature = minhash_signature(shingles(tokens, JD_SHINGLE_SIZE), JD_MINHASH_PERMUTATIONS)
+    save_job_analysis(fingerprint, {
+        "analyzerVersion": JOB_ANALYZER_VERSION,
+        "analysis": analysis,
+        "signature": signature,
+        "bands": lsh_bands(signature, JD_LSH_BANDS),
+        "figures": job_description_figures(tokens),
+    }, JD_ANALYSIS_TTL_SECONDS)
+    _analysis_cache.set(fingerprint, analysis)
+    return analysis
+
+
+# Prompt text for a job posting: the stored summary when one exists, otherwise the raw posting.
+# Never calls the LLM, so artifacts generated alongside the first feedback for a posting do not wait.
+def job_description_context(job_description: str, analysis: Optional[Dict] = None) -> str:
+    if not JD_SUMMARY_IN_PROMPTS:
+        return job_description
+    analysis = analysis or lookup_job_description_analysis(job_description)[0]
+    if not analysis:
+        return job_description
+    return (
+        f"Company: {analysis.get('companyName') or 'Not specified'}\n"
+        f"Position: {analysis.get('position') or 'Not specified'}\n"
+        f"Location: {analysis.get('location') or 'Not specified'}\n"
+        f"Summary: {analysis.get('jobDescription') or 'Not specified'}"
+    )
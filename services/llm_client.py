@@ -0,0 +1,136 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from openai import OpenAI
+from dotenv import load_dotenv
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Initialize OpenAI Client
+client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Model tiers. Every call uses the standard model unless LLM_LARGE_INPUT_TOKENS is set: then prompts
+# estimated above that many tokens are sent to the large model instead. This is opt-in because the
+# large model costs many times more per token and the standard model's context fits any prompt here.
+LLM_MODEL_TIERS = {
+    "standard": os.getenv("LLM_MODEL_STANDARD", "gpt-4o-mini"),
+    "large": os.getenv("LLM_MODEL_LARGE", "gpt-4o"),
+}
+LLM_LARGE_INPUT_TOKENS = int(os.getenv("LLM_LARGE_INPUT_TOKENS", "0"))
+# Recent calls per artifact used to measure how often outputs hit max_tokens
+LLM_TRUNCATION_WINDOW = int(os.getenv("LLM_TRUNCATION_WINDOW", "100"))
+# Above this truncation rate an artifact's output budget is scaled by LLM_TRUNCATION_HEADROOM
+LLM_TRUNCATION_RATE_THRESHOLD = float(os.getenv("LLM_TRUNCATION_RATE_THRESHOLD", "0.05"))
+LLM_TRUNCATION_HEADROOM = float(os.getenv("LLM_TRUNCATION_HEADROOM", "1.5"))
+
+# Output budget (max_tokens) per artifact: base + perQuestion * questions + perInputToken * prompt tokens,
+# capped at max. Bases are sized to typical outputs (about 400 tokens of feedback JSON, 450 for a cover
+# letter, 200 per interview question with its answer) rather than the worst case; the "LLM call" log
+# records completionTokens to tune them. A truncated response is retried once at the cap, and an
+# artifact that is often truncated gets LLM_TRUNCATION_HEADROOM more.
+ARTIFACT_BUDGETS = {
+    "resumeFeedback": {"base": 450, "perInputToken": 0.05, "max": 1500},
+    "coverLetter": {"base": 500, "perInputToken": 0.02, "max": 1000},
+    "interviewQuestions": {"base": 100, "perQuestion": 250, "max": 4000},
+}
+
+_truncations = {}
+_truncations_lock = threading.Lock()
+# time.monotonic() by which calls in the current context must finish (None: no deadline)
+_call_deadline = contextvars.ContextVar("llm_call_deadline", default=None)
+
+
+# Calls made inside the block time out at `deadline` (a time.monotonic() value): each request is
+# sent with the time left as its timeout and no client retries, so a hung call really stops
+@contextmanager
+def llm_deadline(deadline: float):
+    token = _call_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _call_deadline.reset(token)
+
+
+def _request_client():
+    deadline = _call_deadline.get()
+    if deadline is None:
+        return client
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("LLM call deadline exceeded")
+    return client.with_options(timeout=remaining, max_retries=0)
+
+
+# Rough token count (about four characters per token for English text)
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _record_truncation(artifact: str, truncated: bool):
+    with _truncations_lock:
+        _truncations.setdefault(artifact, deque(maxlen=LLM_TRUNCATION_WINDOW)).append(truncated)
+
+
+# Share of the artifact's recent calls that ended at max_tokens
+def truncation_rate(artifact: str) -> float:
+    with _truncations_lock:
+        recent = _truncations.get(artifact)
+        return sum(recent) / len(recent) if recent else 0.0
+
+
+# Picks (tier, model, max_tokens) for one call
+def route(artifact: str, input_tokens: int, num_questions: int = 0) -> tuple:
+    budget = ARTIFACT_BUDGETS[artifact]
+    max_tokens = budget["base"] + budget.get("perQuestion", 0) * num_questions + budget.get("perInputToken", 0) * input_tokens
+    if truncation_rate(artifact) > LLM_TRUNCATION_RATE_THRESHOLD:
+        max_tokens *= LLM_TRUNCATION_HEADROOM
+    max_tokens = int(min(max_tokens, budget["max"]))
+
+    tier = "large" if LLM_LARGE_INPUT_TOKENS and input_tokens > LLM_LARGE_INPUT_TOKENS else "standard"
+    return tier, LLM_MODEL_TIERS[tier], max_tokens
+
+
+# Runs a JSON-mode chat completion for an artifact and returns the response content
+def complete_json(artifact: str, messages: list, temperature: float, num_questions: int = 0) -> str:
+    input_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+    tier, model, max_tokens = route(artifact, input_tokens, num_questions)
+    cap = ARTIFACT_BUDGETS[artifact]["max"]
+
+    while True:
+        with span(f"llm.tier.{tier}"):
+            completion = _request_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format={"type": "json_object"}  # Structured JSON output
+            )
+        choice = completion.choices[0]
+        truncated = choice.finish_reason == "length"
+        _record_truncation(artifact, truncated)
+
+        usage = completion.usage
+        logger.info("LLM call", extra={
+            "type": "llmCall",
+            "artifact": artifact,
+            "tier": tier,
+            "model": model,
+            "maxTokens": max_tokens,
+            "estimatedInputTokens": input_tokens,
+            "promptTokens": usage.prompt_tokens if usage else None,
+            "completionTokens": usage.completion_tokens if usage else None,
+            "finishReason": choice.finish_reason,
+        })
+
+        # A truncated JSON response cannot be parsed; retry once with the full budget
+        if not truncated or max_tokens >= cap:
+            return (choice.message.content or "").strip()
+        max_tokens = cap
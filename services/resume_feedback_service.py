@@ -1,19 +1,61 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
-import json
+import logging
+import msgspec
+from models.application_model import ResumeFeedback
+from services.coalescing_service import coalesced
+from services.llm_client import complete_json
+from services.job_description_service import (
+    JD_SUMMARY_IN_PROMPTS,
+    job_description_context,
+    lookup_job_description_analysis,
+    save_job_description_analysis,
+)
+from utils.tracing import traced
 
-# Load environment variables
-load_dotenv()
-
-# Initialize OpenAI Client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
 
 
+@traced("llm.resumeFeedback")
+@coalesced("resumeFeedback")
 def generate_resume_feedback(user_resume: str, job_description: str) -> dict:
     try:
-        # Construct the prompt
-        resume_feedback_prompt = f"""
+        # The posting's facts come from the stored job description analysis when it is available,
+        # so this prompt only has to produce the resume-specific fields. Otherwise this call extracts
+        # them and they are stored for the next request with this posting.
+        analysis, summary_hint = lookup_job_description_analysis(job_description) if JD_SUMMARY_IN_PROMPTS else (None, None)
+        if analysis:
+            resume_feedback_prompt = f"""
+        You are an expert in resume analysis and job matching. Given the following resume and job description summary, provide an in-depth evaluation of how the resume can be refined to better match the job.
+
+        Your analysis should include:
+        - Specific sections of the resume that align well with the job description.
+        - Missing skills, experiences, or qualifications that are crucial.
+        - Irrelevant sections that should be removed.
+        - Suggestions for enhancing particular projects or experiences.
+
+        Return your response strictly in JSON format with the following structure:
+        {{
+          "resumeFeedback": "Detailed and actionable feedback",
+          "resumeScore": Score from 0-100%
+        }}
+
+        **Resume**:
+        {user_resume}
+
+        **Job Description**:
+        {job_description_context(job_description, analysis)}
+        """
+        else:
+            # A similar posting's summary helps with wording; the facts must come from this posting
+            hint = f"""
+        A similar posting was summarised as follows. Reuse its wording where it still applies, but take
+        every fact (company, position, location, salary, requirements) from the job description below.
+
+        **Similar Posting Summary**:
+        {summary_hint}
+        """ if summary_hint else ""
+
+            # Construct the prompt
+            resume_feedback_prompt = f"""
         You are an expert in resume analysis and job matching. Given the following resume and job description, provide an in-depth evaluation of how the resume can be refined to better match the job description.
 
         Your analysis should include:
@@ -39,36 +81,48 @@ def generate_resume_feedback(user_resume: str, job_description: str) -> dict:
           "resumeFeedback": "Detailed and actionable feedback"
           "resumeScore": Score from 0-100%
         }}
-
+        {hint}
         **Resume**:
         {user_resume}
 
         **Job Description**:
         {job_description}
-        """
+            """
 
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        response_content = complete_json(
+            "resumeFeedback",
+            [
                 {"role": "system", "content": "You are a resume analysis assistant. Return your response in strict JSON format."},
                 {"role": "user", "content": resume_feedback_prompt}
             ],
-            max_tokens=750,
-            temperature=0.5,
-            response_format={"type": "json_object"}
+            temperature=0.5
         )
 
-        # Parse the response
-        response_content = completion.choices[0].message.content.strip()
+        # Decode and validate in one pass against the expected schema
+        parsed_response = msgspec.json.decode(response_content, type=ResumeFeedback)
 
-        parsed_response = json.loads(response_content)
+        if analysis:
+            return {
+                "companyName": analysis.get("companyName"),
+                "position": analysis.get("position"),
+                "location": analysis.get("location"),
+                "jobDescription": analysis.get("jobDescription"),
+                "resumeFeedback": parsed_response.resumeFeedback,
+                "resumeScore": parsed_response.resumeScore,
+            }
+        feedback = msgspec.to_builtins(parsed_response)
+        if JD_SUMMARY_IN_PROMPTS:
+            save_job_description_analysis(job_description, feedback)
+        return feedback
 
-        return parsed_response
+    except msgspec.ValidationError as validation_error:
+        logger.warning("JSON Validation Error: %s", validation_error)
+        return {"error": f"OpenAI JSON response did not match the expected format: {validation_error}"}
 
-    except json.JSONDecodeError as json_error:
-        print(f"JSON Parsing Error: {json_error}")
+    except msgspec.DecodeError as json_error:
+        logger.warning("JSON Parsing Error: %s", json_error)
         return {"error": "Failed to parse OpenAI JSON response."}
 
     except Exception as e:
-        print(f"Error generating resume feedback: {e}")
+        logger.error("Error generating resume feedback: %s", e)
         return {"error": str(e)}
\ No newline at end of file
@@ -0,0 +1,68 @@
+import hashlib
+from typing import Dict, Iterable, Optional, Tuple
+from utils.pdf_extraction import extract_pdf_pages
+from utils.resume_sections import SECTIONS, detect_sections, normalize_resume_text
+from repositories.resume_parse_repository import find_resume_parse, save_resume_parse
+
+# Bump when the parsing/sectioning logic changes so stale artifacts are re-parsed
+RESUME_PARSER_VERSION = 2
+
+
+# SHA-256 of the raw PDF bytes; identifies a parse artifact
+def compute_content_hash(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+# Parses a PDF into page text, detected sections and a compact normalised form
+def parse_resume(file_bytes: bytes) -> Dict:
+    extraction = extract_pdf_pages(file_bytes)
+    page_texts = [page["text"] for page in extraction["pages"]]
+    normalized = normalize_resume_text(extraction["text"], page_texts)
+
+    return {
+        "parserVersion": RESUME_PARSER_VERSION,
+        "text": extraction["text"],
+        "pages": page_texts,
+        "pageCount": extraction["stats"]["pageCount"],
+        "sections": detect_sections(normalized),
+        "normalized": normalized,
+    }
+
+
+# Returns the stored parse for this PDF, parsing and storing it on a miss. The flag is True on a cache hit.
+def get_or_create_resume_parse(file_bytes: bytes, content_hash: Optional[str] = None) -> Tuple[Dict, bool]:
+    content_hash = content_hash or compute_content_hash(file_bytes)
+
+    artifact = find_resume_parse(content_hash)
+    if artifact and artifact.get("parserVersion") == RESUME_PARSER_VERSION:
+        return artifact, True
+
+    artifact = parse_resume(file_bytes)
+    save_resume_parse(content_hash, artifact)
+    return {"_id": content_hash, **artifact}, False
+
+
+# Checks whether a current parse artifact exists for this hash
+def has_resume_parse(content_hash: str) -> bool:
+    artifact = find_resume_parse(content_hash, fields=["parserVersion"])
+    return bool(artifact) and artifact.get("parserVersion") == RESUME_PARSER_VERSION
+
+
+# Returns only the requested sections of a stored parse (all tracked sections by default)
+def get_resume_sections(content_hash: str, sections: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    wanted = [section for section in (sections or SECTIONS) if section in SECTIONS]
+    artifact = find_resume_parse(content_hash, fields=[f"sections.{section}" for section in wanted])
+    if not artifact:
+        return {}
+    return {section: text for section, text in artifact.get("sections", {}).items() if text}
+
+
+# Builds prompt-ready resume text from the requested sections, falling back to the full normalised text
+def build_resume_context(content_hash: str, sections: Optional[Iterable[str]] = None) -> Optional[str]:
+    if sections:
+        found = get_resume_sections(content_hash, sections)
+        if found:
+            return "\n\n".join(f"{section.upper()}\n{text}" for section, text in found.items())
+
+    artifact = find_resume_parse(content_hash, fields=["normalized"])
+    return artifact.get("normalized") if artifact else None
@@ -1,9 +1,24 @@
+import os
+from typing import Iterable, Optional
+from utils.resume_sections import normalize_resume_text
+from utils.ttl_cache import TTLCache
+from services.resume_parse_service import build_resume_context
 from repositories.user_repository import (
     find_user_by_id,
+    find_user_resume_info,
+    find_user_resume_text,
     create_user,
     update_user_resume,
+    user_has_resume_version,
 )
 
+CURRENT_RESUME_REF = "current"
+
+# Resume text per (version hash, sections); versions are immutable so entries can live long
+_resume_text_cache = TTLCache(maxsize=512, ttl=int(os.getenv("RESUME_CACHE_TTL_SECONDS", "3600")))
+# Which version is a user's current resume; invalidated on upload, short TTL covers other instances
+_current_resume_cache = TTLCache(maxsize=2048, ttl=int(os.getenv("CURRENT_RESUME_CACHE_TTL_SECONDS", "60")))
+
 # Retrieve user details
 def get_user(user_id: str):
     return find_user_by_id(user_id)
@@ -13,5 +28,39 @@ def register_user(user_data):
     return create_user(user_data)
 
 # Update user resume
-def save_user_resume(user_id: str, resume_text: str) -> bool:
-    return update_user_resume(user_id, resume_text)
\ No newline at end of file
+def save_user_resume(user_id: str, resume_text: str, resume_url: str = None, resume_hash: str = None) -> bool:
+    result = update_user_resume(user_id, resume_text, resume_url, resume_hash)
+    _current_resume_cache.delete(user_id)
+    return result
+
+# Loads the normalised text of a stored resume version, optionally limited to some sections
+def _get_resume_version_text(resume_hash: str, sections: Optional[Iterable[str]] = None) -> Optional[str]:
+    key = (resume_hash, tuple(sorted(sections)) if sections else None)
+    resume_text = _resume_text_cache.get(key)
+    if resume_text is None:
+        resume_text = build_resume_context(resume_hash, sections)
+        if resume_text:
+            _resume_text_cache.set(key, resume_text)
+    return resume_text
+
+# Resolves a resume reference ("current" or a version id) to the stored, normalised resume text
+def get_user_resume(user_id: str, resume_ref: str = CURRENT_RESUME_REF, sections: Optional[Iterable[str]] = None) -> Optional[str]:
+    if resume_ref != CURRENT_RESUME_REF:
+        if not user_has_resume_version(user_id, resume_ref):
+            return None
+        return _get_resume_version_text(resume_ref, sections)
+
+    current = _current_resume_cache.get(user_id)
+    if current is None:
+        info = find_user_resume_info(user_id) or {}
+        if info.get("resumeHash"):
+            current = {"resumeHash": info["resumeHash"]}
+        else:
+            # Resumes stored before parse artifacts existed only have their raw text
+            resume_text = find_user_resume_text(user_id)
+            current = {"resumeText": normalize_resume_text(resume_text) if resume_text else None}
+        _current_resume_cache.set(user_id, current)
+
+    if current.get("resumeHash"):
+        return _get_resume_version_text(current["resumeHash"], sections)
+    return current.get("resumeText")
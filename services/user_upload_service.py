@@ -1,11 +1,30 @@
-import os
-from werkzeug.utils import secure_filename
-from utils.pdf_parser import extract_text_from_pdf
-from repositories.storage_repository import upload_file_to_s3
-from services.user_service import update_user_resume
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_plus
+from repositories.storage_repository import (
+    S3_PRESIGNED_URL_EXPIRES_SECONDS,
+    generate_presigned_upload,
+    get_file_url,
+    get_resume_key,
+    read_file_from_s3,
+    upload_file_to_s3,
+)
+from repositories.user_repository import (
+    claim_resume_upload,
+    complete_resume_upload,
+    find_user_resume_info,
+    release_resume_upload,
+)
+from services.resume_parse_service import compute_content_hash, get_or_create_resume_parse, has_resume_parse
+from services.user_service import save_user_resume
+from utils.tracing import propagate
+
+logger = logging.getLogger(__name__)
 
 MAX_FILE_SIZE_KB = 400
 ALLOWED_MIME_TYPE = "application/pdf"
+RESUME_KEY_PATTERN = re.compile(r"^resumes/(?P<user_id>.+)-resume\.pdf$")
 
 # Handles file validation, uploads to S3, extracts text, and updates the user's resume.
 def handle_file_upload(user_id: str, file) -> dict:
@@ -14,37 +33,93 @@ def handle_file_upload(user_id: str, file) -> dict:
         if not file.filename.endswith(".pdf") or file.mimetype != ALLOWED_MIME_TYPE:
             return {"error": "Only PDF files are allowed"}
 
-        # Check the file size
-        file.seek(0, os.SEEK_END)
-        file_size_kb = file.tell() / 1024 # Get file size in KB
-        file.seek(0) # Reset file pointer
-        if file_size_kb > MAX_FILE_SIZE_KB:
+        # Read the upload into a single in-memory buffer (one byte past the limit is enough to reject it)
+        max_size_bytes = MAX_FILE_SIZE_KB * 1024
+        file_bytes = file.read(max_size_bytes + 1)
+        if len(file_bytes) > max_size_bytes:
             return {"error": f"File size exceeds {MAX_FILE_SIZE_KB} KB"}
 
-        # Create a temporary folder if it doesn't exist
-        temp_folder = "/tmp"
-        os.makedirs(temp_folder, exist_ok=True)
-
-        # Secure the file name and save it temporarily
-        file_path = os.path.join(temp_folder, secure_filename(file.filename))
-        file.save(file_path)
+        # Re-uploading the PDF the user already has skips both parsing and the S3 upload
+        content_hash = compute_content_hash(file_bytes)
+        current = find_user_resume_info(user_id) or {}
+        if current.get("resumeHash") == content_hash and current.get("resumeUrl") and has_resume_parse(content_hash):
+            return {"resumeUrl": current["resumeUrl"], "unchanged": True}
 
-        # Upload file to S3 and get the file URL
-        s3_url = upload_file_to_s3(file_path, user_id)
+        # Upload file to S3 and parse it (or reuse a stored parse) concurrently from the same buffer
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            upload_future = executor.submit(propagate(upload_file_to_s3), file_bytes, user_id)
+            parse_future = executor.submit(propagate(get_or_create_resume_parse), file_bytes, content_hash)
 
-        # Extract text from the uploaded PDF
-        resume_text = extract_text_from_pdf(file_path)
+            resume_parse, _ = parse_future.result()
+            s3_url = upload_future.result()
 
-        # Update the user's resume text in the database
-        update_result = update_user_resume(user_id, resume_text)
+        # Persist both results once they are ready
+        update_result = save_user_resume(user_id, resume_parse["text"], s3_url, content_hash)
         if not update_result:
             return {"error": "Failed to update user resume"}
-
-        # Remove the temporary file
-        os.remove(file_path)
+        # The stored resume no longer comes from a direct upload; uploading that object again must be processed
+        release_resume_upload(user_id)
 
         # Return the S3 file URL
         return {"resumeUrl": s3_url}
     except Exception as e:
-        print(f"Error in handle_file_upload: {e}")
+        logger.error("Error in handle_file_upload: %s", e)
+        return {"error": str(e)}
+
+# Issues a presigned POST so the client can upload the resume straight to S3.
+def create_direct_upload(user_id: str) -> dict:
+    try:
+        upload = generate_presigned_upload(user_id, MAX_FILE_SIZE_KB * 1024)
+        return {"upload": upload, "expiresIn": S3_PRESIGNED_URL_EXPIRES_SECONDS}
+    except Exception as e:
+        logger.error("Error in create_direct_upload: %s", e)
+        return {"error": str(e)}
+
+# Completes a direct upload: reads the object back from S3, extracts its text and updates the user's resume.
+# Idempotent per object (S3 key and ETag): the client callback and the S3 event notification may both
+# arrive for one upload, and only the first one parses and stores it.
+def complete_direct_upload(user_id: str) -> dict:
+    upload_id = None
+    try:
+        file_bytes, etag = read_file_from_s3(user_id)
+        s3_key = get_resume_key(user_id)
+        s3_url = get_file_url(s3_key)
+
+        upload_id = f"{s3_key}:{etag}"
+        if not claim_resume_upload(user_id, upload_id):
+            return {"resumeUrl": s3_url, "unchanged": True}
+
+        # S3 enforces the size limit on the presigned POST; check the content is really a PDF
+        if not file_bytes.startswith(b"%PDF"):
+            release_resume_upload(user_id, upload_id)
+            return {"error": "Only PDF files are allowed"}
+        if len(file_bytes) > MAX_FILE_SIZE_KB * 1024:
+            release_resume_upload(user_id, upload_id)
+            return {"error": f"File size exceeds {MAX_FILE_SIZE_KB} KB"}
+
+        content_hash = compute_content_hash(file_bytes)
+        resume_parse, _ = get_or_create_resume_parse(file_bytes, content_hash)
+
+        update_result = save_user_resume(user_id, resume_parse["text"], s3_url, content_hash)
+        if not update_result:
+            release_resume_upload(user_id, upload_id)
+            return {"error": "Failed to update user resume"}
+        complete_resume_upload(user_id, upload_id)
+
+        return {"resumeUrl": s3_url}
+    except Exception as e:
+        logger.error("Error in complete_direct_upload: %s", e)
+        if upload_id:
+            release_resume_upload(user_id, upload_id)
         return {"error": str(e)}
+
+# Handles S3 ObjectCreated notifications for direct uploads (invoked from the Lambda handler).
+def handle_s3_upload_event(event: dict) -> dict:
+    results = []
+    for record in event.get("Records", []):
+        s3_key = unquote_plus(record.get("s3", {}).get("object", {}).get("key", ""))
+        match = RESUME_KEY_PATTERN.match(s3_key)
+        if not match:
+            continue
+        results.append({"key": s3_key, **complete_direct_upload(match.group("user_id"))})
+    return {"processed": results}
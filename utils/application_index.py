@@ -0,0 +1,106 @@
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from scipy import sparse
+from utils.match_scoring import job_description_terms, resume_terms, term_coverage
+
+# Columns are compacted once fewer than this share of the vocabulary is still used by some row
+_MIN_USED_COLUMN_SHARE = 0.5
+_MIN_COMPACT_VOCABULARY = 256
+
+
+def _text_hash(job_description: str) -> str:
+    return hashlib.sha1((job_description or "").encode("utf-8")).hexdigest()
+
+
+# Sparse term matrix over a user's job descriptions: one row per application, one column per term,
+# each row holding the job description's term weights normalised to sum to 1. Multiplying it by a
+# resume's term coverage vector gives every application's match score in a single operation.
+class ApplicationIndex:
+    def __init__(self):
+        self.ids: List[str] = []
+        self.hashes: Dict[str, str] = {}  # application id -> hash of the indexed job description
+        self.vocabulary: Dict[str, int] = {}
+        self.matrix = sparse.csr_matrix((0, 0))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _row(self, job_description: str):
+        skill_terms, keyword_terms, weights = job_description_terms(job_description or "")
+        columns = [self.vocabulary.setdefault(term, len(self.vocabulary)) for term in skill_terms + keyword_terms]
+        total = weights.sum()
+        return columns, weights / total if total else weights
+
+    # Adds applications ({id: jobDescription}) that are not indexed yet
+    def add(self, job_descriptions: Dict[str, str]):
+        with self._lock:
+            known = set(self.ids)
+            new_ids = [application_id for application_id in job_descriptions if application_id not in known]
+            if not new_ids:
+                return
+
+            data, rows, columns = [], [], []
+            for row, application_id in enumerate(new_ids):
+                row_columns, row_weights = self._row(job_descriptions[application_id])
+                columns.extend(row_columns)
+                data.extend(row_weights)
+                rows.extend([row] * len(row_columns))
+
+            width = len(self.vocabulary)
+            new_rows = sparse.csr_matrix((data, (rows, columns)), shape=(len(new_ids), width))
+            self.matrix.resize((self.matrix.shape[0], width))
+            self.matrix = sparse.vstack([self.matrix, new_rows], format="csr")
+            self.ids.extend(new_ids)
+            self.hashes.update((application_id, _text_hash(job_descriptions[application_id])) for application_id in new_ids)
+
+    # Drops applications from the index
+    def remove(self, application_ids: Iterable[str]):
+        with self._lock:
+            removed = set(application_ids)
+            keep = [row for row, application_id in enumerate(self.ids) if application_id not in removed]
+            if len(keep) == len(self.ids):
+                return
+            self.matrix = self.matrix[keep]
+            self.ids = [self.ids[row] for row in keep]
+            for application_id in removed:
+                self.hashes.pop(application_id, None)
+            self._compact()
+
+    # Drops vocabulary columns no remaining row uses once they dominate the matrix
+    def _compact(self):
+        if len(self.vocabulary) < _MIN_COMPACT_VOCABULARY:
+            return
+        used = np.unique(self.matrix.indices)
+        if len(used) >= _MIN_USED_COLUMN_SHARE * len(self.vocabulary):
+            return
+        new_columns = {int(column): index for index, column in enumerate(used)}
+        self.vocabulary = {term: new_columns[column] for term, column in self.vocabulary.items() if column in new_columns}
+        self.matrix = self.matrix[:, used]
+
+    # Brings the index in line with the user's current applications ({id: jobDescription}),
+    # tokenising only applications it has not seen or whose job description changed (e.g. on another instance)
+    def sync(self, job_descriptions: Dict[str, str]):
+        self.remove([
+            application_id for application_id in list(self.ids)
+            if application_id not in job_descriptions or self.hashes.get(application_id) != _text_hash(job_descriptions[application_id])
+        ])
+        self.add(job_descriptions)
+
+    # (application id, 0-100 score) for every indexed application, best match first
+    def rank(self, user_resume: str) -> List[Tuple[str, int]]:
+        counts, resume_length = resume_terms(user_resume)
+        with self._lock:
+            if not self.ids:
+                return []
+            resume_tf = np.zeros(len(self.vocabulary))
+            for term, count in counts.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    resume_tf[column] = count
+
+            scores = self.matrix @ term_coverage(resume_tf, resume_length)
+            order = np.argsort(-scores, kind="stable")
+            return [(self.ids[row], int(round(100 * scores[row]))) for row in order]
@@ -0,0 +1,54 @@
+import gzip
+import os
+from flask import request
+from utils.tracing import span
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html", "text/csv"}
+
+
+# Picks the best encoding the client accepts
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+# after_request hook: compresses text responses above COMPRESSION_MIN_SIZE with brotli or gzip
+def compress_response(response):
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < COMPRESSION_MIN_SIZE:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+    with span("compress"):
+        if encoding == "br":
+            compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
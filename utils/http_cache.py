@@ -0,0 +1,14 @@
+import hashlib
+from flask import current_app, request
+
+
+# Builds a JSON response with a weak ETag derived from its content, answering 304 when
+# the client's If-None-Match still matches
+def json_response_with_etag(payload, status: int = 200):
+    body = current_app.json.dumps(payload)
+    response = current_app.response_class(body, status=status, mimetype="application/json")
+
+    # Weak: the representation stays equivalent whether or not it is compressed
+    response.set_etag(hashlib.sha1(body.encode("utf-8")).hexdigest(), weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
@@ -0,0 +1,47 @@
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+import msgspec
+from utils.tracing import span
+
+
+# Types msgspec does not encode natively; everything else (dicts, lists, Structs,
+# datetimes, UUIDs, decimals, dataclasses) is handled in C
+def _enc_hook(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Flask JSON provider backed by msgspec: jsonify, request.get_json and app.json all go
+# through it. Keys keep insertion order (no sorting) and datetimes are ISO 8601.
+class MsgspecJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encoder = msgspec.json.Encoder(enc_hook=_enc_hook)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Formatting options (indent, sort_keys, ...) are only supported by the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        with span("serialize"):
+            return self._encoder.encode(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return self._decoder.decode(s)
+        except msgspec.DecodeError as e:
+            # request.get_json turns ValueError into a 400 Bad Request
+            raise ValueError(str(e)) from e
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with span("serialize"):
+            body = self._encoder.encode(obj) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
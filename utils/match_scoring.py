@@ -0,0 +1,159 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+import numpy as np
+from utils.skills_dictionary import AMBIGUOUS_SKILLS, SKILL_CONTEXT_WORDS, SKILLS, STOPWORDS
+
+# Bump when scoring changes so stored scores can be told apart
+SCORER_VERSION = 2
+# BM25 term-frequency saturation (k1) and resume length normalisation (b)
+MATCH_BM25_K1 = float(os.getenv("MATCH_BM25_K1", "0.5"))
+MATCH_BM25_B = float(os.getenv("MATCH_BM25_B", "0.3"))
+# Typical resume length in tokens; longer resumes need more mentions for the same credit
+MATCH_AVG_RESUME_TOKENS = int(os.getenv("MATCH_AVG_RESUME_TOKENS", "450"))
+# Dictionary skills count this many times as much as other job description keywords
+MATCH_SKILL_WEIGHT = float(os.getenv("MATCH_SKILL_WEIGHT", "2.0"))
+# Most frequent non-skill keywords of the job description that are scored
+MATCH_MAX_KEYWORDS = int(os.getenv("MATCH_MAX_KEYWORDS", "25"))
+# Mentions that earn a term full credit in an average-length resume
+MATCH_FULL_CREDIT_MENTIONS = float(os.getenv("MATCH_FULL_CREDIT_MENTIONS", "2"))
+MATCH_MAX_LISTED = 15
+
+# Words, keeping skill punctuation (c++, c#, .net, node.js, ci/cd)
+_TOKEN_PATTERN = re.compile(r"\.?[a-z0-9#+]+(?:[./-][a-z0-9#+]+)*")
+_TOKEN_SEPARATORS = re.compile(r"[./-]")
+_URL_PATTERN = re.compile(r"https?://\S+|www\.\S+|\S+@\S+\.\S+")
+_LOWERCASE_WORD_PATTERN = re.compile(r"(?<![A-Za-z])[a-z]+(?![A-Za-z])")
+_TITLE_CASE_WORD_PATTERN = re.compile(r"(?<![A-Za-z])[A-Z][a-z]+(?![A-Za-z])")
+_SKILL_ALIASES = {
+    alias: skill for skill, aliases in SKILLS.items() for alias in [skill, *aliases]
+}
+_MAX_PHRASE_TOKENS = 3
+# Tokens on each side of an ambiguous skill searched for context
+_SKILL_CONTEXT_WINDOW = 3
+
+
+# Lower-case tokens; punctuated tokens that are not known skills ("python/django", "e.g") are split
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(_URL_PATTERN.sub(" ", text.lower())):
+        if token in _SKILL_ALIASES or not _TOKEN_SEPARATORS.search(token):
+            tokens.append(token)
+        else:
+            tokens.extend(part for part in _TOKEN_SEPARATORS.split(token) if part)
+    return tokens
+
+
+# Whether the tokens around an ambiguous skill mention programming or another (unambiguous) skill
+def _in_skill_context(tokens: List[str], start: int, end: int) -> bool:
+    around = tokens[max(0, start - _SKILL_CONTEXT_WINDOW):start] + tokens[end:end + _SKILL_CONTEXT_WINDOW]
+    return any(
+        token in SKILL_CONTEXT_WORDS or (token in _SKILL_ALIASES and _SKILL_ALIASES[token] not in AMBIGUOUS_SKILLS)
+        for token in around
+    )
+
+
+# Counts dictionary skills (longest phrase first, aliases folded into the canonical name)
+# and the remaining meaningful keywords. Ambiguous skills without context are ignored.
+def extract_terms(tokens: List[str]) -> Tuple[Counter, Counter]:
+    skills, keywords = Counter(), Counter()
+    i = 0
+    while i < len(tokens):
+        for length in range(min(_MAX_PHRASE_TOKENS, len(tokens) - i), 0, -1):
+            skill = _SKILL_ALIASES.get(" ".join(tokens[i:i + length]))
+            if skill:
+                if skill not in AMBIGUOUS_SKILLS or _in_skill_context(tokens, i, i + length):
+                    skills[skill] += 1
+                i += length
+                break
+        else:
+            token = tokens[i]
+            if len(token) > 1 and token not in STOPWORDS and any(char.isalpha() for char in token):
+                keywords[token] += 1
+            i += 1
+    return skills, keywords
+
+
+def _bm25_saturation(term_frequency, resume_length: int):
+    norm = MATCH_BM25_K1 * (1 - MATCH_BM25_B + MATCH_BM25_B * resume_length / MATCH_AVG_RESUME_TOKENS)
+    return term_frequency * (MATCH_BM25_K1 + 1) / (term_frequency + norm)
+
+
+# BM25 term saturation scaled to [0, 1]: credit rises with mentions, with diminishing returns,
+# and a long resume needs more mentions than a short one for the same credit
+def term_coverage(resume_tf: np.ndarray, resume_length: int) -> np.ndarray:
+    full_credit = _bm25_saturation(MATCH_FULL_CREDIT_MENTIONS, MATCH_AVG_RESUME_TOKENS)
+    return np.minimum(_bm25_saturation(resume_tf, max(resume_length, 1)) / full_credit, 1.0)
+
+
+# Words the job description only ever writes in title case: company, product and place names
+# and headings, which a resume is not expected to repeat (acronyms such as APIs are kept)
+def _name_keywords(job_description: str, keywords: Counter) -> set:
+    text = _URL_PATTERN.sub(" ", job_description)
+    lowercase_words = set(_LOWERCASE_WORD_PATTERN.findall(text))
+    title_case_words = {word.lower() for word in _TITLE_CASE_WORD_PATTERN.findall(text)}
+    return {keyword for keyword in keywords if keyword in title_case_words and keyword not in lowercase_words}
+
+
+# Scored terms of a job description: its dictionary skills, then its most frequent keywords
+# (names excluded), with weights that grow with how often the job description mentions the term
+def job_description_terms(job_description: str) -> Tuple[List[str], List[str], np.ndarray]:
+    job_skills, job_keywords = extract_terms(tokenize(job_description))
+    for name in _name_keywords(job_description, job_keywords):
+        del job_keywords[name]
+    skill_terms = list(job_skills)
+    keyword_terms = [term for term, _ in job_keywords.most_common(MATCH_MAX_KEYWORDS)]
+
+    job_tf = np.array([job_skills[term] for term in skill_terms] + [job_keywords[term] for term in keyword_terms], dtype=float)
+    boost = np.concatenate([np.full(len(skill_terms), MATCH_SKILL_WEIGHT), np.ones(len(keyword_terms))])
+    return skill_terms, keyword_terms, boost * (1 + np.log(job_tf))
+
+
+# Term frequencies of a resume (skills and keywords share one namespace) and its length in tokens
+def resume_terms(user_resume: str) -> Tuple[Counter, int]:
+    tokens = tokenize(user_resume)
+    skills, keywords = extract_terms(tokens)
+    return skills + keywords, len(tokens)
+
+
+def _weighted_score(weights: np.ndarray, coverage: np.ndarray) -> int:
+    total = weights.sum()
+    return int(round(100 * float(weights @ coverage) / total)) if total else 0
+
+
+def _split_terms(terms: List[str], weights: np.ndarray, present: np.ndarray) -> Tuple[List[str], List[str]]:
+    order = np.argsort(-weights, kind="stable")
+    matched = [terms[i] for i in order if present[i]]
+    missing = [terms[i] for i in order if not present[i]]
+    return matched[:MATCH_MAX_LISTED], missing[:MATCH_MAX_LISTED]
+
+
+# Local resume-to-job-description match: a BM25-style weighted coverage of the job description's
+# skills and keywords by the resume. Score is 0-100.
+def score_match(user_resume: str, job_description: str) -> Dict:
+    skill_terms, keyword_terms, weights = job_description_terms(job_description)
+    terms = skill_terms + keyword_terms
+    if not terms:
+        return {"score": 0, "skillScore": 0, "keywordScore": 0, "matchedSkills": [], "missingSkills": [],
+                "matchedKeywords": [], "missingKeywords": [], "scorerVersion": SCORER_VERSION}
+
+    resume_counts, resume_length = resume_terms(user_resume)
+    resume_tf = np.array([resume_counts[term] for term in terms], dtype=float)
+    coverage = term_coverage(resume_tf, resume_length)
+
+    skills = slice(0, len(skill_terms))
+    keywords = slice(len(skill_terms), len(terms))
+    matched_skills, missing_skills = _split_terms(skill_terms, weights[skills], resume_tf[skills] > 0)
+    matched_keywords, missing_keywords = _split_terms(keyword_terms, weights[keywords], resume_tf[keywords] > 0)
+
+    return {
+        "score": _weighted_score(weights, coverage),
+        "skillScore": _weighted_score(weights[skills], coverage[skills]),
+        "keywordScore": _weighted_score(weights[keywords], coverage[keywords]),
+        "matchedSkills": matched_skills,
+        "missingSkills": missing_skills,
+        "matchedKeywords": matched_keywords,
+        "missingKeywords": missing_keywords,
+        "scorerVersion": SCORER_VERSION,
+    }
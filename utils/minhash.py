@@ -0,0 +1,59 @@
+import hashlib
+import random
+import re
+from typing import Iterable, List, Set
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_HASH_MASK = (1 << 63) - 1  # signatures must fit in a signed 64-bit BSON integer
+
+
+# Lowercase word tokens, ignoring punctuation and whitespace differences
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+# Overlapping word k-grams; texts shorter than k yield a single shingle
+def shingles(tokens: List[str], k: int = 5) -> Set[str]:
+    if len(tokens) <= k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big") & _HASH_MASK
+
+
+# Fixed per-position XOR masks: one base hash per shingle, each mask acting as a permutation
+def _masks(num_perm: int) -> List[int]:
+    generator = random.Random(num_perm)
+    return [generator.getrandbits(63) for _ in range(num_perm)]
+
+
+_MASK_CACHE = {}
+
+
+# MinHash signature of a shingle set; equal positions estimate the Jaccard similarity
+def minhash_signature(shingle_set: Iterable[str], num_perm: int = 64) -> List[int]:
+    masks = _MASK_CACHE.get(num_perm)
+    if masks is None:
+        masks = _MASK_CACHE.setdefault(num_perm, _masks(num_perm))
+    hashes = [_hash64(shingle) for shingle in shingle_set]
+    if not hashes:
+        return [_HASH_MASK] * num_perm
+    return [min(value ^ mask for value in hashes) for mask in masks]
+
+
+# Locality-sensitive hashing band keys: texts sharing any band are near-duplicate candidates
+def lsh_bands(signature: List[int], bands: int = 16) -> List[str]:
+    rows = len(signature) // bands
+    return [
+        f"{band}:{hashlib.blake2b(repr(signature[band * rows:(band + 1) * rows]).encode('ascii'), digest_size=8).hexdigest()}"
+        for band in range(bands)
+    ]
+
+
+# Share of equal signature positions, an estimate of the Jaccard similarity of the shingle sets
+def estimate_similarity(signature: List[int], other: List[int]) -> float:
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(1 for a, b in zip(signature, other) if a == b) / len(signature)
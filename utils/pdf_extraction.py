@@ -0,0 +1,104 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import fitz
+from utils.pdf_parser import PdfSource, read_pdf_bytes
+from utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Documents with fewer pages than this are parsed in-process; the pool start-up costs more than it saves
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+
+
+# Extracts the text of pages [start, stop) from a PDF (runs inside worker processes)
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> List[str]:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        return [pdf[number].get_text() for number in range(start, stop)]
+
+
+# Extracts every page of a PDF sequentially (runs inside worker processes for multi-document jobs)
+def _extract_all_pages(pdf_bytes: bytes) -> Dict:
+    started = time.perf_counter()
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        pages = [page.get_text() for page in pdf]
+    return _build_result(pages, started, workers=1, mode="sequential")
+
+
+# Splits page_count pages into at most `chunks` contiguous ranges
+def _page_ranges(page_count: int, chunks: int) -> List[tuple]:
+    chunks = max(1, min(chunks, page_count))
+    size, remainder = divmod(page_count, chunks)
+    ranges, start = [], 0
+    for index in range(chunks):
+        stop = start + size + (1 if index < remainder else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+# Builds the page-level result with timing stats
+def _build_result(pages: List[str], started: float, workers: int, mode: str) -> Dict:
+    text = "".join(pages).strip()
+    elapsed = time.perf_counter() - started
+    return {
+        "text": text,
+        "pages": [{"pageNumber": number, "text": page.strip()} for number, page in enumerate(pages, start=1)],
+        "stats": {
+            "pageCount": len(pages),
+            "charCount": len(text),
+            "elapsedMs": round(elapsed * 1000, 3),
+            "pagesPerSecond": round(len(pages) / elapsed, 2) if elapsed > 0 else None,
+            "workers": workers,
+            "mode": mode,
+        },
+    }
+
+
+# Extracts per-page text from one PDF, splitting large documents across a process pool
+@traced("pdf.extract_pdf_pages")
+def extract_pdf_pages(source: PdfSource, max_workers: Optional[int] = None) -> Dict:
+    pdf_bytes = read_pdf_bytes(source)
+    workers = max_workers or PDF_EXTRACT_WORKERS
+    started = time.perf_counter()
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        page_count = pdf.page_count
+        if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            pages = [page.get_text() for page in pdf]
+            return _build_result(pages, started, workers=1, mode="sequential")
+
+    ranges = _page_ranges(page_count, workers)
+    try:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            chunks = executor.map(
+                _extract_page_range,
+                [pdf_bytes] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            pages = [page for chunk in chunks for page in chunk]
+        return _build_result(pages, started, workers=len(ranges), mode="parallel")
+    except OSError as e:
+        # Environments without working multiprocessing (e.g. AWS Lambda has no /dev/shm)
+        logger.warning("Process pool unavailable, extracting sequentially: %s", e)
+        return _build_result(_extract_page_range(pdf_bytes, 0, page_count), started, workers=1, mode="sequential")
+
+
+# Extracts per-page text from many PDFs, one document per worker process
+def extract_many_pdf_pages(sources: Sequence[PdfSource], max_workers: Optional[int] = None) -> List[Dict]:
+    documents = [read_pdf_bytes(source) for source in sources]
+    workers = min(max_workers or PDF_EXTRACT_WORKERS, len(documents))
+
+    if workers <= 1:
+        return [_extract_all_pages(document) for document in documents]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_extract_all_pages, documents, chunksize=max(1, len(documents) // (workers * 4))))
+    except OSError as e:
+        logger.warning("Process pool unavailable, extracting sequentially: %s", e)
+        return [_extract_all_pages(document) for document in documents]
@@ -1,12 +1,38 @@
+import logging
+from typing import BinaryIO, Union
 import fitz
+from utils.tracing import traced
 
-def extract_text_from_pdf(file_path: str) -> str:
+logger = logging.getLogger(__name__)
+
+# Accepts raw bytes or a binary stream (e.g. an uploaded FileStorage or BytesIO)
+PdfSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+# Reads a PDF source into bytes without touching the filesystem
+@traced("pdf.read_pdf_bytes")
+def read_pdf_bytes(source: PdfSource) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    data = source.read()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return data
+
+
+# Opens a PDF document from memory
+def open_pdf(source: PdfSource) -> fitz.Document:
+    return fitz.open(stream=read_pdf_bytes(source), filetype="pdf")
+
+
+@traced("pdf.extract_text_from_pdf")
+def extract_text_from_pdf(source: PdfSource) -> str:
     try:
-        with fitz.open(file_path) as pdf:
-            text = ""
-            for page in pdf:
-                text += page.get_text()
-            return text.strip()
+        with open_pdf(source) as pdf:
+            return "".join(page.get_text() for page in pdf).strip()
     except Exception as e:
-        print(f"Error extracting text from pdf: {e}")
-        return ""
\ No newline at end of file
+        logger.error("Error extracting text from pdf: %s", e)
+        return ""
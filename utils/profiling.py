@@ -0,0 +1,156 @@
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Optional, Set
+from flask import g, request
+from utils.tracing import current_trace
+
+try:
+    from pyinstrument import Profiler as HtmlProfiler
+except ImportError:  # pyinstrument is optional; the built-in sampler is always available
+    HtmlProfiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+# Fraction of requests profiled at random
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Requests carrying this header with PROFILE_HEADER_TOKEN as its value are always profiled
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Debug-Profile")
+PROFILE_HEADER_TOKEN = os.getenv("PROFILE_HEADER_TOKEN", "")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# "collapsed" (flame graph input, built in) or "html" (pyinstrument, if installed)
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "collapsed").lower()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    file_name = os.path.relpath(code.co_filename) if code.co_filename.startswith(os.getcwd()) else os.path.basename(code.co_filename)
+    return f"{code.co_name} ({file_name}:{code.co_firstlineno})"
+
+
+# Statistical profiler: a background thread samples the stacks of the request's threads at a fixed
+# interval and counts identical stacks, producing the collapsed format flame graph tools read.
+# thread_ids returns the threads to sample (the request thread and the workers carrying its trace);
+# without it every other thread is sampled. Each stack is rooted at its thread's name.
+class StackSampler:
+    def __init__(self, thread_ids: Optional[Callable[[], Set[int]]], interval: float):
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            frames.pop(self._thread.ident, None)
+            wanted = self.thread_ids() if self.thread_ids else frames.keys()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            sampled = False
+            for thread_id in wanted:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    stack.append(names.get(thread_id, str(thread_id)))
+                    self.stacks[";".join(reversed(stack))] += 1
+                    sampled = True
+            if sampled:
+                self.samples += 1
+
+    def output(self) -> bytes:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()).encode("utf-8")
+
+
+def _requested_by_header() -> bool:
+    value = request.headers.get(PROFILE_HEADER)
+    return bool(value and PROFILE_HEADER_TOKEN and hmac.compare_digest(value, PROFILE_HEADER_TOKEN))
+
+
+def _start_profile():
+    if request.blueprint == "profile":
+        return
+    if _requested_by_header():
+        trigger = "header"
+    elif PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        trigger = "sample"
+    else:
+        return
+
+    if PROFILE_FORMAT == "html" and HtmlProfiler is not None:
+        profiler = HtmlProfiler(interval=PROFILE_INTERVAL_MS / 1000)
+    else:
+        trace = current_trace()
+        profiler = StackSampler(trace.thread_ids if trace is not None else None, PROFILE_INTERVAL_MS / 1000)
+    g._profile = {"profiler": profiler, "trigger": trigger, "started": time.perf_counter()}
+    profiler.start()
+
+
+def _profile_id() -> str:
+    route = re.sub(r"[^A-Za-z0-9]+", ".", request.url_rule.rule if request.url_rule else request.path).strip(".")
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{timestamp}-{request.method}-{route or 'root'}-{uuid.uuid4().hex[:8]}"
+
+
+def _finish_profile(response):
+    profile = g.pop("_profile", None)
+    if profile is None:
+        return response
+
+    from repositories.profile_repository import save_profile
+    profiler = profile["profiler"]
+    profiler.stop()
+    duration_ms = (time.perf_counter() - profile["started"]) * 1000
+    if isinstance(profiler, StackSampler):
+        data, extension, samples = profiler.output(), "txt", profiler.samples
+    else:
+        data, extension, samples = profiler.output_html().encode("utf-8"), "html", None
+
+    profile_id = _profile_id()
+    if save_profile(profile_id, extension, data):
+        response.headers["X-Profile-Id"] = f"{profile_id}.{extension}"
+        logger.info("Request profiled", extra={
+            "profileId": f"{profile_id}.{extension}",
+            "trigger": profile["trigger"],
+            "path": request.path,
+            "status": response.status_code,
+            "durationMs": round(duration_ms, 2),
+            "samples": samples,
+        })
+    return response
+
+
+def _abandon_profile(exc):
+    profile = g.pop("_profile", None)
+    if profile is not None:
+        profile["profiler"].stop()
+
+
+# Registers the profiling hooks; a no-op unless PROFILING_ENABLED
+def init_app(app):
+    if not PROFILING_ENABLED:
+        return
+    if PROFILE_FORMAT == "html" and HtmlProfiler is None:
+        logger.warning("pyinstrument is not installed, profiles use the collapsed stack format")
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_abandon_profile)
@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Tuple
+
+
+# Process-local counter store: token buckets for rate limits and counters for concurrency caps.
+# repositories.rate_limit_repository.MongoCounterStore offers the same interface across instances.
+class InMemoryCounterStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._slots: Dict[str, int] = {}
+
+    # Take `cost` tokens from a bucket refilled at `rate` tokens/second up to `capacity`.
+    # A cost above capacity is admitted from a full bucket and leaves it in debt, so it is still paid in full.
+    # Returns 0 when allowed, otherwise the seconds until enough tokens are available.
+    def take_tokens(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        now = time.monotonic()
+        required = min(cost, capacity)
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= required:
+                self._buckets[key] = (tokens - cost, now)
+                return 0
+            self._buckets[key] = (tokens, now)
+            return (required - tokens) / rate
+
+    # Give back tokens taken for a request that was then turned away
+    def refund_tokens(self, key: str, cost: float, capacity: float) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + cost), updated_at)
+
+    # Take one of `limit` concurrency slots; False when all are in use
+    def acquire_slot(self, key: str, limit: int) -> bool:
+        with self._lock:
+            in_use = self._slots.get(key, 0)
+            if in_use >= limit:
+                return False
+            self._slots[key] = in_use + 1
+            return True
+
+    def release_slot(self, key: str) -> None:
+        with self._lock:
+            in_use = self._slots.get(key, 0) - 1
+            if in_use > 0:
+                self._slots[key] = in_use
+            else:
+                self._slots.pop(key, None)
+
+
+# Weighted semaphore that admits waiters strictly by priority (lower first), then arrival order,
+# so interactive work gets ahead of queued bulk work
+class FairShareScheduler:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._available = capacity
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    # Wait up to `timeout` seconds for `weight` units; False on timeout
+    def acquire(self, priority: int, weight: int = 1, timeout: float = None) -> bool:
+        weight = max(1, min(weight, self.capacity))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entry = (priority, next(self._sequence), weight)
+
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            while self._waiters[0] is not entry or self._available < weight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._condition.notify_all()
+                    return False
+                self._condition.wait(remaining)
+
+            heapq.heappop(self._waiters)
+            self._available -= weight
+            self._condition.notify_all()
+            return True
+
+    def release(self, weight: int = 1) -> None:
+        weight = max(1, min(weight, self.capacity))
+        with self._condition:
+            self._available += weight
+            self._condition.notify_all()
+
+    # Current load, for diagnostics
+    def snapshot(self) -> Dict:
+        with self._condition:
+            return {"capacity": self.capacity, "available": self._available, "waiting": len(self._waiters)}
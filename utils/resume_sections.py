@@ -0,0 +1,96 @@
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# Section name -> headings that open it (compared lower-cased, without trailing punctuation)
+SECTION_HEADINGS = {
+    "education": ["education", "academic background", "academics", "education and training"],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "internships",
+    ],
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tools and technologies", "skills and interests"],
+    "projects": ["projects", "personal projects", "academic projects", "selected projects", "technical projects"],
+}
+
+# Headings that close the previous section without being stored themselves
+OTHER_HEADINGS = [
+    "summary", "profile", "objective", "about me", "certifications", "awards", "honors",
+    "publications", "volunteering", "volunteer experience", "interests", "languages",
+    "activities", "leadership", "references", "contact",
+]
+
+SECTIONS = list(SECTION_HEADINGS)
+MAX_HEADING_LENGTH = 40
+
+_HEADING_LOOKUP = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+_HEADING_LOOKUP.update({heading: None for heading in OTHER_HEADINGS})
+_BULLETS = re.compile(r"^[•●▪◦‣⁃\-\*·]+\s*")
+_WHITESPACE = re.compile(r"\s+")
+# "Page 2", "Page 2 of 3", "2 of 3", "2/3"
+_PAGE_MARKER = re.compile(r"^(page\s+\d+(\s*(/|of)\s*\d+)?|\d+\s*(/|of)\s*\d+)$", re.IGNORECASE)
+# A bare number is only a page number at a page break; elsewhere it may be a year in a date column
+_BARE_PAGE_NUMBER = re.compile(r"^\d{1,3}$")
+
+
+# Cleans one line of extracted PDF text
+def _clean_line(line: str) -> str:
+    line = unicodedata.normalize("NFKC", line)
+    line = _BULLETS.sub("", line.strip())
+    return _WHITESPACE.sub(" ", line).strip()
+
+
+# Returns the section a line opens, None for a non-tracked heading, or "" if it is not a heading
+def _match_heading(line: str):
+    if not line or len(line) > MAX_HEADING_LENGTH:
+        return ""
+    key = line.lower().rstrip(":").strip()
+    return _HEADING_LOOKUP.get(key, "")
+
+
+# Produces a compact form of the resume: cleaned lines, no blanks, page numbers or repeated page headers/footers.
+# When the text of each page is given it is used instead of text, so page breaks are known.
+def normalize_resume_text(text: str, pages: Optional[List[str]] = None) -> str:
+    multi_page = bool(pages) and len(pages) > 1
+    page_lines = [[_clean_line(line) for line in page.splitlines()] for page in (pages if multi_page else [text])]
+
+    # Lines present on every page of a multi-page resume are headers/footers; keep the first occurrence only
+    repeated = set()
+    if multi_page:
+        repeated = set.intersection(*(set(lines) for lines in page_lines)) - {""}
+
+    seen = set()
+    lines: List[str] = []
+    for page in page_lines:
+        content = [index for index, line in enumerate(page) if line]
+        edges = {content[0], content[-1]} if multi_page and content else set()
+        for index, line in enumerate(page):
+            if not line or _PAGE_MARKER.match(line):
+                continue
+            if index in edges and _BARE_PAGE_NUMBER.match(line):
+                continue
+            if line in repeated:
+                if line in seen:
+                    continue
+                seen.add(line)
+            lines.append(line)
+    return "\n".join(lines)
+
+
+# Splits resume text into the tracked sections (education, experience, skills, projects)
+def detect_sections(text: str) -> Dict[str, str]:
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for raw_line in text.splitlines():
+        line = _clean_line(raw_line)
+        if not line:
+            continue
+        heading = _match_heading(line)
+        if heading != "":
+            current = heading
+            continue
+        if current:
+            sections.setdefault(current, []).append(line)
+    return {section: "\n".join(lines) for section, lines in sections.items()}
@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+# Coalesces concurrent calls that share a key: the first caller runs the function,
+# callers arriving while it is in flight wait for and share its result (or exception)
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    # Returns (result, shared) where shared is True when the result came from another caller's run
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+
+        if not leader:
+            return call.result(), True
+
+        try:
+            result = func(*args, **kwargs)
+            call.set_result(result)
+            return result, False
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    # Number of keys currently in flight
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,178 @@
+# Bundled skills dictionary for local resume/job description matching.
+# Canonical skill -> aliases (lower-case; multi-word entries are matched as phrases of up to three tokens).
+# Skills that are also everyday words (go, rest, express, excel) are only listed in unambiguous forms;
+# the few that must stay listed as plain words are in AMBIGUOUS_SKILLS.
+SKILLS = {
+    # Languages
+    "python": [],
+    "java": [],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "c": [],
+    "c++": ["cpp"],
+    "c#": ["csharp"],
+    "golang": ["go lang"],
+    "rust": [],
+    "ruby": [],
+    "php": [],
+    "kotlin": [],
+    "swift": [],
+    "scala": [],
+    "r programming": ["rstudio"],
+    "matlab": [],
+    "sql": [],
+    "bash": ["shell scripting", "shell"],
+    "html": ["html5"],
+    "css": ["css3"],
+    "dart": [],
+    "perl": [],
+    "haskell": [],
+    "elixir": [],
+    "solidity": [],
+    # Web and backend frameworks
+    "react": ["react.js", "reactjs"],
+    "angular": ["angular.js", "angularjs"],
+    "vue": ["vue.js", "vuejs"],
+    "svelte": [],
+    "next.js": ["nextjs"],
+    "node.js": ["node", "nodejs"],
+    "express.js": ["expressjs"],
+    "django": [],
+    "flask": [],
+    "fastapi": [],
+    "spring": ["spring boot", "springboot"],
+    ".net": ["dotnet", "asp.net", ".net core"],
+    "rails": ["ruby on rails"],
+    "laravel": [],
+    "graphql": [],
+    "rest apis": ["rest api", "restful", "restful api", "restful apis"],
+    "grpc": [],
+    "redux": [],
+    "tailwind": ["tailwind css", "tailwindcss"],
+    "jquery": [],
+    "flutter": [],
+    "react native": [],
+    # Data and machine learning
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "natural language processing": ["nlp"],
+    "computer vision": [],
+    "large language models": ["llm", "llms"],
+    "data analysis": ["data analytics"],
+    "data engineering": [],
+    "data science": [],
+    "statistics": [],
+    "pandas": [],
+    "numpy": [],
+    "scipy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "tensorflow": [],
+    "pytorch": ["torch"],
+    "keras": [],
+    "spark": ["apache spark", "pyspark"],
+    "hadoop": [],
+    "kafka": ["apache kafka"],
+    "airflow": ["apache airflow"],
+    "dbt": [],
+    "tableau": [],
+    "power bi": ["powerbi"],
+    "microsoft excel": ["ms excel"],
+    "etl": [],
+    # Databases
+    "postgresql": ["postgres"],
+    "mysql": [],
+    "sqlite": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "elasticsearch": ["elastic search"],
+    "cassandra": [],
+    "dynamodb": [],
+    "oracle": [],
+    "sql server": ["mssql"],
+    "snowflake": [],
+    "bigquery": [],
+    # Cloud and infrastructure
+    "aws": ["amazon web services"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ansible": [],
+    "linux": ["unix"],
+    "lambda": ["aws lambda"],
+    "s3": ["aws s3"],
+    "ec2": [],
+    "serverless": [],
+    "microservices": ["microservice"],
+    "ci/cd": ["cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "jenkins": [],
+    "github actions": [],
+    "git": ["github", "gitlab"],
+    "nginx": [],
+    "prometheus": [],
+    "grafana": [],
+    "devops": [],
+    # Practices
+    "agile": ["scrum", "kanban"],
+    "test-driven development": ["tdd"],
+    "unit testing": ["unit tests"],
+    "pytest": [],
+    "jest": [],
+    "selenium": [],
+    "cypress": [],
+    "object-oriented programming": ["oop", "object oriented programming"],
+    "data structures": [],
+    "algorithms": [],
+    "distributed systems": [],
+    "system design": [],
+    "api design": [],
+    "security": ["cybersecurity", "cyber security"],
+    "oauth": ["oauth2"],
+    "jwt": [],
+    "performance optimization": ["performance tuning"],
+    "debugging": [],
+    # Design and product
+    "figma": [],
+    "ui/ux": ["ui", "ux", "user experience", "user interface"],
+    "product management": [],
+    "project management": [],
+    "jira": [],
+    # Professional skills
+    "communication": ["communication skills"],
+    "leadership": [],
+    "teamwork": ["collaboration"],
+    "problem solving": ["problem-solving"],
+    "mentoring": [],
+}
+
+# Skills that are also everyday words ("Grade C", "Swift runner", "Spring 2021"); they only count
+# near a SKILL_CONTEXT_WORDS word or an unambiguous skill
+AMBIGUOUS_SKILLS = {"c", "swift", "rust", "dart", "spring"}
+SKILL_CONTEXT_WORDS = {
+    "code", "coding", "developer", "developers", "development", "embedded", "engineer", "engineers",
+    "engineering", "framework", "frameworks", "ios", "language", "languages", "macos", "proficiency",
+    "proficient", "programming", "skills", "software", "stack", "technologies",
+}
+
+# Common words that carry no signal for matching
+STOPWORDS = {
+    "a", "about", "above", "across", "after", "all", "also", "an", "and", "any", "are", "as", "at", "be",
+    "been", "being", "both", "but", "by", "can", "could", "do", "does", "each", "etc", "for", "from", "has",
+    "have", "having", "how", "i", "if", "in", "including", "into", "is", "it", "its", "may", "me", "more",
+    "most", "must", "my", "no", "not", "of", "on", "one", "or", "other", "our", "out", "over", "per", "plus",
+    "should", "so", "some", "such", "than", "that", "the", "their", "them", "then", "there", "these", "they",
+    "this", "those", "through", "to", "under", "up", "us", "using", "very", "was", "we", "well", "were",
+    "what", "when", "where", "which", "while", "who", "will", "with", "within", "would", "you", "your",
+    # Job posting boilerplate
+    "ability", "apply", "candidate", "candidates", "company", "equal", "experience", "job", "join", "looking",
+    "opportunity", "position", "preferred", "required", "requirements", "responsibilities", "role", "skills",
+    "strong", "team", "work", "working", "year", "years", "knowledge", "understanding", "familiarity",
+    "excellent", "good", "great", "new", "related", "relevant", "bonus", "nice",
+    # Benefits, hiring and company boilerplate
+    "benefits", "compensation", "competitive", "culture", "dental", "disability", "diverse", "diversity",
+    "employee", "employees", "employer", "employment", "flexible", "gender", "health", "hire", "hiring",
+    "holidays", "hybrid", "inclusion", "inclusive", "insurance", "leave", "medical", "offer", "offers",
+    "office", "paid", "parental", "perks", "pto", "remote", "retirement", "salary", "vacation", "vision",
+    "wellness", "401k",
+}
@@ -0,0 +1,142 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import traceback
+from datetime import datetime, timezone
+import msgspec
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Longest string written for any single log field; longer values are cut with a marker
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+# Longest string kept inside logged payloads (Lambda events, request and resume bodies)
+LOG_MAX_PAYLOAD_CHARS = int(os.getenv("LOG_MAX_PAYLOAD_CHARS", "256"))
+LOG_MAX_PAYLOAD_ITEMS = int(os.getenv("LOG_MAX_PAYLOAD_ITEMS", "20"))
+# Per-logger sampling of records below ERROR, e.g. "utils.tracing=0.1,repositories.user_repository=0.5"
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (item.split("=", 1) for item in os.getenv("LOG_SAMPLE_RATES", "").split(",") if "=" in item)
+}
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample_rate"}
+
+_queue = None
+_listener = None
+
+
+# Shortens long strings and collections in a payload so it can be logged cheaply
+def truncate(value, max_chars: int = None, max_items: int = None):
+    max_chars = LOG_MAX_PAYLOAD_CHARS if max_chars is None else max_chars
+    max_items = LOG_MAX_PAYLOAD_ITEMS if max_items is None else max_items
+    if isinstance(value, bytes):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"{value[:max_chars]}...<truncated {len(value) - max_chars} chars>"
+    if isinstance(value, dict):
+        items = list(value.items())
+        truncated = {str(key): truncate(item, max_chars, max_items) for key, item in items[:max_items]}
+        if len(items) > max_items:
+            truncated["..."] = f"<{len(items) - max_items} more keys>"
+        return truncated
+    if isinstance(value, (list, tuple)):
+        truncated = [truncate(item, max_chars, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            truncated.append(f"<{len(value) - max_items} more items>")
+        return truncated
+    return value
+
+
+def _clip(value: str) -> str:
+    if len(value) <= LOG_MAX_FIELD_CHARS:
+        return value
+    return f"{value[:LOG_MAX_FIELD_CHARS]}...<truncated {len(value) - LOG_MAX_FIELD_CHARS} chars>"
+
+
+# One JSON object per line: timestamp, level, logger, message, any `extra=` fields and the traceback
+class JsonFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__()
+        self._encoder = msgspec.json.Encoder(enc_hook=str)
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _clip(record.getMessage()),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = _clip(value) if isinstance(value, str) else value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+        if record.exc_text:
+            entry["exception"] = _clip(record.exc_text)
+        return self._encoder.encode(entry).decode("utf-8")
+
+
+# Drops a share of records below ERROR: `extra={"sample_rate": 0.1}` on the call, or LOG_SAMPLE_RATES per logger
+class SamplingFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        rate = getattr(record, "sample_rate", None)
+        if rate is None:
+            rate = LOG_SAMPLE_RATES.get(record.name, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+# Hands records to the listener thread; formatting and stdout writes happen off the request path
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now: args and exc_info may not outlive the caller
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Shed log records rather than block a request when stdout cannot keep up
+            pass
+
+
+# Routes every logger through one bounded queue to a background JSON writer on stdout
+def configure_logging():
+    global _queue, _listener
+    if _listener is not None:
+        return
+
+    _queue = queue.Queue(LOG_QUEUE_SIZE)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    queue_handler = NonBlockingQueueHandler(_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+# Waits until queued records are written; Lambda may freeze the process once the handler returns
+def flush_logs():
+    if _queue is not None:
+        _queue.join()
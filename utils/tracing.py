@@ -0,0 +1,231 @@
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "true").lower() == "true"
+# Only requests at least this slow get a timing record logged (0 logs every request)
+TRACE_LOG_MIN_DURATION_MS = float(os.getenv("TRACE_LOG_MIN_DURATION_MS", "0"))
+# Share of those requests whose record is kept
+TRACE_LOG_SAMPLE_RATE = float(os.getenv("TRACE_LOG_SAMPLE_RATE", "1"))
+# "otlp" or "console" mirrors every span to OpenTelemetry (needs the opentelemetry packages)
+TRACING_OTEL_EXPORTER = os.getenv("TRACING_OTEL_EXPORTER", "").lower()
+
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_tracer = None
+
+
+def _init_opentelemetry():
+    global _tracer
+    if not TRACING_OTEL_EXPORTER:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        if TRACING_OTEL_EXPORTER == "otlp":
+            # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter()
+        else:
+            exporter = ConsoleSpanExporter()
+    except ImportError as e:  # OpenTelemetry is optional
+        logger.warning("OpenTelemetry exporter disabled: %s", e)
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "resume-ready-api")}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(__name__)
+
+
+_init_opentelemetry()
+
+
+# Timings of one request; spans may be added from worker threads
+class RequestTrace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+        # Threads currently working for this request (the request thread and propagated workers)
+        self._threads = Counter({threading.get_ident(): 1})
+
+    def enter_thread(self):
+        with self._lock:
+            self._threads[threading.get_ident()] += 1
+
+    def exit_thread(self):
+        with self._lock:
+            self._threads[threading.get_ident()] -= 1
+            self._threads += Counter()  # drop threads that are done
+
+    def thread_ids(self):
+        with self._lock:
+            return set(self._threads)
+
+    def add(self, name: str, started: float, duration: float, error: bool):
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "startMs": round((started - self.started) * 1000, 2),
+                "durationMs": round(duration * 1000, 2),
+                "thread": threading.current_thread().name,
+                "error": error,
+            })
+
+    # Total duration per span name, in first-seen order
+    def totals(self):
+        totals = {}
+        with self._lock:
+            for span_record in self.spans:
+                entry = totals.setdefault(span_record["name"], [0.0, 0])
+                entry[0] += span_record["durationMs"]
+                entry[1] += 1
+        return totals
+
+
+# Times a block as a named span of the current request; a no-op outside a traced request
+@contextmanager
+def span(name: str):
+    trace = _current_trace.get()
+    if trace is None and _tracer is None:
+        yield
+        return
+
+    otel_span = _tracer.start_as_current_span(name) if _tracer is not None else None
+    if otel_span is not None:
+        otel_span.__enter__()
+    started = time.perf_counter()
+    exc_info = (None, None, None)
+    try:
+        yield
+    except BaseException:
+        exc_info = sys.exc_info()
+        raise
+    finally:
+        if trace is not None:
+            trace.add(name, started, time.perf_counter() - started, exc_info[0] is not None)
+        if otel_span is not None:
+            # The exception reaches OpenTelemetry, which records it and sets an error status
+            otel_span.__exit__(*exc_info)
+
+
+# Decorator form of span()
+def traced(name: str):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _run_in_trace(fn, *args, **kwargs):
+    trace = _current_trace.get()
+    if trace is None:
+        return fn(*args, **kwargs)
+    trace.enter_thread()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        trace.exit_thread()
+
+
+# Wraps fn so it runs in a copy of the caller's context: spans recorded on executor threads
+# then land in the submitting request's trace, and the thread counts as working for that request
+def propagate(fn):
+    context = contextvars.copy_context()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.run(_run_in_trace, fn, *args, **kwargs)
+    return wrapper
+
+
+# The current request's trace, or None outside a traced request
+def current_trace():
+    return _current_trace.get()
+
+
+# Drop-in replacement for @jwt_required() that records token verification as a span
+def traced_jwt_required(optional: bool = False, fresh: bool = False, refresh: bool = False, locations=None,
+                        verify_type: bool = True, skip_revocation_check: bool = False):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span("jwt"):
+                verify_jwt_in_request(optional, fresh, refresh, locations, verify_type, skip_revocation_check)
+            return current_app.ensure_sync(fn)(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _start_request_trace():
+    trace = RequestTrace()
+    g._trace_token = _current_trace.set(trace)
+    if _tracer is not None:
+        from opentelemetry import context as otel_context, trace as otel_trace
+        root = _tracer.start_span(f"{request.method} {request.path}")
+        g._otel_root = (root, otel_context.attach(otel_trace.set_span_in_context(root)))
+
+
+def _finish_request_trace(response):
+    trace = _current_trace.get()
+    if trace is None:
+        return response
+
+    total_ms = (time.perf_counter() - trace.started) * 1000
+    totals = trace.totals()
+    if SERVER_TIMING_HEADER:
+        metrics = [
+            f'{name};dur={duration:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+            for name, (duration, count) in totals.items()
+        ]
+        metrics.append(f"total;dur={total_ms:.1f}")
+        response.headers["Server-Timing"] = ", ".join(metrics)
+
+    if total_ms >= TRACE_LOG_MIN_DURATION_MS:
+        logger.info("Request timing", extra={
+            "type": "requestTiming",
+            "method": request.method,
+            "path": request.path,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "status": response.status_code,
+            "totalMs": round(total_ms, 2),
+            "spans": trace.spans,
+            "sample_rate": TRACE_LOG_SAMPLE_RATE,
+        })
+    return response
+
+
+def _end_request_trace(exc):
+    root = g.pop("_otel_root", None)
+    if root is not None:
+        from opentelemetry import context as otel_context
+        otel_context.detach(root[1])
+        root[0].end()
+    token = g.pop("_trace_token", None)
+    if token is not None:
+        _current_trace.reset(token)
+
+
+# Registers the per-request trace hooks on the app
+def init_app(app):
+    if not TRACING_ENABLED:
+        return
+    app.before_request(_start_request_trace)
+    app.after_request(_finish_request_trace)
+    app.teardown_request(_end_request_trace)